@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files written by run_benchmarks.py.
+
+    python benchmarks/compare.py baseline.json candidate.json --threshold 0.10
+
+Prints wall time and peak RSS of every case present in both files, plus every
+stage and questionnaire that slowed down by more than the threshold. Repeated
+runs of a case are reduced to their fastest. Exits with status 1 when a case
+regressed, so it can gate CI.
+"""
+
+import argparse
+import json
+import sys
+
+
+def case_key(record):
+    return (record["case"], record["rows"], record.get("backend"))
+
+
+def best_runs(path):
+    """
+    Load a results file and keep the fastest run of each case.
+    """
+    with open(path) as f:
+        results = json.load(f)["results"]
+    best = {}
+    for record in results:
+        key = case_key(record)
+        if key not in best or record["total"]["wall_seconds"] < best[key]["total"]["wall_seconds"]:
+            best[key] = record
+    return best
+
+
+def ratio(new, old):
+    if old is None or new is None or old <= 0:
+        return None
+    return new / old
+
+
+def describe(key):
+    case, rows, backend = key
+    return f"{case} {rows} rows" + (f" [{backend}]" if backend else "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline", help="Results of the reference version")
+    parser.add_argument("candidate", help="Results of the version under test")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown reported as a regression (default: 0.10)")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="Ignore stages and questionnaires faster than this in the baseline")
+    args = parser.parse_args()
+
+    baseline = best_runs(args.baseline)
+    candidate = best_runs(args.candidate)
+    regressions = 0
+
+    print(f"{'Case':<40} {'Wall (s)':>18} {'Ratio':>7} {'Peak RSS (MB)':>18} {'Ratio':>7}")
+    for key in sorted(set(baseline) & set(candidate), key=str):
+        old, new = baseline[key], candidate[key]
+        old_wall, new_wall = old["total"]["wall_seconds"], new["total"]["wall_seconds"]
+        wall_ratio = ratio(new_wall, old_wall)
+        rss_ratio = ratio(new.get("peak_rss_mb"), old.get("peak_rss_mb"))
+        old_rss = old.get("peak_rss_mb") or 0.0
+        new_rss = new.get("peak_rss_mb") or 0.0
+        flag = ""
+        if (wall_ratio and wall_ratio > 1 + args.threshold) or (rss_ratio and rss_ratio > 1 + args.threshold):
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{describe(key):<40} {old_wall:8.2f} -> {new_wall:7.2f} {wall_ratio or 0:7.2f} "
+              f"{old_rss:8.0f} -> {new_rss:7.0f} {rss_ratio or 0:7.2f}{flag}")
+
+        for section in ("stages", "questionnaires"):
+            for name, old_record in old.get(section, {}).items():
+                new_record = new.get(section, {}).get(name)
+                if new_record is None or old_record["wall_seconds"] < args.min_seconds:
+                    continue
+                part_ratio = ratio(new_record["wall_seconds"], old_record["wall_seconds"])
+                if part_ratio and part_ratio > 1 + args.threshold:
+                    print(f"    {section[:-1]} {name}: {old_record['wall_seconds']:.3f}s -> "
+                          f"{new_record['wall_seconds']:.3f}s ({part_ratio:.2f}x)")
+
+    for key in sorted(set(baseline) ^ set(candidate), key=str):
+        print(f"{describe(key):<40} only in {'baseline' if key in baseline else 'candidate'}")
+
+    if regressions:
+        print(f"\n{regressions} case(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+    print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
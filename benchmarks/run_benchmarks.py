@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the questionnaire package.
+
+Generates synthetic exports covering all 27 instruments (cached in --data-dir),
+then measures, each in a fresh process so peak memory is not inherited:
+
+- analyze_questionnaire_csv for every requested backend, with its per-stage
+  metrics (CSV read, detection, scoring, concatenation, summary write) and
+  per-questionnaire timings
+- run_questionnaires alone for every requested backend on the loaded frame, so
+  backends can be compared on scoring without the CSV read
+- each questionnaire module's main() on the loaded frame
+
+Results are written as JSON (see compare.py to diff two runs).
+
+    python benchmarks/run_benchmarks.py --sizes 1k 100k --output results.json
+    python benchmarks/run_benchmarks.py --sizes 1M 10M --backends fused --skip-modules
+
+Files above --in-memory-limit rows are analyzed with --chunksize and their
+module benchmarks are skipped, since those need the whole frame in memory.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add the package to the path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_size(text):
+    """
+    Parse "1k", "100k", "1M", "10M" or a plain integer into a row count.
+    """
+    text = text.strip().lower()
+    if text[-1] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+def dataset_path(data_dir, rows, seed):
+    return os.path.join(data_dir, f"synthetic_{rows}_seed{seed}.csv")
+
+
+def ensure_dataset(data_dir, rows, seed):
+    """
+    Generate the synthetic export for `rows` unless it is already cached.
+    """
+    from questionnaire_analysis.synthetic import write_synthetic_csv
+
+    path = dataset_path(data_dir, rows, seed)
+    if not os.path.exists(path):
+        print(f"Generating {rows} rows into {path}...")
+        start = time.perf_counter()
+        write_synthetic_csv(path + ".partial", rows, seed=seed)
+        os.replace(path + ".partial", path)
+        print(f"  generated in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def _analyze_case(csv_path, backend, chunksize, max_workers, compact=False, csv_engine=None):
+    from questionnaire_analysis.common import analyze_questionnaire_csv, summary_output_path
+    from questionnaire_analysis.metrics import peak_rss_mb
+
+    summary_path = summary_output_path(csv_path)
+    try:
+        summary, metrics = analyze_questionnaire_csv(csv_path, chunksize=chunksize, backend=backend,
+                                                     max_workers=max_workers, return_metrics=True,
+                                                     compact=compact, csv_engine=csv_engine, cache=False)
+    finally:
+        if os.path.exists(summary_path):
+            os.remove(summary_path)
+    result = metrics.to_dict()
+    result["summary_rows"] = None if summary is None else len(summary)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def _scoring_case(csv_path, backend, max_workers, compact=False):
+    from questionnaire_analysis.common import (access_questionnaire_csv, coerce_detected_items,
+                                               detect_questionnaires, run_questionnaires)
+    from questionnaire_analysis.metrics import RunMetrics, peak_rss_mb
+
+    df = access_questionnaire_csv(csv_path, compact=compact)
+    detected = detect_questionnaires(df)
+    df = coerce_detected_items(df, detected)
+    # Started after the load, so the totals cover scoring and concatenation only
+    metrics = RunMetrics(source=csv_path)
+    with metrics.stage("score", rows=len(df)):
+        run_questionnaires(df, detected, backend=backend, max_workers=max_workers, metrics=metrics)
+    result = metrics.to_dict()
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def _modules_case(csv_path, compact=False):
+    from questionnaire_analysis.coercion import widen_compact
+    from questionnaire_analysis.common import access_questionnaire_csv, detect_questionnaires
+    from questionnaire_analysis.metrics import RunMetrics, peak_rss_mb
+
+    metrics = RunMetrics(source=csv_path)
+    with metrics.stage("load") as stage:
+        df = access_questionnaire_csv(csv_path, compact=compact)
+        stage["rows"] = len(df)
+    for prefix, main_fn in detect_questionnaires(df).items():
+        with metrics.questionnaire(prefix, rows=len(df)):
+            main_fn(widen_compact(df, [col for col in df.columns if col.startswith(prefix)]))
+    result = metrics.to_dict()
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def run_isolated(fn, *args):
+    """
+    Run fn(*args) in a fresh spawned process and return its result.
+    """
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(fn, args)
+
+
+def environment():
+    """
+    Versions and machine details stored with the results.
+    """
+    import numpy
+    import pandas
+    import questionnaire_analysis
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "package_version": questionnaire_analysis.__version__,
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark questionnaire scoring on synthetic data.")
+    parser.add_argument("--sizes", nargs="+", default=["1k", "100k"],
+                        help="Row counts to benchmark, e.g. 1k 100k 1M 10M (default: 1k 100k)")
+    parser.add_argument("--backends", nargs="+", default=["modules", "engine", "fused"],
+                        help="Scoring backends for analyze_questionnaire_csv")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Runs per case; every run is recorded")
+    parser.add_argument("--max-workers", type=int, default=None,
+                        help="max_workers passed to analyze_questionnaire_csv")
+    parser.add_argument("--in-memory-limit", type=str, default="1M",
+                        help="Larger files are analyzed in chunks and skip module benchmarks (default: 1M)")
+    parser.add_argument("--chunksize", type=int, default=200_000,
+                        help="Chunk size for files above --in-memory-limit")
+    parser.add_argument("--compact", action="store_true",
+                        help="Load item columns as 1-byte nullable integers (analyze_questionnaire_csv compact=True)")
+    parser.add_argument("--csv-engine", choices=["c", "python", "pyarrow"], default=None,
+                        help="CSV parser for analyze_questionnaire_csv (default: pandas' c engine)")
+    parser.add_argument("--skip-modules", action="store_true",
+                        help="Do not benchmark the module main() functions one by one")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", type=str,
+                        default=os.path.join(tempfile.gettempdir(), "questionnaire_benchmarks"),
+                        help="Where generated datasets are cached")
+    parser.add_argument("--output", type=str, default="benchmark_results.json",
+                        help="JSON file for the results")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    in_memory_limit = parse_size(args.in_memory_limit)
+    results = []
+
+    for rows in [parse_size(size) for size in args.sizes]:
+        csv_path = ensure_dataset(args.data_dir, rows, args.seed)
+        chunksize = args.chunksize if rows > in_memory_limit else None
+
+        for backend in args.backends:
+            for run in range(args.repeat):
+                print(f"analyze_questionnaire_csv: {rows} rows, backend {backend}, run {run + 1}...")
+                record = run_isolated(_analyze_case, csv_path, backend, chunksize, args.max_workers,
+                                      args.compact, args.csv_engine)
+                record.update({"case": "analyze", "rows": rows, "backend": backend, "run": run,
+                               "chunksize": chunksize, "compact": args.compact, "csv_engine": args.csv_engine})
+                results.append(record)
+                peak = record["peak_rss_mb"]
+                print(f"  {record['total']['wall_seconds']:.2f}s, peak RSS "
+                      + (f"{peak:.0f} MB" if peak is not None else "unavailable"))
+
+        if chunksize:
+            continue
+        for backend in args.backends:
+            for run in range(args.repeat):
+                print(f"run_questionnaires: {rows} rows, backend {backend}, run {run + 1}...")
+                record = run_isolated(_scoring_case, csv_path, backend, args.max_workers, args.compact)
+                record.update({"case": "scoring", "rows": rows, "backend": backend, "run": run,
+                               "compact": args.compact})
+                results.append(record)
+                print(f"  {record['total']['wall_seconds']:.2f}s")
+
+        if args.skip_modules:
+            continue
+        for run in range(args.repeat):
+            print(f"module main() functions: {rows} rows, run {run + 1}...")
+            record = run_isolated(_modules_case, csv_path, args.compact)
+            record.update({"case": "modules", "rows": rows, "run": run, "compact": args.compact})
+            results.append(record)
+
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+    print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
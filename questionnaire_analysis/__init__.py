@@ -1,12 +1,39 @@
 __version__ = "0.1.0"
 
 
-from .common import access_csv, detect_questionnaires
-from .questionnaires import (
-UCLA, PANAS, RAS, GCF, ECR, MSPSS, SWLS, ALQ, BEQ, IRQ,
-CESDR, MINI_MASQ, PMERQ, BFI, SU, EERQ, HEXACO, CARE, SD4, CBCL, UPPS,
-BSSS, SIAS, PSS, LOTR, DOSPERT, IPPA
-)
+import importlib
 
+# Everything below is imported on first access, so importing the package does not
+# load pandas or any questionnaire module: access_csv and detect_questionnaires
+# come from common, questionnaire modules (questionnaire_analysis.PANAS) from
+# questionnaires
+_LAZY_ATTRIBUTES = {"access_csv": "common", "detect_questionnaires": "common"}
+_LAZY_SUBMODULES = ("common", "questionnaires")
 
 
+class LazyModule:
+    """
+    Stands in for a module that is imported on first attribute access. Modules bind
+    pandas and NumPy to one at runtime so their annotations (pd.DataFrame, np.ndarray)
+    resolve with typing.get_type_hints without importing either on package import.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attribute):
+        return getattr(importlib.import_module(self._name), attribute)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(f"{__name__}.{_LAZY_ATTRIBUTES[name]}"), name)
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    questionnaires = importlib.import_module(f"{__name__}.questionnaires")
+    if name in questionnaires.MODULES:
+        return getattr(questionnaires, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,45 +1,123 @@
-import pandas as pd
-from .common import access_csv, detect_questionnaires
+from .common import BACKENDS, DEFAULT_BACKEND, configure_logging
+from .formats import CSV_ENGINES, SUMMARY_EXTENSIONS
+from .incremental import DEFAULT_KEY_COLUMN
+from .batch import expand_inputs, print_report, process_file, run_batch
+from .profiling import profile_run
 import argparse
+import json
+import logging
+import os
 import sys
+import time
+
+logger = logging.getLogger(__name__)
 
 def main():
-    summary_dfs = []
-    parser = argparse.ArgumentParser(description="Process a questionnaire CSV file.")
-    parser.add_argument("csv_path", type=str, help="Path to the questionnaire CSV file")
+    parser = argparse.ArgumentParser(description="Process one or more questionnaire CSV files.")
+    parser.add_argument("csv_paths", type=str, nargs="+",
+                        help="Questionnaire CSV, Parquet or Arrow/Feather files, glob patterns or directories "
+                             "of such files")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Stream the CSV in chunks of this many rows to keep memory flat")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help="Score with each questionnaire module, the shared vectorized engine (default), "
+                             "the engine fused across all questionnaires, or the engine on a process pool")
+    parser.add_argument("--max-workers", type=int, default=None,
+                        help="Score the detected questionnaires on a thread pool of this many workers "
+                             "(processes for --backend processes)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Store item responses as 1-byte nullable integers instead of float64 "
+                             "(about a quarter of the memory; ignored with --chunksize)")
+    parser.add_argument("--csv-engine", choices=CSV_ENGINES, default=None,
+                        help="CSV parser: pandas' c or python engine, or pyarrow's multithreaded reader "
+                             "(falls back to pandas without pyarrow; ignored with --chunksize and --compact)")
+    parser.add_argument("--import-ids", type=str, default=None,
+                        help="JSON file mapping Qualtrics ImportIds to column names, e.g. {\"QID12_1\": \"PANAS_01\"}; "
+                             "matching columns of Qualtrics exports are renamed before detection")
+    parser.add_argument("--include-unfinished", action="store_true",
+                        help="Also score Qualtrics responses that were not finished (Finished/Progress)")
+    parser.add_argument("--summary-format", choices=list(SUMMARY_EXTENSIONS), default="csv",
+                        help="Write each summary as _summary.csv, _summary.parquet or _summary.feather "
+                             "(Parquet and Feather require pyarrow)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always parse and score; do not read or write the result cache")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Result cache directory (default: $QUESTIONNAIRE_CACHE_DIR or ~/.cache/questionnaire_analysis)")
+    parser.add_argument("--parse-cache", action="store_true",
+                        help="Keep each parsed CSV as a memory-mapped Arrow file in the cache directory's parsed/ "
+                             "subdirectory, so later runs on the unchanged file skip parsing (requires pyarrow)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Score only responses that are new or changed since the last incremental run "
+                             "and merge them into its summary (tracked in a _state.json next to each input)")
+    parser.add_argument("--key-column", type=str, default=DEFAULT_KEY_COLUMN,
+                        help="Identifier column matching responses across incremental runs (default: ResponseId)")
+    parser.add_argument("--state-file", type=str, default=None,
+                        help="State file of an incremental run over a single input, e.g. to follow "
+                             "dated exports of one survey (default: _state.json next to the input)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Number of worker processes when scoring several files")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Write per-stage and per-questionnaire timing and memory to a _metrics.json "
+                             "next to each _summary.csv")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run under cProfile and write a sorted stats dump and collapsed stacks for flamegraphs")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Run under tracemalloc and write the top allocation sites per questionnaire module")
+    parser.add_argument("--profile-output", type=str, default="questionnaire_profile",
+                        help="Path prefix of the profiling reports (default: questionnaire_profile)")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument("-v", "--verbose", action="store_true",
+                           help="Also compute and log each questionnaire's score table and summary statistics")
+    verbosity.add_argument("-q", "--quiet", action="store_true",
+                           help="Only log warnings and errors")
 
     args = parser.parse_args()
+    if args.incremental and args.chunksize:
+        parser.error("--incremental loads each file in memory and cannot be combined with --chunksize")
+    log_level = configure_logging(verbose=args.verbose, quiet=args.quiet)
+    if not (args.profile or args.profile_memory):
+        return run(args, log_level)
+
+    # Profiling covers this process only; batch workers (--jobs) and the processes backend are not traced
+    result, paths = profile_run(lambda: run(args, log_level), args.profile_output,
+                                cpu=args.profile, memory=args.profile_memory)
+    for path in paths:
+        logger.info(f"Profile written to: {path}")
+    return result
+
+def run(args, log_level):
+    """
+    Scores the files named on the command line: one file directly, several through the batch runner.
+    """
+    import_ids = None
+    if args.import_ids:
+        with open(args.import_ids) as f:
+            import_ids = json.load(f)
+    options = {"chunksize": args.chunksize, "backend": args.backend, "max_workers": args.max_workers,
+               "write_metrics": args.metrics, "compact": args.compact, "summary_format": args.summary_format,
+               "csv_engine": args.csv_engine, "import_ids": import_ids,
+               "finished_only": not args.include_unfinished,
+               "cache": False if args.no_cache else (args.cache_dir or True),
+               "parse_cache": args.parse_cache and (os.path.join(args.cache_dir, "parsed") if args.cache_dir else True)}
+    if args.incremental:
+        options.update(incremental=True, key_column=args.key_column, state_path=args.state_file)
+
+    # A single named file keeps the original behaviour: no batch report, the summary is returned
+    csv_paths = expand_inputs(args.csv_paths)
+    if len(args.csv_paths) == 1 and csv_paths == args.csv_paths and not os.path.isdir(csv_paths[0]):
+        return process_file(csv_paths[0], **options)
+
+    if args.state_file:
+        logger.error("--state-file tracks a single input; each file of a batch keeps its own _state.json")
+        return None
+    if not csv_paths:
+        logger.warning("No questionnaire files matched the given paths.")
+        return None
 
-    df = access_csv(args.csv_path)
-    # input_file_path = '/Users/ayusmankhuntia/Desktop/Package/questionnaire-package/questionnaire_analysis/Risk-Taking+and+Emotion+Regulation_February+4,+2025_15.23.csv'  # Update this to your CSV path
-    # df = access_csv(input_file_path)
-    if df is None:
-        return
-
-    detected = detect_questionnaires(df)
-    if not detected:
-        print("No recognized questionnaires detected in the CSV.")
-        return
-
-    # Call the main() function of each detected questionnaire module
-    for prefix, main_fn in detected.items():
-        print(f"\nProcessing questionnaire with prefix '{prefix}'...")
-        try:
-            summary_df = main_fn(df)
-            if summary_df is not None:
-                summary_dfs.append(summary_df)
-        except Exception as e:
-            print(f"Error processing questionnaire '{prefix}': {e}")
-            continue
-
-    # Combine all summaries (if multiple)
-    if summary_dfs:
-        final_summary = pd.concat(summary_dfs, axis=1)
-        summary_output_path = args.csv_path.replace(".csv", "_summary.csv")
-        final_summary.to_csv(summary_output_path, index=False)
-        print(f"\nSummary saved to: {summary_output_path}")
-        return final_summary
-    return None
+    start = time.perf_counter()
+    results = run_batch(csv_paths, jobs=args.jobs, log_level=log_level, **options)
+    print_report(results, wall_seconds=time.perf_counter() - start)
+    return results
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,154 @@
+"""
+Batch processing of many questionnaire CSV files.
+
+Files are scored in worker processes that import the package once and then
+handle one file after another, so a nightly run over many exports does not
+pay interpreter start-up and module imports per file. Every file still gets
+its own _summary.csv (or _summary.parquet / _summary.feather).
+"""
+
+import glob
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .common import (DEFAULT_BACKEND, _analyze_loaded_csv, analyze_questionnaire_csv, configure_logging,
+                     metrics_output_path)
+from .formats import FORMATS
+from .incremental import DEFAULT_KEY_COLUMN, analyze_incremental
+from .metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+
+def expand_inputs(paths):
+    """
+    Expands globs and directories into a de-duplicated list of input files.
+    Directories contribute their CSV, Parquet and Arrow/Feather files. Summary outputs
+    (*_summary.csv, *_summary.parquet, ...) picked up by a glob or directory are skipped;
+    explicitly named files are always kept.
+    """
+    files = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            matches = sorted(match for extension in FORMATS
+                             for match in glob.glob(os.path.join(path, "*" + extension)))
+        elif any(char in path for char in "*?["):
+            matches = sorted(glob.glob(path))
+        else:
+            matches = [path]
+        for match in matches:
+            if match != path and os.path.splitext(match)[0].endswith("_summary"):
+                continue
+            if match not in seen:
+                seen.add(match)
+                files.append(match)
+    return files
+
+
+def process_file(csv_path, chunksize=None, backend=DEFAULT_BACKEND, max_workers=None, write_metrics=False,
+                 compact=False, summary_format="csv", csv_engine=None, import_ids=None, finished_only=True,
+                 cache=True, incremental=False, key_column=DEFAULT_KEY_COLUMN, state_path=None, parse_cache=None):
+    """
+    Scores one CSV, Parquet or Arrow file and writes its summary in `summary_format`.
+    Options are those of analyze_questionnaire_csv; with `incremental`, those of
+    incremental.analyze_incremental.
+
+    Returns:
+        The summary DataFrame (the rows scored in this run when `incremental`), or None
+    """
+    if incremental:
+        if chunksize:
+            raise ValueError("Incremental runs load the file in memory; chunksize is not supported")
+        metrics = RunMetrics(source=csv_path)
+        final_summary = analyze_incremental(csv_path, key_column=key_column, state_path=state_path,
+                                            summary_format=summary_format, backend=backend,
+                                            max_workers=max_workers, compact=compact, csv_engine=csv_engine,
+                                            import_ids=import_ids, finished_only=finished_only, metrics=metrics,
+                                            parse_cache=parse_cache)
+        if write_metrics:
+            metrics.write_json(metrics_output_path(csv_path))
+            logger.info(f"Metrics saved to: {metrics_output_path(csv_path)}")
+        return final_summary
+
+    if chunksize:
+        return analyze_questionnaire_csv(csv_path, chunksize=chunksize, backend=backend,
+                                         max_workers=max_workers, write_metrics=write_metrics,
+                                         summary_format=summary_format, import_ids=import_ids,
+                                         finished_only=finished_only)
+
+    # The in-memory path of analyze_questionnaire_csv, so a file scores the same alone or in a batch
+    metrics = RunMetrics(source=csv_path)
+    final_summary = _analyze_loaded_csv(csv_path, True, backend, max_workers, metrics, compact=compact,
+                                        summary_format=summary_format, csv_engine=csv_engine,
+                                        import_ids=import_ids, finished_only=finished_only, cache=cache,
+                                        parse_cache=parse_cache)
+    if write_metrics:
+        metrics.write_json(metrics_output_path(csv_path))
+        logger.info(f"Metrics saved to: {metrics_output_path(csv_path)}")
+    return final_summary
+
+
+def _init_logging(level):
+    """
+    Worker initializer: applies the parent's logging level in each worker process.
+    """
+    configure_logging(verbose=level <= logging.DEBUG, quiet=level >= logging.WARNING)
+
+
+def _run_file(csv_path, options):
+    """
+    Processes one file and returns a picklable status record instead of the summary.
+    """
+    start = time.perf_counter()
+    try:
+        summary = process_file(csv_path, **options)
+    except Exception as e:
+        logger.error(f"Failed to process {csv_path}: {e}")
+        return {"file": csv_path, "status": "failed", "rows": None,
+                "seconds": time.perf_counter() - start, "error": str(e)}
+
+    rows = None
+    if summary is not None:
+        rows = int(summary["count"].max()) if options.get("chunksize") else len(summary)
+    return {"file": csv_path, "status": "ok" if summary is not None else "no output", "rows": rows,
+            "seconds": time.perf_counter() - start, "error": None}
+
+
+def run_batch(csv_paths, jobs=1, log_level=None, **options):
+    """
+    Processes every file, on a pool of `jobs` worker processes when above 1.
+    `options` are passed to process_file. Workers log at `log_level` (a level from
+    configure_logging). Returns one status record per file, in input order.
+    """
+    if jobs is None or jobs <= 1 or len(csv_paths) <= 1:
+        return [_run_file(csv_path, options) for csv_path in csv_paths]
+
+    initializer = None if log_level is None else _init_logging
+    initargs = () if log_level is None else (log_level,)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(csv_paths)), initializer=initializer,
+                             initargs=initargs) as executor:
+        futures = [executor.submit(_run_file, csv_path, options) for csv_path in csv_paths]
+        return [future.result() for future in futures]
+
+
+def print_report(results, wall_seconds=None):
+    """
+    Prints the per-file timing and status table of a batch run to stdout, also with -q.
+    """
+    width = max([len("File")] + [len(result["file"]) for result in results])
+    print("\nBatch report:")
+    print(f"{'File':<{width}}  {'Status':<9}  {'Rows':>8}  {'Seconds':>8}")
+    for result in results:
+        rows = "-" if result["rows"] is None else result["rows"]
+        print(f"{result['file']:<{width}}  {result['status']:<9}  {rows:>8}  {result['seconds']:>8.2f}")
+        if result["error"]:
+            print(f"{'':<{width}}  error: {result['error']}")
+    succeeded = sum(result["status"] == "ok" for result in results)
+    total = sum(result["seconds"] for result in results)
+    line = f"{succeeded}/{len(results)} file(s) scored, {total:.2f}s of processing time"
+    if wall_seconds is not None:
+        line += f" in {wall_seconds:.2f}s wall time"
+    print(line)
@@ -0,0 +1,282 @@
+"""
+On-disk cache of analysis results.
+
+Rerunning an analysis on an unchanged export loads the stored summary instead of
+parsing and scoring the file again. An entry is keyed on:
+
+- the content hash of the input file (not its name or modification time)
+- the detected questionnaires, each with a fingerprint of its module's source and
+  its scoring specification
+- a fingerprint of the shared pipeline code (loading, coercion, scoring engine)
+- the options that shape the result (backend, Qualtrics handling, ...)
+
+so editing a questionnaire module or the engine invalidates exactly the entries
+that used it.
+
+When the whole result misses, each questionnaire's output block is looked up on
+its own (in the blocks/ subdirectory), keyed on the hash of that questionnaire's
+columns, its module and specification fingerprint, the scoring code and the
+backend. After fixing one module only that questionnaire is rescored; the other
+blocks are stitched in from the cache.
+
+Summaries and blocks are stored as Parquet, which keeps dtypes and the index and
+loads without any parsing (pickle when pyarrow is not installed). Entries older
+than `max_age` seconds are evicted, then the least recently used ones until the
+cache fits in `max_bytes`.
+
+The cache lives in $QUESTIONNAIRE_CACHE_DIR, or questionnaire_analysis under
+$XDG_CACHE_HOME (~/.cache).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from . import LazyModule, __version__
+from .specs import specs_by_prefix
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = LazyModule("pandas")
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1 << 30
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+# Package modules whose code shapes every result
+PIPELINE_MODULES = ("common", "coercion", "detection", "formats", "parallel", "qualtrics", "scoring_engine")
+# The subset that turns loaded item columns into scores
+SCORING_MODULES = ("coercion", "parallel", "scoring_engine")
+PACKAGE_DIR = Path(__file__).parent
+
+
+def default_cache_dir() -> str:
+    """
+    $QUESTIONNAIRE_CACHE_DIR, or questionnaire_analysis in $XDG_CACHE_HOME (default ~/.cache).
+    """
+    if os.environ.get("QUESTIONNAIRE_CACHE_DIR"):
+        return os.environ["QUESTIONNAIRE_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "questionnaire_analysis")
+
+
+def file_digest(path: str, block_bytes: int = 1 << 20) -> str:
+    """
+    BLAKE2b hash of a file's contents, read `block_bytes` at a time.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_bytes), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _source_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=20).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def pipeline_fingerprint(modules=PIPELINE_MODULES) -> str:
+    """
+    Hash of the package version and the source of the given package modules
+    (by default every module of the shared pipeline).
+    """
+    digest = hashlib.blake2b(__version__.encode(), digest_size=20)
+    for name in modules:
+        digest.update(_source_digest(str(PACKAGE_DIR / f"{name}.py")).encode())
+    return digest.hexdigest()
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """
+    Hash of a DataFrame's values, index, column names and dtypes.
+    """
+    import pandas as pd
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(json.dumps([[str(col), str(dtype)] for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def module_fingerprint(prefix: str, main_fn) -> str:
+    """
+    Hash of the source file of a questionnaire's main() and of its specification, if any.
+    """
+    try:
+        source = _source_digest(inspect.getsourcefile(main_fn))
+    except (TypeError, OSError):
+        # Not defined in a source file; fall back to its qualified name
+        source = f"{getattr(main_fn, '__module__', '')}.{getattr(main_fn, '__qualname__', repr(main_fn))}"
+    spec = json.dumps(specs_by_prefix().get(prefix), sort_keys=True)
+    return hashlib.blake2b((source + spec).encode(), digest_size=20).hexdigest()
+
+
+def cache_key(input_path: str, detected: Dict[str, Any], options: Dict[str, Any]) -> str:
+    """
+    Key of the result of analyzing `input_path` with the `detected` questionnaires
+    ({prefix: main function}) and `options` (JSON-serializable).
+    """
+    key = {
+        "input": file_digest(input_path),
+        "questionnaires": {prefix: module_fingerprint(prefix, main_fn) for prefix, main_fn in detected.items()},
+        "pipeline": pipeline_fingerprint(),
+        "options": options,
+    }
+    return hashlib.blake2b(json.dumps(key, sort_keys=True, default=str).encode(), digest_size=20).hexdigest()
+
+
+def block_key(block: pd.DataFrame, prefix: str, main_fn, backend: str) -> str:
+    """
+    Key of one questionnaire's scores: its item and other prefixed columns (`block`),
+    the fingerprint of its module and specification, the scoring code and the backend.
+    """
+    key = {
+        "data": frame_digest(block),
+        "questionnaire": module_fingerprint(prefix, main_fn),
+        "scoring": pipeline_fingerprint(SCORING_MODULES),
+        "backend": backend,
+    }
+    return hashlib.blake2b(json.dumps(key, sort_keys=True).encode(), digest_size=20).hexdigest()
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ResultCache:
+    """
+    Directory of cached summaries, one file per key, bounded by size and age.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age: float = DEFAULT_MAX_AGE):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.extension = ".parquet" if _has_pyarrow() else ".pkl"
+
+    def blocks(self) -> "ResultCache":
+        """
+        The cache of per-questionnaire blocks, a subdirectory with the same limits.
+        """
+        return ResultCache(os.path.join(self.directory, "blocks"), self.max_bytes, self.max_age)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.extension)
+
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        The summary stored under `key`, or None. Expired or unreadable entries are removed.
+        """
+        import pandas as pd
+        path = self.path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                os.remove(path)
+                return None
+            df = pd.read_parquet(path) if self.extension == ".parquet" else pd.read_pickle(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            return None
+        # The modification time doubles as the last-use time for eviction
+        os.utime(path)
+        return df
+
+    def store(self, key: str, df: pd.DataFrame, evict: bool = True):
+        """
+        Stores `df` under `key`, then evicts unless `evict` is False (callers storing
+        many entries evict once afterwards). Failures are logged, never raised.
+        """
+        path = self.path(key)
+        partial = f"{path}.{os.getpid()}.partial"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self.extension == ".parquet":
+                df.to_parquet(partial)
+            else:
+                df.to_pickle(partial)
+            os.replace(partial, path)
+            if evict:
+                self.evict()
+        except Exception as e:
+            logger.warning(f"Could not cache results in {self.directory}: {e}")
+            self._remove(partial)
+
+    def evict(self):
+        """
+        Removes entries older than max_age, then the least recently used until the cache fits max_bytes.
+        Entries removed meanwhile by another process are skipped.
+        """
+        now = time.time()
+        entries = []
+        try:
+            listing = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in listing:
+            try:
+                if not entry.is_file() or not entry.name.endswith((".parquet", ".pkl")):
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                self._remove(entry.path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """
+        Removes every entry, including the per-questionnaire blocks.
+        """
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith((".parquet", ".pkl")):
+                    self._remove(entry.path)
+                elif entry.is_dir() and entry.name == "blocks":
+                    ResultCache(entry.path).clear()
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def resolve_cache(cache) -> Optional[ResultCache]:
+    """
+    The ResultCache selected by a `cache` argument: True for the default directory,
+    a directory path, a ResultCache, or False/None for no caching.
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return ResultCache()
+    if isinstance(cache, ResultCache):
+        return cache
+    return ResultCache(str(cache))
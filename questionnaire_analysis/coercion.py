@@ -0,0 +1,196 @@
+"""
+Numeric coercion of questionnaire item columns.
+
+The pipeline coerces the item columns of every detected questionnaire once, right
+after loading (common.coerce_detected_items), so the modules receive numeric items.
+The modules read their items through numeric_items, which only converts columns
+that are not numeric yet: after the coercion stage that is none of them, and a
+module called directly on a raw frame still coerces as before.
+
+Whether a dtype needs converting is decided once per dtype and cached, so coercing
+every chunk of a streamed file costs one dictionary lookup per column.
+
+Compact storage keeps Likert items as nullable 1-byte integers (Int8/UInt8: one
+byte per value plus one byte of missing mask, against eight for float64). Columns
+are only narrowed when every value is a whole number the dtype can hold, since
+parsing straight into Int8 wraps out-of-range values silently. Compact columns are
+a storage format for float items: modules receive them widened back to float64
+(with_float_items) and the engine gathers them into its float block, so results
+are the same as with a float64 load. Where the standard load would keep a column as
+int64, it is stored as plain int8 and handed to the modules as int64.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from . import LazyModule
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = LazyModule("pandas")
+
+
+# Nullable integer dtypes for compact item storage and the values they hold, narrowest first
+COMPACT_DTYPES = {"Int8": (-128, 127), "UInt8": (0, 255)}
+
+
+@lru_cache(maxsize=None)
+def needs_coercion(dtype) -> bool:
+    """
+    True when a column of this dtype has to go through pd.to_numeric to be scored.
+    """
+    from pandas.api.types import is_numeric_dtype
+    return not is_numeric_dtype(dtype)
+
+
+def coercion_plan(df: pd.DataFrame, columns: Sequence[str]) -> List[str]:
+    """
+    The columns among `columns` present in `df` that are not numeric yet.
+    """
+    dtypes = df.dtypes
+    return [col for col in columns if col in dtypes.index and needs_coercion(dtypes[col])]
+
+
+def coerce_columns(df: pd.DataFrame, columns: Sequence[str]) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Convert the non-numeric columns among `columns` with pd.to_numeric(errors='coerce'),
+    in one assignment. Non-numeric cells become NaN. Returns (frame, converted columns);
+    the input frame is left unchanged and returned as is when nothing needs converting.
+    """
+    import pandas as pd
+    converted = coercion_plan(df, columns)
+    if not converted:
+        return df, converted
+    return df.assign(**{col: pd.to_numeric(df[col], errors="coerce") for col in converted}), converted
+
+
+def numeric_items(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """
+    The given item columns as a numeric DataFrame indexed like `df`.
+    Numeric columns are used as they are; others are coerced, non-numeric cells becoming NaN.
+
+    Raises:
+        KeyError: if any of the columns is missing
+    """
+    import pandas as pd
+    return pd.DataFrame({
+        col: pd.to_numeric(df[col], errors="coerce") if needs_coercion(df[col].dtype) else df[col]
+        for col in columns
+    }, index=df.index)
+
+
+def compact_dtype(low, high) -> Optional[str]:
+    """
+    The compact dtype holding every response of a scale from `low` to `high`, or None.
+    """
+    for name, (smallest, largest) in COMPACT_DTYPES.items():
+        if smallest <= low and high <= largest:
+            return name
+    return None
+
+
+def is_compact(dtype) -> bool:
+    """
+    True for the compact item dtypes (nullable 1-byte integers).
+    """
+    from pandas.api.types import is_extension_array_dtype, is_integer_dtype
+    return is_extension_array_dtype(dtype) and is_integer_dtype(dtype) and dtype.itemsize == 1
+
+
+def scored_as_integer(dtype) -> bool:
+    """
+    True when items of this dtype keep integer sums in the scoring engine.
+    Compact columns score as the float64 items they stand in for.
+    """
+    from pandas.api.types import is_integer_dtype
+    return is_integer_dtype(dtype) and not is_compact(dtype)
+
+
+def compact_column(series: pd.Series, dtype: str) -> Optional[pd.Series]:
+    """
+    A numeric column stored as compact `dtype`, or None when a value is not a whole
+    number within the dtype's range. Missing values become <NA>.
+    """
+    import numpy as np
+    import pandas as pd
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    missing = np.isnan(values)
+    present = values[~missing]
+    smallest, largest = COMPACT_DTYPES[dtype]
+    if present.size and (present.min() < smallest or present.max() > largest
+                         or not np.array_equal(present, np.rint(present))):
+        return None
+    data = np.where(missing, 0, values).astype(pd.api.types.pandas_dtype(dtype).numpy_dtype)
+    return pd.Series(pd.arrays.IntegerArray(data, missing), index=series.index, name=series.name)
+
+
+def compact_columns(df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+    """
+    Store the columns named in `dtypes` ({column: compact dtype}) compactly. Non-numeric
+    cells become missing as in coerce_columns; columns that do not fit their dtype are
+    stored as float64, as the standard load does. Columns absent from `df` are skipped.
+    """
+    import pandas as pd
+    converted = {}
+    for col, dtype in dtypes.items():
+        if col not in df.columns:
+            continue
+        series = df[col]
+        if needs_coercion(series.dtype):
+            series = pd.to_numeric(series, errors="coerce")
+        compact = compact_column(series, dtype)
+        converted[col] = series.astype("float64") if compact is None else compact
+    return df.assign(**converted) if converted else df
+
+
+def concat_compact(chunks: List[pd.DataFrame], columns: Sequence[str]) -> pd.DataFrame:
+    """
+    Concatenate row chunks loaded with compact_columns. A column among `columns` that
+    was compact in some chunks only is widened to float64 throughout.
+    """
+    import pandas as pd
+    first = chunks[0]
+    mixed = [col for col in columns if col in first.columns
+             and any(chunk[col].dtype != first[col].dtype for chunk in chunks[1:])]
+    if mixed:
+        chunks = [chunk.astype({col: "float64" for col in mixed}) for chunk in chunks]
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else first
+
+
+def plain_compact(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """
+    `df` with the compact columns among `columns`, which must hold no <NA>, stored as plain
+    1-byte integers: whole-number columns without blanks are integers in the standard load too.
+    """
+    return df.astype({col: df[col].dtype.numpy_dtype for col in columns if is_compact(df[col].dtype)})
+
+
+def widen_compact(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """
+    `df` with the compact columns among `columns` widened to float64 (<NA> becoming NaN)
+    and plain 1-byte integer columns widened to int64. Returns `df` itself when there are none.
+    """
+    from pandas.api.types import is_integer_dtype
+    widened = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        dtype = df[col].dtype
+        if is_compact(dtype):
+            widened[col] = df[col].astype("float64")
+        elif is_integer_dtype(dtype) and dtype.itemsize == 1:
+            widened[col] = df[col].astype("int64")
+    return df.assign(**widened) if widened else df
+
+
+def with_float_items(score_fn, columns: Sequence[str]):
+    """
+    Wraps a questionnaire's main() so it receives its compact item columns as float64,
+    the dtype the modules are written against. The widened copies exist only while it runs.
+    """
+    def score(df):
+        return score_fn(widen_compact(df, columns))
+    return score
@@ -1,94 +1,751 @@
-import pandas as pd
-from questionnaire_analysis.questionnaires import (
-UCLA, PANAS, RAS, GCF, ECR, MSPSS, SWLS, ALQ, BEQ, IRQ,
-CESDR, MINI_MASQ, PMERQ, BFI, SU, EERQ, HEXACO, CARE, SD4, CBCL, UPPS,
-BSSS, SIAS, PSS, LOTR, DOSPERT, IPPA
-)
-
-def access_csv(file_path, delimiter=","):
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from questionnaire_analysis.cache import block_key, cache_key, resolve_cache
+from questionnaire_analysis.coercion import (coerce_columns, compact_columns, compact_dtype, concat_compact,
+                                             plain_compact, with_float_items)
+from questionnaire_analysis.detection import PrefixIndex, plan_columns, questionnaire_items
+from questionnaire_analysis.formats import (SUMMARY_EXTENSIONS, TableWriter, file_format, iter_batches,
+                                            output_path, read_columns, read_header, write_table)
+from questionnaire_analysis.metrics import RunMetrics
+from questionnaire_analysis.parallel import score_questionnaires_sharded
+from questionnaire_analysis.parse_cache import resolve_parse_cache
+from questionnaire_analysis.qualtrics import (HEADER_ROWS, STATUS_COLUMNS, keep_finished, read_qualtrics_header,
+                                              rename_by_import_id)
+from questionnaire_analysis.registry import PLUGIN_GROUP, QuestionnaireRegistry
+from questionnaire_analysis.scoring_engine import score_questionnaire, score_questionnaires_fused
+from questionnaire_analysis.specs import item_columns, specs_by_prefix
+
+logger = logging.getLogger(__name__)
+
+# Identifier and subgroup columns kept alongside the questionnaire items
+ID_COLUMNS = ["ResponseId", "SubjectID"]
+SUBGROUP_COLUMNS = ["Gender"]
+
+# Questionnaire List: prefix -> module in questionnaire_analysis.questionnaires (or "module:function"),
+# imported the first time its prefix is detected. Installed plugins are added from their entry points.
+QUESTIONNAIRE_MODULES = {
+    "UCLA_": "UCLA",
+    "PANAS_": "PANAS",
+    "RAS_": "RAS",
+    "GCF_": "GCF",
+    "ECR_": "ECR",
+    "MSPSS_": "MSPSS",
+    "SWLS_": "SWLS",
+    "ALQ_": "ALQ",
+    "BEQ_": "BEQ",
+    "IRQ_": "IRQ",
+    "CESDR_": "CESDR",
+    "MASQ_": "MINI_MASQ",
+    "PMERQ_": "PMERQ",
+    "BFI_": "BFI",
+    "SU_": "SU",
+    "EERQ_": "EERQ",
+    "HEXACO_": "HEXACO",
+    "CARE_": "CARE",
+    "SD4_": "SD4",
+    "CBCL_": "CBCL",
+    "UPPS_": "UPPS",
+    "BSSS_": "BSSS",
+    "SIAS_": "SIAS",
+    "PSS_": "PSS",
+    "LOTR_": "LOTR",
+    "DOSPERT_": "DOSPERT",
+    "IPPA_": "IPPA"
+}
+QUESTIONNAIRE_MAP = QuestionnaireRegistry(QUESTIONNAIRE_MODULES, plugin_group=PLUGIN_GROUP)
+
+_prefix_index = None
+
+def configure_logging(verbose=False, quiet=False):
+    """
+    Sends package log messages to stdout as plain lines.
+    The default level (INFO) reports progress; `verbose` adds the per-questionnaire
+    score tables and summary statistics (DEBUG), `quiet` keeps only warnings and errors.
+    Score summaries are only computed when DEBUG is enabled.
+    """
+    level = logging.DEBUG if verbose else logging.WARNING if quiet else logging.INFO
+    logging.basicConfig(format="%(message)s", stream=sys.stdout, level=level, force=True)
+    return level
+
+def get_prefix_index():
+    """
+    Returns the prefix index over QUESTIONNAIRE_MAP, rebuilding it if the map has changed.
+    """
+    global _prefix_index
+    if _prefix_index is None or _prefix_index.prefixes != list(QUESTIONNAIRE_MAP):
+        _prefix_index = PrefixIndex(QUESTIONNAIRE_MAP)
+    return _prefix_index
+
+def access_csv(file_path, delimiter=",", usecols=None, dtype=None, engine=None, skip_rows=0, names=None,
+               parse_cache=None):
+    """
+    Loads a CSV, Parquet or Arrow file, or returns None when it does not exist.
+    `engine="pyarrow"` parses CSV with pyarrow's multithreaded reader (pandas when
+    pyarrow is not installed); other values are passed to pd.read_csv.
+    `skip_rows` and `names` skip rows under a CSV header and rename its columns.
+
+    With a `parse_cache` (True for the default directory, a directory path or a
+    parse_cache.ParseCache) a CSV is parsed once into a memory-mapped Arrow file and
+    later loads of the unchanged file read their columns from it (see parse_cache).
+    """
     try:
-        df = pd.read_csv(file_path, delimiter=delimiter)
-        print(f"Data loaded successfully from {file_path}.")
+        df = None
+        parse_cache = resolve_parse_cache(parse_cache)
+        if parse_cache is not None and file_format(file_path) == "csv":
+            df = parse_cache.read(file_path, usecols, delimiter=delimiter, dtype=dtype, skip_rows=skip_rows,
+                                  names=names,
+                                  # Identifiers keep leading zeros; other columns are inferred
+                                  text_columns=ID_COLUMNS + SUBGROUP_COLUMNS)
+        if df is None:
+            df = read_columns(file_path, usecols, delimiter=delimiter, dtype=dtype, engine=engine,
+                              skip_rows=skip_rows, names=names)
+        logger.info(f"Data loaded successfully from {file_path}.")
         return df
     except FileNotFoundError:
-        print(f"File not found: {file_path}")
+        logger.error(f"File not found: {file_path}")
         return None
 
-# Questionnaire List 
-def detect_questionnaires(df):
-    questionnaire_map = {
-    "UCLA_": UCLA.main,
-    "PANAS_": PANAS.main,
-    "RAS_": RAS.main,
-    "GCF_": GCF.main,
-    "ECR_": ECR.main,
-    "MSPSS_": MSPSS.main,
-    "SWLS_": SWLS.main,
-    "ALQ_": ALQ.main,
-    "BEQ_": BEQ.main,
-    "IRQ_": IRQ.main,
-    "CESDR_": CESDR.main,
-    "MASQ_": MINI_MASQ.main,
-    "PMERQ_": PMERQ.main,
-    "BFI_": BFI.main,
-    "SU_": SU.main,
-    "EERQ_": EERQ.main,
-    "HEXACO_": HEXACO.main,
-    "CARE_": CARE.main,
-    "SD4_": SD4.main,
-    "CBCL_": CBCL.main,
-    "UPPS_": UPPS.main,
-    "BSSS_": BSSS.main,
-    "SIAS_": SIAS.main,
-    "PSS_": PSS.main,
-    "LOTR_": LOTR.main,
-    "DOSPERT_": DOSPERT.main,
-    "IPPA_": IPPA.main
-}
-    detected = {}
-    for prefix, main_fn in questionnaire_map.items():
-        if any(col.startswith(prefix) for col in df.columns):
-            detected[prefix] = main_fn
-    return detected
-def analyze_questionnaire_csv(csv_path, output_summary=True):
+def access_qualtrics_csv(file_path, delimiter=",", usecols=None, dtype=None, engine=None, import_ids=None,
+                         finished_only=True, parse_cache=None):
     """
-    Loads a CSV, detects questionnaires, runs analyses, and returns or saves the summary.
+    Loads a Qualtrics CSV export, skipping the question text and ImportId rows under
+    the column names while parsing. `import_ids` ({ImportId: column}) renames columns
+    by their ImportId; `usecols` and `dtype` refer to the renamed columns. With
+    `finished_only` unfinished responses (see qualtrics.finished_mask) are dropped.
+    Files without the extra header rows are loaded as plain CSV. `parse_cache` is
+    used as in access_csv.
     """
-    df = access_csv(csv_path)
-    if df is None:
+    try:
+        header = read_qualtrics_header(file_path, delimiter=delimiter)
+    except FileNotFoundError:
+        logger.error(f"File not found: {file_path}")
         return None
+    if header is None:
+        logger.warning(f"{file_path} has no Qualtrics header rows; loading it as a plain CSV.")
+        return access_csv(file_path, delimiter=delimiter, usecols=usecols, dtype=dtype, engine=engine,
+                          parse_cache=parse_cache)
 
-    detected = detect_questionnaires(df)
-    if not detected:
-        print("No recognized questionnaires detected in the CSV.")
+    columns = rename_by_import_id(header, import_ids)
+    layout = {"skip_rows": HEADER_ROWS, "names": columns}
+    status = _status_columns(columns, usecols) if finished_only else []
+    df = access_csv(file_path, delimiter=delimiter, usecols=None if usecols is None else usecols + status,
+                    dtype=_with_status_dtypes(dtype, status), engine=engine, parse_cache=parse_cache,
+                    **layout)
+    return keep_finished(df, status) if finished_only and df is not None else df
+
+def _read_input_header(file_path, delimiter=",", import_ids=None):
+    """
+    Reads the column names of an input file and how to parse it. Returns
+    (columns, layout, qualtrics): for a Qualtrics CSV export the columns are renamed
+    by `import_ids` and `layout` holds the access_csv arguments that skip its extra
+    header rows; for other files `layout` is empty. None when the file does not exist.
+    """
+    columns = read_csv_header(file_path, delimiter=delimiter)
+    if columns is None:
         return None
+    if file_format(file_path) != "csv":
+        return columns, {}, False
+    header = read_qualtrics_header(file_path, delimiter=delimiter)
+    if header is None:
+        return columns, {}, False
+    columns = rename_by_import_id(header, import_ids)
+    return columns, {"skip_rows": HEADER_ROWS, "names": columns}, True
+
+def _status_columns(columns, usecols):
+    # Response status columns present in `columns` that a load of `usecols` has to add
+    if usecols is None:
+        return []
+    return [col for col in STATUS_COLUMNS if col in columns and col not in usecols]
+
+def _with_status_dtypes(dtype, status):
+    # Status columns are only compared as text; parsing them must never fail
+    if dtype is None or not status:
+        return dtype
+    return {**dtype, **{col: "str" for col in status}}
+
+def read_csv_header(file_path, delimiter=","):
+    """
+    Reads only the header row of a CSV (the schema of a Parquet or Arrow file) and returns its column names.
+    """
+    try:
+        return read_header(file_path, delimiter=delimiter)
+    except FileNotFoundError:
+        logger.error(f"File not found: {file_path}")
+        return None
+
+def resolve_columns(columns):
+    """
+    Resolves which questionnaire prefixes appear in a header and which columns are needed to score them.
+    Returns (prefixes, usecols); usecols keeps the header order and includes the ID and subgroup columns.
+    """
+    index = get_prefix_index()
+    keep = set(ID_COLUMNS) | set(SUBGROUP_COLUMNS)
+    prefixes = set()
+    usecols = []
+    for col in columns:
+        matched = index.matches(col)
+        if matched:
+            prefixes.update(matched)
+            usecols.append(col)
+        elif col in keep:
+            usecols.append(col)
+    return [prefix for prefix in index.prefixes if prefix in prefixes], usecols
+
+def build_column_dtypes(usecols):
+    """
+    Builds the explicit dtype mapping for a projected load: identifiers, subgroups and
+    response status columns as strings. Questionnaire items are left to the parser's
+    inference, so whole-number items without blanks stay integers and their sums print as such.
+    """
+    text_columns = set(ID_COLUMNS) | set(SUBGROUP_COLUMNS) | set(STATUS_COLUMNS)
+    return {col: "str" for col in usecols if col in text_columns}
+
+# Rows parsed at a time by the compact load; bounds the float64 copy of the item block
+COMPACT_LOAD_ROWS = 20_000
+
+def compact_item_dtypes(columns):
+    """
+    Maps each questionnaire column in `columns` (scored items and other columns
+    sharing the prefix) to the compact dtype of its questionnaire's response scale
+    (see coercion.compact_dtype). Questionnaires without a specification or a scale
+    are left out.
+    """
+    specs = specs_by_prefix()
+    dtypes = {}
+    for prefix, entry in plan_questionnaires(columns).items():
+        scale = specs[prefix].get("scale", {}) if prefix in specs else {}
+        if "min" not in scale or "max" not in scale:
+            continue
+        dtype = compact_dtype(scale["min"], scale["max"])
+        if dtype is not None:
+            dtypes.update((col, dtype) for col in entry["items"] + entry["extra"])
+    return dtypes
+
+def access_compact_csv(file_path, usecols, delimiter=",", chunk_rows=COMPACT_LOAD_ROWS, **layout):
+    """
+    Loads `usecols` in chunks of `chunk_rows` rows, storing each chunk's item columns
+    as nullable 1-byte integers (Int8/UInt8, from each questionnaire's response scale)
+    before the next chunk is parsed. Non-numeric cells become missing; columns with
+    values outside the dtype or fractional values are kept as float64.
+    `layout` (skip_rows, names) is passed to the CSV reader as in access_csv.
+    """
+    from pandas.api.types import is_integer_dtype
+    dtypes = compact_item_dtypes(usecols)
+    chunks = []
+    integer_columns = set(dtypes)
+    for chunk in iter_batches(file_path, usecols, chunk_rows, delimiter=delimiter,
+                              dtype=build_column_dtypes(usecols), **layout):
+        parsed = chunk.dtypes
+        integer_columns.intersection_update(col for col in dtypes if is_integer_dtype(parsed[col]))
+        chunks.append(compact_columns(chunk, dtypes))
+    if not chunks:
+        return access_csv(file_path, delimiter=delimiter, usecols=usecols, **layout)
+    logger.info(f"Data loaded successfully from {file_path}.")
+    return plain_compact(concat_compact(chunks, list(dtypes)), integer_columns)
+
+def access_questionnaire_csv(file_path, delimiter=",", compact=False, engine=None, import_ids=None,
+                             finished_only=True, parse_cache=None):
+    """
+    Loads only the questionnaire item, ID and subgroup columns of a CSV, Parquet or
+    Arrow file, after reading its header. Qualtrics exports are detected and their
+    extra header rows skipped.
+
+    Args:
+        compact: Store the item columns as nullable 1-byte integers (see access_compact_csv)
+        engine: CSV parser of the standard load (see access_csv)
+        import_ids: {ImportId: column} renames for Qualtrics exports
+        finished_only: Keep only finished Qualtrics responses
+
+    Returns:
+        The loaded DataFrame, or None if the file could not be read
+    """
+    header = _read_input_header(file_path, delimiter=delimiter, import_ids=import_ids)
+    if header is None:
+        return None
+    columns, layout, qualtrics = header
+
+    prefixes, usecols = resolve_columns(columns)
+    status = _status_columns(columns, usecols) if qualtrics and finished_only else []
+    usecols = usecols + status
+    if not prefixes:
+        # Nothing to score; only the identifier columns are worth parsing
+        df = access_csv(file_path, delimiter=delimiter, usecols=usecols,
+                        dtype={col: "str" for col in status} or None, engine=engine, parse_cache=parse_cache,
+                        **layout)
+    elif compact:
+        df = access_compact_csv(file_path, usecols, delimiter=delimiter, **layout)
+    else:
+        df = access_csv(file_path, delimiter=delimiter, usecols=usecols, dtype=build_column_dtypes(usecols),
+                        engine=engine, parse_cache=parse_cache, **layout)
+    if qualtrics and finished_only and df is not None:
+        df = keep_finished(df, status)
+    return df
+
+def plan_questionnaires(columns):
+    """
+    Detects questionnaires in a header with one pass over the prefix index.
+    Returns, per detected prefix, its main() ("main"), the expected item columns found ("items"),
+    the expected item columns absent from the header ("missing") and other prefixed columns ("extra").
+    Expected items come from the specifications and the ITEMS of plugins. A questionnaire
+    whose module or plugin fails to import is reported and left out.
+    """
+    declared = QUESTIONNAIRE_MAP.declared_items()
+    plan = plan_columns(get_prefix_index(), columns, {**questionnaire_items(), **declared})
+    mains = {}
+    for prefix in plan:
+        try:
+            mains[prefix] = QUESTIONNAIRE_MAP[prefix]
+        except Exception as e:
+            logger.error(f"Could not load questionnaire '{prefix}': {e}")
+    # Plugins declare their items when loaded, so plan again if one just did
+    if QUESTIONNAIRE_MAP.declared_items() != declared:
+        declared = QUESTIONNAIRE_MAP.declared_items()
+        plan = plan_columns(get_prefix_index(), columns, {**questionnaire_items(), **declared})
+    return {prefix: {**entry, "main": mains[prefix]} for prefix, entry in plan.items() if prefix in mains}
+
+def detect_questionnaires(df):
+    return {prefix: entry["main"] for prefix, entry in plan_questionnaires(df.columns).items()}
+
+def report_plan(plan):
+    """
+    Logs a warning for each planned questionnaire with expected items missing.
+    """
+    for prefix, entry in plan.items():
+        if entry["missing"]:
+            logger.warning(f"Warning: '{prefix}' is missing {len(entry['missing'])} expected item(s): "
+                  f"{', '.join(entry['missing'])}")
+@lru_cache(maxsize=32)
+def _header_plan(columns, prefixes):
+    # Keyed by the registered prefixes too, so a changed QUESTIONNAIRE_MAP is not served a stale plan
+    return plan_questionnaires(columns)
+
+def _detected_item_columns(columns, detected):
+    plan = _header_plan(tuple(columns), tuple(QUESTIONNAIRE_MAP))
+    return [col for prefix in detected if prefix in plan for col in plan[prefix]["items"]]
+
+def _module_columns(columns, prefix):
+    entry = _header_plan(tuple(columns), tuple(QUESTIONNAIRE_MAP)).get(prefix)
+    return entry["items"] + entry["extra"] if entry else []
+
+def coerce_detected_items(df, detected):
+    """
+    The coercion stage: converts the item columns of the detected questionnaires that are
+    not numeric yet with pd.to_numeric(errors='coerce'), in one pass, so no questionnaire
+    converts them again. Returns the converted frame; `df` is left unchanged.
+    The item columns are planned once per header, so streamed chunks reuse the plan.
+    """
+    columns = _detected_item_columns(df.columns, detected)
+    df, converted = coerce_columns(df, columns)
+    if converted:
+        logger.debug(f"Converted {len(converted)} non-numeric item column(s) to numbers.")
+    return df
+
+# Scoring backends accepted by run_questionnaires and analyze_questionnaire_csv
+BACKENDS = ("modules", "engine", "fused", "processes")
+# Specifications are the definition runs score from; the modules are the reference the
+# equivalence harness checks them against, and score questionnaires without a specification
+DEFAULT_BACKEND = "engine"
+
+def get_scoring_function(prefix, main_fn, backend=DEFAULT_BACKEND, items=None):
+    """
+    Returns the callable that scores one questionnaire for the chosen backend.
+    The specification backends ("engine", "fused", "processes") score from the
+    declarative specification, reading the item columns `items` resolved by the
+    detection plan when given, and fall back to the module's main() for
+    questionnaires without one.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'; expected one of {', '.join(BACKENDS)}")
+    if backend != "modules":
+        spec = specs_by_prefix().get(prefix)
+        if spec is not None:
+            return lambda df: score_questionnaire(df, spec, columns=items)
+    return main_fn
+
+def score_combined(df, detected, backend="fused", max_workers=None):
+    """
+    Scores every detected questionnaire that has a specification and all of its item
+    columns together: in one fused pass ("fused") or in row shards on a process pool
+    of `max_workers` processes ("processes"). Returns {prefix: scores}; questionnaires
+    left out are scored one at a time by run_questionnaires.
+    """
+    specs = specs_by_prefix()
+    fusable = {
+        prefix: specs[prefix] for prefix in detected
+        if prefix in specs and all(col in df.columns for col in item_columns(specs[prefix]))
+    }
+    if not fusable:
+        return {}
+    try:
+        if backend == "processes":
+            return score_questionnaires_sharded(df, fusable, max_workers=max_workers)
+        return score_questionnaires_fused(df, fusable)
+    except Exception as e:
+        logger.warning(f"Combined scoring failed, scoring questionnaires one at a time: {e}")
+        return {}
+
+def measured(score_fn, prefix, metrics):
+    """
+    Wraps a scoring function so each call is recorded under `prefix` in `metrics`.
+    """
+    def score(df):
+        with metrics.questionnaire(prefix, rows=len(df)):
+            return score_fn(df)
+    return score
+
+def cached_blocks(df, detected, backend, block_cache, metrics):
+    """
+    Looks up each questionnaire's scores in `block_cache` (see cache.block_key).
+    Returns ({prefix: key}, {prefix: cached scores}) for the questionnaires found.
+    """
+    with metrics.stage("block_cache", rows=len(df)):
+        keys = {prefix: block_key(df[_module_columns(df.columns, prefix)], prefix, main_fn, backend)
+                for prefix, main_fn in detected.items()}
+        blocks = {}
+        for prefix, key in keys.items():
+            block = block_cache.load(key)
+            if block is not None:
+                blocks[prefix] = block
+    if blocks:
+        logger.info(f"Reusing cached scores of {len(blocks)} of {len(keys)} questionnaire(s).")
+    return keys, blocks
+
+def run_questionnaires(df, detected, backend=DEFAULT_BACKEND, max_workers=None, metrics=None, block_cache=None):
+    """
+    Runs each detected questionnaire on the DataFrame and concatenates the results.
+    Returns None when no questionnaire produced output.
+
+    With `max_workers` above 1 the questionnaires are scored on a thread pool that
+    shares `df` read-only; results are still concatenated in detection order and a
+    failing questionnaire is reported and skipped as in the sequential loop. The
+    "processes" backend uses `max_workers` as its process count instead.
+
+    Each questionnaire's scoring and the final concatenation are recorded in
+    `metrics` (a RunMetrics) when given; questionnaires scored together by the
+    "fused" and "processes" backends are recorded as the "combined_scoring" stage.
+
+    Item columns that are not numeric are coerced once beforehand (the "coerce" stage).
+    Compact (Int8/UInt8) item columns are handed to the modules as float64.
+
+    With a `block_cache` (cache.ResultCache) each questionnaire whose columns, module,
+    specification and scoring code are unchanged since a previous run is taken from
+    the cache; only the others are scored, and their scores are cached. The cache is
+    evicted once, after the last questionnaire is stored.
+    """
+    import pandas as pd
+    if metrics is None:
+        metrics = RunMetrics()
+    with metrics.stage("coerce", rows=len(df)):
+        df = coerce_detected_items(df, detected)
+    keys, blocks = cached_blocks(df, detected, backend, block_cache, metrics) if block_cache else ({}, {})
+    to_score = {prefix: main_fn for prefix, main_fn in detected.items() if prefix not in blocks}
+    if backend in ("fused", "processes") and to_score:
+        with metrics.stage("combined_scoring", rows=len(df)):
+            fused = score_combined(df, to_score, backend=backend, max_workers=max_workers)
+    else:
+        fused = {}
+    plan = _header_plan(tuple(df.columns), tuple(QUESTIONNAIRE_MAP))
+    pending = {}
+    for prefix, main_fn in to_score.items():
+        logger.info(f"Processing questionnaire with prefix '{prefix}'...")
+        if prefix not in fused:
+            # A complete plan lists the items in specification order; otherwise the engine reports what is missing
+            entry = plan.get(prefix)
+            items = entry["items"] if entry and not entry["missing"] else None
+            score_fn = get_scoring_function(prefix, main_fn, backend, items=items)
+            if score_fn is main_fn:
+                # Modules are written against float items; compact columns are widened for them
+                score_fn = with_float_items(main_fn, _module_columns(df.columns, prefix))
+            pending[prefix] = measured(score_fn, prefix, metrics)
+
+    if backend != "processes" and max_workers is not None and max_workers > 1 and len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {prefix: executor.submit(score_fn, df) for prefix, score_fn in pending.items()}
+    else:
+        futures = None
 
-    # Run all detected questionnaires and concatenate results
     summary_dfs = []
-    for prefix, main_fn in detected.items():
-        print(f"Processing questionnaire with prefix '{prefix}'...")
+    for prefix in detected:
         try:
-            summary_df = main_fn(df)
+            if prefix in blocks:
+                summary_df = blocks[prefix]
+            elif prefix in fused:
+                summary_df = fused[prefix]
+            elif futures is not None:
+                summary_df = futures[prefix].result()
+            else:
+                summary_df = pending[prefix](df)
             if summary_df is not None:
                 summary_dfs.append(summary_df)
+                if prefix in keys and prefix not in blocks:
+                    block_cache.store(keys[prefix], summary_df, evict=False)
         except Exception as e:
-            print(f"Error processing questionnaire '{prefix}': {e}")
+            logger.error(f"Error processing questionnaire '{prefix}': {e}")
             continue
+    if len(blocks) < len(keys):
+        block_cache.evict()
 
-    # Combine all summaries (if multiple)
     if summary_dfs:
-        final_summary = pd.concat(summary_dfs, axis=1)
-        
+        with metrics.stage("concat", rows=len(df)):
+            return pd.concat(summary_dfs, axis=1)
+    return None
+
+class SummaryStatistics:
+    """
+    Running count, mean and standard deviation of the numeric summary columns.
+
+    Chunks are merged with the parallel variance formula (Chan et al.), so the
+    result matches what pandas would report for the whole file at once.
+    """
+
+    def __init__(self):
+        self.count = None
+        self.mean = None
+        self.m2 = None
+
+    def update(self, summary_df):
+        numeric = summary_df.select_dtypes(include="number")
+        count = numeric.count()
+        mean = numeric.mean()
+        m2 = ((numeric - mean) ** 2).sum()
+        if self.count is None:
+            self.count, self.mean, self.m2 = count, mean, m2
+            return
+
+        columns = self.count.index.union(count.index, sort=False)
+        n_a = self.count.reindex(columns, fill_value=0)
+        n_b = count.reindex(columns, fill_value=0)
+        mean_a = self.mean.reindex(columns).fillna(0)
+        mean_b = mean.reindex(columns).fillna(0)
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        safe_n = n.where(n > 0)
+        self.mean = (mean_a + delta * n_b / safe_n).where(n > 0)
+        self.m2 = (self.m2.reindex(columns).fillna(0) + m2.reindex(columns).fillna(0)
+                   + delta ** 2 * n_a * n_b / safe_n).fillna(0)
+        self.count = n
+
+    def to_frame(self):
+        """
+        Returns one row per summary column with its count, mean and std (ddof=1).
+        """
+        import pandas as pd
+        if self.count is None:
+            return pd.DataFrame(columns=["count", "mean", "std"])
+        std = (self.m2 / (self.count - 1).where(self.count > 1)) ** 0.5
+        return pd.DataFrame({"count": self.count, "mean": self.mean, "std": std})
+
+def analyze_questionnaire_csv_chunked(csv_path, chunksize, output_summary=True, backend=DEFAULT_BACKEND,
+                                      max_workers=None, metrics=None, summary_format="csv", import_ids=None,
+                                      finished_only=True):
+    """
+    Streams a CSV (or Parquet/Arrow file) in chunks of `chunksize` rows, scores each chunk
+    and appends it to the summary file. Returns the per-column summary statistics
+    accumulated over all chunks.
+    Stage timings are accumulated over the chunks in `metrics` when given.
+    Qualtrics exports are read as in access_questionnaire_csv, unfinished responses
+    being dropped from each chunk. Streamed runs do not use the result cache.
+    """
+    if metrics is None:
+        metrics = RunMetrics(source=csv_path)
+    with metrics.stage("header"):
+        header = _read_input_header(csv_path, import_ids=import_ids)
+        if header is None:
+            return None
+        columns, layout, qualtrics = header
+        _, usecols = resolve_columns(columns)
+        status = _status_columns(columns, usecols) if qualtrics and finished_only else []
+        usecols = usecols + status
+    # Item dtypes stay inferred: a non-numeric cell deep in the file must not abort the stream
+    reader = iter_batches(csv_path, usecols, chunksize, dtype=build_column_dtypes(usecols),
+                          **layout)
+
+    summary_path = summary_output_path(csv_path, summary_format)
+    statistics = SummaryStatistics()
+    detected = None
+    summary_columns = None
+    total_rows = 0
+    removed_rows = 0
+
+    with TableWriter(summary_path, summary_format) as writer:
+        for chunk_number, chunk in enumerate(metrics.iterate(reader, "load"), start=1):
+            if detected is None:
+                with metrics.stage("detect"):
+                    plan = plan_questionnaires(chunk.columns)
+                    report_plan(plan)
+                    detected = {prefix: entry["main"] for prefix, entry in plan.items()}
+                if not detected:
+                    logger.warning("No recognized questionnaires detected in the CSV.")
+                    return None
+            if qualtrics and finished_only:
+                chunk = keep_finished(chunk, status)
+                if chunk.empty:
+                    continue
+
+            logger.info(f"Scoring chunk {chunk_number} ({len(chunk)} rows)...")
+            with metrics.stage("score", rows=len(chunk)):
+                chunk_summary = run_questionnaires(chunk, detected, backend=backend, max_workers=max_workers,
+                                                   metrics=metrics)
+            if chunk_summary is None:
+                continue
+
+            with metrics.stage("clean", rows=len(chunk_summary)):
+                # Keep the column layout of the first chunk so appended rows stay aligned
+                if summary_columns is None:
+                    summary_columns = list(chunk_summary.columns)
+                chunk_summary = chunk_summary.reindex(columns=summary_columns)
+
+                initial_row_count = len(chunk_summary)
+                chunk_summary = chunk_summary.dropna(how='all')
+                removed_rows += initial_row_count - len(chunk_summary)
+                total_rows += len(chunk_summary)
+
+            with metrics.stage("statistics", rows=len(chunk_summary)):
+                statistics.update(chunk_summary)
+            if output_summary:
+                with metrics.stage("write", rows=len(chunk_summary)):
+                    writer.write(chunk_summary)
+
+    if summary_columns is None:
+        return None
+    if removed_rows > 0:
+        logger.info(f"Removed {removed_rows} completely empty row(s) from the summary CSV.")
+    if output_summary:
+        logger.info(f"Summary of {total_rows} row(s) saved to: {summary_path}")
+    return statistics.to_frame()
+
+def summary_output_path(csv_path, summary_format="csv"):
+    """
+    Returns the path of the summary written for an input file: export.csv -> export_summary.csv,
+    export.parquet -> export_summary.parquet with summary_format="parquet".
+    """
+    return output_path(csv_path, "_summary", SUMMARY_EXTENSIONS[summary_format])
+
+def metrics_output_path(csv_path):
+    """
+    Returns the path of the metrics JSON written next to an input's summary.
+    """
+    return output_path(csv_path, "_metrics", ".json")
+
+def analyze_questionnaire_csv(csv_path, output_summary=True, chunksize=None, backend=DEFAULT_BACKEND,
+                              max_workers=None, return_metrics=False, write_metrics=False, compact=False,
+                              summary_format="csv", csv_engine=None, import_ids=None, finished_only=True,
+                              cache=True, parse_cache=None):
+    """
+    Loads a CSV, detects questionnaires, runs analyses, and returns or saves the summary.
+    Also reads Parquet and Arrow files; see the README for the backends, caches and load options.
+
+    Args:
+        chunksize: Stream the input in chunks of this many rows instead of loading it whole
+        backend: "engine" (default), "fused", "processes" or "modules"
+        cache: True, a directory path, a ResultCache, or False to always recompute
+
+    Returns:
+        The summary DataFrame (per-column statistics when streamed) or None, with the
+        RunMetrics as a (summary, metrics) tuple when `return_metrics` is set
+    """
+    if summary_format not in SUMMARY_EXTENSIONS:
+        raise ValueError(f"Unknown summary format '{summary_format}'; "
+                         f"expected one of {', '.join(SUMMARY_EXTENSIONS)}")
+    metrics = RunMetrics(source=csv_path)
+    if chunksize:
+        final_summary = analyze_questionnaire_csv_chunked(csv_path, chunksize, output_summary=output_summary,
+                                                          backend=backend, max_workers=max_workers,
+                                                          metrics=metrics, summary_format=summary_format,
+                                                          import_ids=import_ids, finished_only=finished_only)
+    else:
+        final_summary = _analyze_loaded_csv(csv_path, output_summary, backend, max_workers, metrics,
+                                            compact=compact, summary_format=summary_format,
+                                            csv_engine=csv_engine, import_ids=import_ids,
+                                            finished_only=finished_only, cache=cache, parse_cache=parse_cache)
+
+    if write_metrics:
+        metrics.write_json(metrics_output_path(csv_path))
+        logger.info(f"Metrics saved to: {metrics_output_path(csv_path)}")
+    if return_metrics:
+        return final_summary, metrics
+    return final_summary
+
+def cache_lookup(csv_path, cache, options, metrics, import_ids=None):
+    """
+    Looks up the result of analyzing `csv_path` with `options` in `cache` (see cache.resolve_cache).
+    Returns (cache, key, summary): summary is None on a miss, and cache and key are None
+    when caching is off or the file does not exist.
+    """
+    cache = resolve_cache(cache)
+    if cache is None or not os.path.isfile(csv_path):
+        return None, None, None
+    with metrics.stage("cache"):
+        columns, _, _ = _read_input_header(csv_path, import_ids=import_ids)
+        detected = {prefix: entry["main"] for prefix, entry in plan_questionnaires(columns).items()}
+        key = cache_key(csv_path, detected, options)
+        summary = cache.load(key)
+    if summary is not None:
+        logger.info(f"Loaded cached results for {csv_path} ({len(summary)} rows).")
+    return cache, key, summary
+
+def write_summary(final_summary, csv_path, summary_format, metrics):
+    """
+    Writes a summary next to its input file (see summary_output_path).
+    """
+    summary_path = summary_output_path(csv_path, summary_format)
+    with metrics.stage("write", rows=len(final_summary)):
+        write_table(final_summary, summary_path, summary_format)
+    logger.info(f"Summary saved to: {summary_path}")
+
+def _analyze_loaded_csv(csv_path, output_summary, backend, max_workers, metrics, compact=False,
+                        summary_format="csv", csv_engine=None, import_ids=None, finished_only=True, cache=None,
+                        parse_cache=None):
+    """
+    The in-memory path of analyze_questionnaire_csv: loads the whole CSV, then scores it.
+    """
+    options = {"backend": backend, "compact": compact, "csv_engine": csv_engine, "import_ids": import_ids,
+               "finished_only": finished_only, "drop_empty_rows": True}
+    cache, key, cached = cache_lookup(csv_path, cache, options, metrics, import_ids=import_ids)
+    if cached is not None:
+        if output_summary:
+            write_summary(cached, csv_path, summary_format, metrics)
+        return cached
+
+    with metrics.stage("load") as stage:
+        df = access_questionnaire_csv(csv_path, compact=compact, engine=csv_engine, import_ids=import_ids,
+                                      finished_only=finished_only, parse_cache=parse_cache)
+        if df is None:
+            return None
+        stage["rows"] = len(df)
+
+    with metrics.stage("detect"):
+        plan = plan_questionnaires(df.columns)
+        report_plan(plan)
+        detected = {prefix: entry["main"] for prefix, entry in plan.items()}
+    if not detected:
+        logger.warning("No recognized questionnaires detected in the CSV.")
+        return None
+
+    # Run all detected questionnaires and concatenate results
+    with metrics.stage("score", rows=len(df)):
+        final_summary = run_questionnaires(df, detected, backend=backend, max_workers=max_workers,
+                                           metrics=metrics, block_cache=cache.blocks() if cache else None)
+
+    # Combine all summaries (if multiple)
+    if final_summary is not None:
         # Remove completely empty rows from the final summary
-        initial_row_count = len(final_summary)
-        final_summary = final_summary.dropna(how='all')
-        removed_rows = initial_row_count - len(final_summary)
+        with metrics.stage("clean", rows=len(final_summary)):
+            initial_row_count = len(final_summary)
+            final_summary = final_summary.dropna(how='all')
+            removed_rows = initial_row_count - len(final_summary)
         if removed_rows > 0:
-            print(f"Removed {removed_rows} completely empty row(s) from the summary CSV.")
-        
+            logger.info(f"Removed {removed_rows} completely empty row(s) from the summary CSV.")
+        if key is not None:
+            cache.store(key, final_summary)
+
         if output_summary:
-            summary_output_path = csv_path.replace(".csv", "_summary.csv")
-            final_summary.to_csv(summary_output_path, index=False)
-            print(f"Summary saved to: {summary_output_path}")
+            write_summary(final_summary, csv_path, summary_format, metrics)
         return final_summary
-    return None
\ No newline at end of file
+    return None
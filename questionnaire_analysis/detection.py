@@ -0,0 +1,90 @@
+"""
+Prefix index used to detect questionnaires in a CSV header.
+
+Detection walks every column name once through a character trie of the known
+prefixes, so its cost depends on the header width only and not on how many
+questionnaires the package supports. A column belongs to every prefix it starts
+with, so overlapping prefixes (say a plugin's "BFI_2_" next to "BFI_") are each
+detected, as when every prefix was checked on its own.
+"""
+
+from typing import Dict, Iterable, List
+
+from .specs import item_columns, specs_by_prefix
+
+
+def questionnaire_items() -> Dict[str, List[str]]:
+    """
+    Item columns each bundled questionnaire reads when scoring, keyed by prefix,
+    as declared in its scoring specification.
+    """
+    return {prefix: item_columns(spec) for prefix, spec in specs_by_prefix().items()}
+
+
+class PrefixIndex:
+    """
+    Character trie over questionnaire prefixes.
+    """
+
+    _END = object()
+
+    def __init__(self, prefixes: Iterable[str]):
+        self.prefixes = list(prefixes)
+        self._root = {}
+        for prefix in self.prefixes:
+            node = self._root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[self._END] = prefix
+
+    def matches(self, column: str) -> List[str]:
+        """
+        Returns every known prefix that `column` starts with, shortest first.
+        """
+        node = self._root
+        matched = []
+        for char in column:
+            node = node.get(char)
+            if node is None:
+                break
+            if self._END in node:
+                matched.append(node[self._END])
+        return matched
+
+    def group(self, columns: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Groups columns by matching prefix in a single pass over the header; a column
+        matching several prefixes is listed under each of them.
+        Prefixes come back in index order; columns keep their header order.
+        """
+        found = {}
+        for column in columns:
+            for prefix in self.matches(str(column)):
+                found.setdefault(prefix, []).append(column)
+        return {prefix: found[prefix] for prefix in self.prefixes if prefix in found}
+
+
+def plan_columns(index: PrefixIndex, columns: Iterable[str],
+                 expected_items: Dict[str, List[str]] = None) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Builds the scoring plan for a header: for each detected prefix, the expected item
+    columns that are present ("items"), the expected ones that are absent ("missing")
+    and any other columns sharing the prefix ("extra").
+    """
+    if expected_items is None:
+        expected_items = questionnaire_items()
+
+    plan = {}
+    for prefix, prefixed in index.group(columns).items():
+        expected = expected_items.get(prefix)
+        if expected is None:
+            plan[prefix] = {"items": prefixed, "missing": [], "extra": []}
+            continue
+        present = set(prefixed)
+        expected_set = set(expected)
+        plan[prefix] = {
+            "items": [col for col in expected if col in present],
+            "missing": [col for col in expected if col not in present],
+            "extra": [col for col in prefixed if col not in expected_set],
+        }
+    return plan
@@ -0,0 +1,317 @@
+"""
+Golden-equivalence harness: checks that the alternative scoring backends reproduce
+the per-module outputs.
+
+Each questionnaire module's main() is the reference. Randomized datasets are scored
+by the reference and by each candidate backend ("engine", "fused", "processes"),
+optionally also in row chunks as the streaming path does and from compact (Int8/UInt8)
+item storage, and every output column is compared: maximum absolute difference, rows where only one side is NaN, and
+the dtypes. A questionnaire that fails in both is consistent; one that fails in
+only one of them is a mismatch.
+
+    python -m questionnaire_analysis.equivalence --rows 500 --seeds 0 1 2 --chunksize 128
+
+The datasets come from synthetic.synthetic_responses. Each questionnaire is given
+one layout: complete integer answers, float answers with blanks, answers mixed with
+non-numeric strings, or a partial item set with some item columns removed.
+"""
+
+import argparse
+import logging
+import sys
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_integer_dtype
+
+from .coercion import compact_columns, plain_compact, with_float_items
+from .common import (BACKENDS, coerce_detected_items, compact_item_dtypes, get_scoring_function,
+                     plan_questionnaires, score_combined)
+from .synthetic import synthetic_responses
+
+logger = logging.getLogger(__name__)
+
+LAYOUTS = ("integer", "float", "strings", "partial")
+# Non-numeric answers seen in real exports; all of them score as missing
+STRAY_STRINGS = ["N/A", "refused", "", " ", "?", "see notes"]
+
+
+def randomized_responses(rows: int, seed: int = 0, prefixes: Optional[List[str]] = None,
+                         string_rate: float = 0.05, drop_rate: float = 0.25, layouts=LAYOUTS) -> pd.DataFrame:
+    """
+    Generate responses for the equivalence checks, with one random layout per questionnaire.
+
+    Args:
+        rows: Number of respondents
+        seed: Random seed for the responses and the layouts
+        prefixes: Questionnaire prefixes to include (default: all bundled specifications)
+        string_rate: Share of answers replaced by a non-numeric string in the "strings" layout
+        drop_rate: Share of item columns removed in the "partial" layout (at least one)
+        layouts: Layouts to choose from (default: all of LAYOUTS)
+
+    Returns:
+        DataFrame with ResponseId, SubjectID, Gender and the item columns; the layout
+        chosen for each questionnaire is in `df.attrs["layouts"]`
+    """
+    df = synthetic_responses(rows, seed=seed, prefixes=prefixes, metadata=False)
+    rng = np.random.default_rng([seed, 1])
+    plan = plan_questionnaires(df.columns)
+
+    columns = {}
+    chosen = {}
+    for prefix, entry in plan.items():
+        layout = layouts[rng.integers(len(layouts))]
+        chosen[prefix] = layout
+        items = entry["items"]
+        if layout == "partial":
+            count = max(1, int(round(drop_rate * len(items))))
+            dropped = set(rng.choice(items, size=min(count, len(items)), replace=False))
+            items = [item for item in items if item not in dropped]
+        for item in items:
+            values = df[item]
+            if layout == "integer":
+                columns[item] = values.fillna(3).astype("int64")
+            elif layout == "strings":
+                stray = rng.random(rows) < string_rate
+                answers = values.astype("float64").astype(object)
+                answers[stray] = rng.choice(STRAY_STRINGS, size=int(stray.sum()))
+                columns[item] = answers
+            else:
+                columns[item] = values.astype("float64")
+
+    result = pd.concat([df[["ResponseId", "SubjectID", "Gender"]], pd.DataFrame(columns, index=df.index)],
+                       axis=1)
+    result.attrs["layouts"] = chosen
+    return result
+
+
+def score_each(df: pd.DataFrame, detected: Dict[str, Any], backend: str = "modules",
+               max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Score every detected questionnaire with `backend` the way run_questionnaires does,
+    but keep the results apart. Returns {prefix: scores DataFrame or the exception raised}.
+    Modules get the items after the coerce stage, as in run_questionnaires; the backends
+    coerce the items they read themselves.
+    """
+    coerced = coerce_detected_items(df, detected)
+    combined = {}
+    if backend in ("fused", "processes"):
+        combined = score_combined(df, detected, backend=backend, max_workers=max_workers)
+    results = {}
+    for prefix, main_fn in detected.items():
+        if prefix in combined:
+            results[prefix] = combined[prefix]
+            continue
+        score_fn = get_scoring_function(prefix, main_fn, backend)
+        frame = df
+        if score_fn is main_fn:
+            score_fn = with_float_items(main_fn, [col for col in df.columns if col.startswith(prefix)])
+            frame = coerced
+        try:
+            results[prefix] = score_fn(frame)
+        except Exception as e:
+            results[prefix] = e
+    return results
+
+
+def score_in_chunks(df: pd.DataFrame, detected: Dict[str, Any], chunksize: int, backend: str = "modules",
+                    max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Score `df` in consecutive chunks of `chunksize` rows and stitch each questionnaire's
+    results back together. A questionnaire failing on any chunk keeps the first exception.
+    """
+    parts = {prefix: [] for prefix in detected}
+    for start in range(0, len(df), chunksize):
+        chunk_results = score_each(df.iloc[start:start + chunksize], detected, backend=backend,
+                                   max_workers=max_workers)
+        for prefix, result in chunk_results.items():
+            parts[prefix].append(result)
+    results = {}
+    for prefix, chunks in parts.items():
+        errors = [chunk for chunk in chunks if isinstance(chunk, Exception)]
+        results[prefix] = errors[0] if errors else pd.concat(chunks)
+    return results
+
+
+def _column_difference(expected: pd.Series, actual: pd.Series) -> Dict[str, Any]:
+    expected_values = pd.to_numeric(expected, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    actual_values = pd.to_numeric(actual, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    expected_nan = np.isnan(expected_values)
+    actual_nan = np.isnan(actual_values)
+    both = ~expected_nan & ~actual_nan
+    difference = np.abs(expected_values[both] - actual_values[both])
+    return {
+        "max_abs_diff": float(difference.max()) if difference.size else 0.0,
+        "nan_mismatches": int((expected_nan != actual_nan).sum()),
+        "expected_dtype": str(expected.dtype),
+        "actual_dtype": str(actual.dtype),
+    }
+
+
+def compare_scores(expected: pd.DataFrame, actual: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare two score tables column by column.
+
+    Returns one row per column of either table with max_abs_diff, nan_mismatches,
+    expected_dtype, actual_dtype and `status`: "ok", "missing" (only in `expected`),
+    "extra" (only in `actual`) or "rows" (different index). max_abs_diff covers the
+    rows where both values are present; a non-numeric value counts as NaN.
+    """
+    records = []
+    same_rows = expected.index.equals(actual.index)
+    for column in expected.columns.union(actual.columns, sort=False):
+        record = {"column": column, "max_abs_diff": np.nan, "nan_mismatches": 0,
+                  "expected_dtype": None, "actual_dtype": None}
+        if column not in actual.columns:
+            record.update(status="missing", expected_dtype=str(expected[column].dtype))
+        elif column not in expected.columns:
+            record.update(status="extra", actual_dtype=str(actual[column].dtype))
+        elif not same_rows:
+            record.update(status="rows", expected_dtype=str(expected[column].dtype),
+                          actual_dtype=str(actual[column].dtype))
+        else:
+            record.update(_column_difference(expected[column], actual[column]), status="ok")
+        records.append(record)
+    return pd.DataFrame(records, columns=["column", "status", "max_abs_diff", "nan_mismatches",
+                                          "expected_dtype", "actual_dtype"])
+
+
+def _error_row(prefix, candidate, reference_error, candidate_error):
+    status = "both failed" if reference_error and candidate_error else (
+        "reference failed" if reference_error else "candidate failed")
+    return {"questionnaire": prefix, "candidate": candidate, "column": None, "status": status,
+            "max_abs_diff": np.nan, "nan_mismatches": 0, "expected_dtype": None, "actual_dtype": None,
+            "error": str(reference_error or candidate_error)}
+
+
+def check_equivalence(df: pd.DataFrame, backends=("engine", "fused", "processes"),
+                      chunksize: Optional[int] = None, max_workers: Optional[int] = None,
+                      compact: bool = False) -> pd.DataFrame:
+    """
+    Score `df` with every module's main() and with each candidate backend, and compare.
+
+    Args:
+        df: Responses to score
+        backends: Candidate backends (see common.BACKENDS)
+        chunksize: Also score with every backend, "modules" included, in chunks of this many rows
+        max_workers: Passed to the backends (process count for "processes")
+        compact: Also score with every backend from compact (Int8/UInt8) item storage
+
+    Returns:
+        One row per questionnaire, candidate and output column with the columns of
+        compare_scores plus `questionnaire`, `candidate` and `error`
+    """
+    for backend in backends:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'; expected one of {', '.join(BACKENDS)}")
+    detected = {prefix: entry["main"] for prefix, entry in plan_questionnaires(df.columns).items()}
+    reference = score_each(df, detected, backend="modules")
+
+    candidates = {backend: score_each(df, detected, backend=backend, max_workers=max_workers)
+                  for backend in backends}
+    if chunksize:
+        for backend in ("modules",) + tuple(backends):
+            candidates[f"{backend} (chunks of {chunksize})"] = score_in_chunks(
+                df, detected, chunksize, backend=backend, max_workers=max_workers)
+    if compact:
+        # Stored as access_compact_csv stores them, complete integer items as plain int8
+        dtypes = compact_item_dtypes(df.columns)
+        compact_df = plain_compact(compact_columns(df, dtypes),
+                                   [col for col in dtypes if is_integer_dtype(df[col].dtype)])
+        for backend in ("modules",) + tuple(backends):
+            candidates[f"{backend} (compact)"] = score_each(compact_df, detected, backend=backend,
+                                                            max_workers=max_workers)
+
+    rows = []
+    for candidate, results in candidates.items():
+        for prefix in detected:
+            expected, actual = reference[prefix], results[prefix]
+            expected_error = expected if isinstance(expected, Exception) else None
+            actual_error = actual if isinstance(actual, Exception) else None
+            if expected_error or actual_error:
+                rows.append(_error_row(prefix, candidate, expected_error, actual_error))
+                continue
+            comparison = compare_scores(expected, actual)
+            comparison.insert(0, "candidate", candidate)
+            comparison.insert(0, "questionnaire", prefix)
+            comparison["error"] = None
+            rows.extend(comparison.to_dict("records"))
+    return pd.DataFrame(rows, columns=["questionnaire", "candidate", "column", "status", "max_abs_diff",
+                                       "nan_mismatches", "expected_dtype", "actual_dtype", "error"])
+
+
+def mismatches(report: pd.DataFrame, atol: float = 1e-9, check_dtype: bool = False) -> pd.DataFrame:
+    """
+    Rows of a check_equivalence report that are not equivalent: a missing, extra or
+    misaligned column, a questionnaire failing on one side only, a difference above
+    `atol`, any NaN-pattern mismatch and, with `check_dtype`, a dtype difference.
+    """
+    failed = ~report["status"].isin(["ok", "both failed"])
+    failed |= report["max_abs_diff"].fillna(0) > atol
+    failed |= report["nan_mismatches"] > 0
+    if check_dtype:
+        failed |= (report["status"] == "ok") & (report["expected_dtype"] != report["actual_dtype"])
+    return report[failed]
+
+
+def run_equivalence(rows: int = 500, seeds=(0,), backends=("engine", "fused", "processes"),
+                    chunksize: Optional[int] = None, max_workers: Optional[int] = None,
+                    prefixes: Optional[List[str]] = None, compact: bool = False, layouts=LAYOUTS) -> pd.DataFrame:
+    """
+    Run check_equivalence on one randomized dataset per seed, with layouts drawn from
+    `layouts`. The report gains `seed` and `layout` columns.
+    """
+    reports = []
+    for seed in seeds:
+        df = randomized_responses(rows, seed=seed, prefixes=prefixes, layouts=layouts)
+        report = check_equivalence(df, backends=backends, chunksize=chunksize, max_workers=max_workers,
+                                   compact=compact)
+        report.insert(0, "layout", report["questionnaire"].map(df.attrs["layouts"]))
+        report.insert(0, "seed", seed)
+        reports.append(report)
+    return pd.concat(reports, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that alternative scoring backends match the modules.")
+    parser.add_argument("--rows", type=int, default=500, help="Respondents per dataset (default: 500)")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2],
+                        help="One randomized dataset per seed (default: 0 1 2)")
+    parser.add_argument("--backends", nargs="+", default=["engine", "fused", "processes"],
+                        choices=[backend for backend in BACKENDS if backend != "modules"])
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Also score every backend in chunks of this many rows")
+    parser.add_argument("--compact", action="store_true",
+                        help="Also score every backend from compact (Int8/UInt8) item storage")
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--atol", type=float, default=1e-9,
+                        help="Largest absolute difference still counted as equal (default: 1e-9)")
+    parser.add_argument("--check-dtype", action="store_true", help="Also report dtype differences")
+    parser.add_argument("--output", type=str, default=None, help="Write the full report to this CSV")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(message)s", stream=sys.stdout, level=logging.WARNING)
+    # Fallback warnings from combined scoring are expected on the partial layouts
+    logging.getLogger("questionnaire_analysis.common").setLevel(logging.ERROR)
+
+    report = run_equivalence(rows=args.rows, seeds=args.seeds, backends=args.backends,
+                             chunksize=args.chunksize, max_workers=args.max_workers, compact=args.compact)
+    if args.output:
+        report.to_csv(args.output, index=False)
+        print(f"Report saved to: {args.output}")
+
+    compared = report[report["status"] == "ok"]
+    print(f"Compared {len(compared)} output columns over {len(args.seeds)} dataset(s) of {args.rows} rows; "
+          f"largest difference {compared['max_abs_diff'].max():.3g}")
+    failed = mismatches(report, atol=args.atol, check_dtype=args.check_dtype)
+    if failed.empty:
+        print("All backends match the questionnaire modules.")
+        return
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.max_rows", 200):
+        print(failed.drop(columns=["error"]).to_string(index=False))
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+File formats of questionnaire exports and summaries: CSV, Parquet and Arrow IPC (Feather).
+
+The format is taken from the file extension; anything that is not Parquet or Arrow
+is read as CSV, as before. Parquet and Arrow files are read with column projection
+pushed down to pyarrow, so only the questionnaire, ID and subgroup columns are
+ever decoded, and without any text parsing. pyarrow is only imported when such a
+file is used.
+
+CSV files can also be parsed by pyarrow's multithreaded reader (engine="pyarrow"),
+which memory-maps the file and splits it into blocks parsed in parallel. Without
+pyarrow the pandas parser is used instead.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+
+from . import LazyModule
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = LazyModule("pandas")
+
+logger = logging.getLogger(__name__)
+
+
+# File extension -> format
+FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+}
+# Formats a summary can be written in, with the extension used for each
+SUMMARY_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+# CSV parsers: pd.read_csv's own engines, plus pyarrow's multithreaded reader
+CSV_ENGINES = ("c", "python", "pyarrow")
+# Cells pd.read_csv reads as missing by default; the pyarrow reader is given the same list
+CSV_NULL_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+                   "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+
+
+def file_format(path: str) -> str:
+    """
+    "csv", "parquet" or "feather" (Arrow IPC) from the file extension; CSV when unknown.
+    """
+    return FORMATS.get(os.path.splitext(path)[1].lower(), "csv")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Reading and writing Parquet and Arrow files requires pyarrow: "
+                          "pip install pyarrow") from e
+    return pyarrow
+
+
+@lru_cache(maxsize=None)
+def _pyarrow_csv():
+    # The pyarrow CSV module, or None (warned about once) when pyarrow is not installed
+    try:
+        import pyarrow.csv
+    except ImportError:
+        logger.warning("pyarrow is not installed; parsing CSV files with pandas instead")
+        return None
+    return pyarrow
+
+
+def _arrow_type(pa, kind):
+    import numpy as np
+    return pa.string() if kind == "str" else pa.from_numpy_dtype(np.dtype(kind))
+
+
+def _csv_layout(skip_rows: int, names: Optional[List[str]]) -> dict:
+    # pd.read_csv arguments skipping `skip_rows` rows under the header and naming the columns `names`
+    layout = {}
+    if skip_rows:
+        layout["skiprows"] = range(1, 1 + skip_rows)
+    if names is not None:
+        layout.update(header=0, names=names)
+    return layout
+
+
+def read_csv_table(path: str, columns: Optional[List[str]] = None, delimiter: str = ",",
+                   dtype: Optional[Dict[str, str]] = None, skip_rows: int = 0,
+                   names: Optional[List[str]] = None):
+    """
+    Parse a CSV into a pyarrow Table with pyarrow's multithreaded reader (see read_csv_pyarrow).
+    """
+    pa = _pyarrow()
+    convert_options = pa.csv.ConvertOptions(
+        include_columns=columns,
+        column_types={col: _arrow_type(pa, kind) for col, kind in (dtype or {}).items()},
+        null_values=CSV_NULL_VALUES,
+        strings_can_be_null=True,
+    )
+    with pa.memory_map(path) as source:
+        read_options = pa.csv.ReadOptions(use_threads=True, skip_rows=0 if names is None else 1,
+                                          column_names=names, skip_rows_after_names=skip_rows)
+        table = pa.csv.read_csv(source, read_options=read_options,
+                                # Quoted cells may span lines (free-text answers, Qualtrics question text)
+                                parse_options=pa.csv.ParseOptions(delimiter=delimiter, newlines_in_values=True),
+                                convert_options=convert_options)
+    empty = [i for i, field in enumerate(table.schema) if pa.types.is_null(field.type)]
+    for i in empty:
+        table = table.set_column(i, table.field(i).name, table.column(i).cast(pa.float64()))
+    return table
+
+
+def read_csv_pyarrow(path: str, columns: Optional[List[str]] = None, delimiter: str = ",",
+                     dtype: Optional[Dict[str, str]] = None, skip_rows: int = 0,
+                     names: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Parse a CSV with pyarrow's multithreaded reader, memory-mapping the file. Only
+    `columns` are converted; `dtype` ({column: "str", "float64", ...}) fixes their
+    types as in pd.read_csv and other columns are inferred by Arrow. Missing cells
+    are recognized as by pandas; text columns become Arrow-backed strings and columns
+    with no values at all float64, as pandas would read them. ISO dates in columns
+    without a dtype are parsed as timestamps. `skip_rows` rows under the header are
+    skipped and `names` replace the header's column names.
+
+    Raises:
+        FileNotFoundError: if the file does not exist
+        ValueError: if a cell cannot be converted to its column's dtype (pyarrow.ArrowInvalid)
+    """
+    table = read_csv_table(path, columns, delimiter=delimiter, dtype=dtype, skip_rows=skip_rows, names=names)
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+    return df
+
+
+def read_header(path: str, delimiter: str = ",") -> List[str]:
+    """
+    Column names of a CSV, Parquet or Arrow file, read from its header or schema only.
+
+    Raises:
+        FileNotFoundError: if the file does not exist
+    """
+    import pandas as pd
+    fmt = file_format(path)
+    if fmt == "csv":
+        return list(pd.read_csv(path, delimiter=delimiter, nrows=0).columns)
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    pa = _pyarrow()
+    if fmt == "parquet":
+        return list(pa.parquet.read_schema(path).names)
+    with pa.memory_map(path) as source:
+        return list(pa.ipc.open_file(source).schema.names)
+
+
+def _apply_dtypes(df: pd.DataFrame, dtype: Optional[Dict[str, str]]) -> pd.DataFrame:
+    # Typed files keep their stored types; cast to the requested ones as read_csv's dtype would
+    if not dtype:
+        return df
+    return df.astype({col: kind for col, kind in dtype.items() if col in df.columns})
+
+
+def read_columns(path: str, columns: Optional[List[str]] = None, delimiter: str = ",",
+                 dtype: Optional[Dict[str, str]] = None, engine: Optional[str] = None,
+                 skip_rows: int = 0, names: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read `columns` (all when None) of a CSV, Parquet or Arrow file.
+    `dtype` maps columns to dtypes as in pd.read_csv; a value that cannot be converted
+    raises ValueError in every format. `engine` selects the CSV parser (see CSV_ENGINES):
+    "pyarrow" uses read_csv_pyarrow, or pandas when pyarrow is not installed.
+    For CSV, `skip_rows` rows under the header are skipped and `names` replace its
+    column names (`columns` then refers to the new names).
+    """
+    import pandas as pd
+    fmt = file_format(path)
+    if fmt == "csv":
+        if engine == "pyarrow":
+            if _pyarrow_csv() is not None:
+                return read_csv_pyarrow(path, columns, delimiter=delimiter, dtype=dtype,
+                                        skip_rows=skip_rows, names=names)
+            engine = None
+        return pd.read_csv(path, delimiter=delimiter, usecols=columns, dtype=dtype, engine=engine,
+                           **_csv_layout(skip_rows, names))
+    pa = _pyarrow()
+    if fmt == "parquet":
+        table = pa.parquet.read_table(path, columns=columns)
+    else:
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    # Hand each column over as it is converted instead of holding the whole table until the end
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+    return _apply_dtypes(df, dtype)
+
+
+def iter_batches(path: str, columns: Optional[List[str]], batch_rows: int, delimiter: str = ",",
+                 dtype: Optional[Dict[str, str]] = None, skip_rows: int = 0,
+                 names: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yield `columns` of a CSV, Parquet or Arrow file in DataFrames of at most `batch_rows` rows,
+    numbered continuously from 0. Only one batch is decoded at a time.
+    `skip_rows` and `names` apply to CSV as in read_columns.
+    """
+    import pandas as pd
+    fmt = file_format(path)
+    if fmt == "csv":
+        with pd.read_csv(path, delimiter=delimiter, usecols=columns, chunksize=batch_rows, dtype=dtype,
+                         **_csv_layout(skip_rows, names)) as reader:
+            yield from reader
+        return
+
+    pa = _pyarrow()
+    start = 0
+    if fmt == "parquet":
+        batches = pa.parquet.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=columns)
+        for batch in batches:
+            df = _apply_dtypes(batch.to_pandas(), dtype)
+            df.index = pd.RangeIndex(start, start + len(df))
+            start += len(df)
+            yield df
+        return
+
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            # Record batches are as large as the writer made them; slice to the requested size
+            for offset in range(0, batch.num_rows, batch_rows):
+                df = _apply_dtypes(batch.slice(offset, batch_rows).to_pandas(), dtype)
+                df.index = pd.RangeIndex(start, start + len(df))
+                start += len(df)
+                yield df
+
+
+def output_path(input_path: str, suffix: str, extension: str) -> str:
+    """
+    Path of a file written next to an input: "export.parquet" -> "export<suffix><extension>".
+    """
+    return os.path.splitext(input_path)[0] + suffix + extension
+
+
+def write_table(df: pd.DataFrame, path: str, fmt: str = "csv"):
+    """
+    Write `df` without its index as CSV, Parquet or Arrow IPC (Feather).
+    """
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        _pyarrow()
+        df.to_parquet(path, index=False)
+    elif fmt == "feather":
+        _pyarrow()
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        raise ValueError(f"Unknown format '{fmt}'; expected one of {', '.join(SUMMARY_EXTENSIONS)}")
+
+
+class TableWriter:
+    """
+    Appends DataFrames with the same columns to one CSV, Parquet or Arrow file.
+
+    The first frame fixes the schema. Parquet and Arrow need one type per column for
+    the whole file, while a streamed column can be integer in one chunk and float in
+    the next, so numeric columns are written as float64 in those formats.
+    """
+
+    def __init__(self, path: str, fmt: str = "csv"):
+        if fmt not in SUMMARY_EXTENSIONS:
+            raise ValueError(f"Unknown format '{fmt}'; expected one of {', '.join(SUMMARY_EXTENSIONS)}")
+        self.path = path
+        self.format = fmt
+        self.rows = 0
+        self._schema = None
+        self._writer = None
+
+    def write(self, df: pd.DataFrame):
+        if self.format == "csv":
+            df.to_csv(self.path, mode="a" if self.rows else "w", header=not self.rows, index=False)
+            self.rows += len(df)
+            return
+
+        pa = _pyarrow()
+        df = df.astype({col: "float64" for col in df.select_dtypes(include="number").columns})
+        if self._writer is None:
+            self._schema = pa.Schema.from_pandas(df, preserve_index=False)
+            if self.format == "parquet":
+                self._writer = pa.parquet.ParquetWriter(self.path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, self._schema)
+        table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,240 @@
+"""
+Incremental scoring of growing exports.
+
+A nightly export holds every response collected so far, but only a few of them are
+new since the previous run. An incremental run keeps a JSON state file with a hash
+of every response's loaded columns, keyed on its ResponseId (or another identifier
+column), and scores only the responses that are new or whose answers changed.
+Their scores are merged into the existing summary: responses that were rescored or
+that disappeared from the export are replaced or removed. When only new responses
+arrived, a CSV summary is appended to in place rather than rewritten.
+
+Incremental summaries start with the key column so their rows can be matched on
+later runs, and are kept in their own _incremental_summary file so a normal run
+does not overwrite them. The state records a fingerprint of the questionnaire modules, the
+pipeline code and the options; when any of them changes, every response is
+rescored and the summary is rewritten. The export itself is still parsed and
+hashed in full, which is cheap next to scoring.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Dict, Optional
+
+from . import LazyModule
+from .cache import PIPELINE_MODULES, module_fingerprint, pipeline_fingerprint
+from .common import (DEFAULT_BACKEND, ID_COLUMNS, SUMMARY_EXTENSIONS, access_questionnaire_csv,
+                     coerce_detected_items, plan_questionnaires, report_plan, run_questionnaires)
+from .formats import output_path, read_columns, read_header, write_table
+from .metrics import RunMetrics
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = LazyModule("numpy")
+    pd = LazyModule("pandas")
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+DEFAULT_KEY_COLUMN = "ResponseId"
+
+
+def state_output_path(csv_path: str) -> str:
+    """
+    Path of the state file kept next to an input: export.csv -> export_state.json.
+    """
+    return output_path(csv_path, "_state", ".json")
+
+
+def incremental_summary_path(csv_path: str, summary_format: str = "csv") -> str:
+    """
+    Path of the summary an incremental run keeps next to an input:
+    export.csv -> export_incremental_summary.csv.
+    """
+    return output_path(csv_path, "_incremental_summary", SUMMARY_EXTENSIONS[summary_format])
+
+
+def state_fingerprint(detected: Dict[str, object], options: Dict[str, object]) -> str:
+    """
+    Hash of the detected questionnaires' modules and specifications, the pipeline
+    code and the options; summaries scored under another fingerprint are not reused.
+    """
+    key = {
+        "questionnaires": {prefix: module_fingerprint(prefix, main_fn) for prefix, main_fn in detected.items()},
+        "pipeline": pipeline_fingerprint(PIPELINE_MODULES + ("incremental",)),
+        "options": options,
+    }
+    return hashlib.blake2b(json.dumps(key, sort_keys=True, default=str).encode(), digest_size=20).hexdigest()
+
+
+def row_digests(df: pd.DataFrame) -> np.ndarray:
+    """
+    A 64-bit hash of every row's values, as decimal strings.
+    """
+    import pandas as pd
+    return pd.util.hash_pandas_object(df, index=False).to_numpy().astype("str")
+
+
+def load_state(path: str) -> Optional[dict]:
+    """
+    The state saved at `path`, or None when there is none or it cannot be read.
+    """
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable incremental state {path}: {e}")
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def save_state(state: dict, path: str):
+    """
+    Writes `state` to `path` atomically, through a temporary file in the same directory.
+    """
+    partial = f"{path}.{os.getpid()}.partial"
+    with open(partial, "w") as f:
+        json.dump(state, f)
+    os.replace(partial, path)
+
+
+def _response_keys(df: pd.DataFrame, key_column: str) -> pd.Series:
+    if key_column not in df.columns:
+        raise ValueError(f"Key column '{key_column}' is not in the file; "
+                         f"incremental runs are keyed on one of {', '.join(ID_COLUMNS)}")
+    keys = df[key_column]
+    if keys.isna().any():
+        raise ValueError(f"Key column '{key_column}' has {int(keys.isna().sum())} missing value(s)")
+    keys = keys.astype("str")
+    duplicated = keys[keys.duplicated()]
+    if len(duplicated):
+        raise ValueError(f"Key column '{key_column}' has duplicate values, e.g. '{duplicated.iloc[0]}'")
+    return keys
+
+
+def _read_summary(path: str, summary_format: str, key_column: str) -> pd.DataFrame:
+    return read_columns(path, dtype={key_column: "str"} if summary_format == "csv" else None)
+
+
+def _summary_matches(state: Optional[dict], fingerprint: str, key_column: str, summary_format: str) -> bool:
+    # Whether the previous run's summary can be merged into
+    if state is None:
+        return False
+    if (state.get("fingerprint") != fingerprint or state.get("key_column") != key_column
+            or state.get("summary_format") != summary_format):
+        logger.info("Questionnaire code or options changed since the last incremental run; rescoring all responses.")
+        return False
+    if not os.path.isfile(state.get("summary", "")):
+        logger.info("The summary of the last incremental run is missing; rescoring all responses.")
+        return False
+    if key_column not in read_header(state["summary"]):
+        logger.warning(f"The summary {state['summary']} has no '{key_column}' column; rescoring all responses.")
+        return False
+    return True
+
+
+def analyze_incremental(csv_path: str, key_column: str = DEFAULT_KEY_COLUMN, state_path: Optional[str] = None,
+                        summary_format: str = "csv", backend: str = DEFAULT_BACKEND, max_workers: Optional[int] = None,
+                        compact: bool = False, csv_engine: Optional[str] = None,
+                        import_ids: Optional[Dict[str, str]] = None, finished_only: bool = True,
+                        metrics: Optional[RunMetrics] = None, parse_cache=None) -> Optional[pd.DataFrame]:
+    """
+    Scores the responses of `csv_path` that are new or changed since the last run
+    recorded in `state_path` (default: export_state.json next to the input), merges
+    them into that run's summary and updates the state. Responses are matched on
+    `key_column`, which must be one of the identifier columns (ResponseId, SubjectID)
+    and unique. The first run scores everything and writes the summary next to the
+    input (see incremental_summary_path); later runs keep updating the summary the state
+    points to, so a state file can follow a series of dated exports.
+
+    The other options are those of analyze_questionnaire_csv. Returns the summary rows
+    scored in this run, keyed by `key_column` (empty when nothing changed), or None
+    when the file has no questionnaires.
+
+    Raises:
+        ValueError: if the key column is absent, has missing values or duplicates
+    """
+    import numpy as np
+    import pandas as pd
+    if summary_format not in SUMMARY_EXTENSIONS:
+        raise ValueError(f"Unknown summary format '{summary_format}'; "
+                         f"expected one of {', '.join(SUMMARY_EXTENSIONS)}")
+    if metrics is None:
+        metrics = RunMetrics(source=csv_path)
+    state_path = state_path or state_output_path(csv_path)
+    state = load_state(state_path)
+
+    with metrics.stage("load") as stage:
+        df = access_questionnaire_csv(csv_path, compact=compact, engine=csv_engine, import_ids=import_ids,
+                                      finished_only=finished_only, parse_cache=parse_cache)
+        if df is None:
+            return None
+        stage["rows"] = len(df)
+
+    with metrics.stage("detect"):
+        plan = plan_questionnaires(df.columns)
+        report_plan(plan)
+        detected = {prefix: entry["main"] for prefix, entry in plan.items()}
+    if not detected:
+        logger.warning("No recognized questionnaires detected in the CSV.")
+        return None
+
+    options = {"backend": backend, "compact": compact, "csv_engine": csv_engine, "import_ids": import_ids,
+               "finished_only": finished_only}
+    fingerprint = state_fingerprint(detected, options)
+    merge = _summary_matches(state, fingerprint, key_column, summary_format)
+    summary_path = state["summary"] if merge else incremental_summary_path(csv_path, summary_format)
+
+    with metrics.stage("diff", rows=len(df)):
+        keys = _response_keys(df, key_column)
+        # Hash the items as they are scored, so a non-numeric cell elsewhere does not change every hash
+        df = coerce_detected_items(df, detected)
+        digests = row_digests(df)
+        previous = state["rows"] if merge else {}
+        changed = np.fromiter((previous.get(key) != digest for key, digest in zip(keys, digests)),
+                              dtype=bool, count=len(df))
+        current = set(keys)
+        removed = [key for key in previous if key not in current]
+    logger.info(f"{int(changed.sum())} new or changed and {len(removed)} removed response(s) "
+                f"of {len(df)}.")
+
+    new_rows = pd.DataFrame(columns=[key_column])
+    if changed.any():
+        scored = df[changed]
+        with metrics.stage("score", rows=len(scored)):
+            summary = run_questionnaires(scored, detected, backend=backend, max_workers=max_workers,
+                                         metrics=metrics)
+        if summary is not None:
+            with metrics.stage("clean", rows=len(summary)):
+                summary = summary.dropna(how="all")
+                summary.insert(0, key_column, keys[changed].loc[summary.index])
+            new_rows = summary
+
+    rescored = set(keys[changed]) & previous.keys()
+    with metrics.stage("write", rows=len(new_rows)):
+        if not merge:
+            write_table(new_rows, summary_path, summary_format)
+        elif rescored or removed or (summary_format != "csv" and len(new_rows)):
+            existing = _read_summary(summary_path, summary_format, key_column)
+            existing = existing[~existing[key_column].isin(rescored.union(removed))]
+            write_table(pd.concat([existing, new_rows], ignore_index=True), summary_path, summary_format)
+        elif len(new_rows):
+            # Only new responses: append them under the existing header
+            header = read_header(summary_path)
+            new_rows.reindex(columns=header).to_csv(summary_path, mode="a", header=False, index=False)
+    logger.info(f"Summary saved to: {summary_path}")
+
+    save_state({"version": STATE_VERSION, "key_column": key_column, "fingerprint": fingerprint,
+                "summary": summary_path, "summary_format": summary_format,
+                "rows": dict(zip(keys, digests))}, state_path)
+    return new_rows.reset_index(drop=True)
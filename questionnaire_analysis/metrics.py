@@ -0,0 +1,160 @@
+"""
+Run metrics: wall time, CPU time, rows and peak memory per stage and per questionnaire.
+
+A RunMetrics object is threaded through the pipeline; each stage is recorded with
+`with metrics.stage("load", rows=...)`. Peak memory is the growth of the process's
+peak resident set size (ru_maxrss) during the stage, so it shows which stage raised
+the high-water mark; it is None on platforms without the `resource` module.
+Stages recorded several times (e.g. once per chunk) are accumulated.
+
+Listeners registered with add_listener are told when each measured block starts
+and ends; the memory profiler uses this to attribute allocations to questionnaires.
+"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+_listeners = []
+
+
+def add_listener(listener):
+    """
+    Registers an object whose enter(kind, name) and exit(kind, name) are called around
+    every measured block; kind is "stage" or "questionnaire".
+    """
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    """
+    Unregisters a listener added with add_listener.
+    """
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process in MB, or None when it cannot be read.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class RunMetrics:
+    """
+    Per-stage and per-questionnaire measurements of one analysis run.
+
+    `stages` and `questionnaires` map a name to a record with wall_seconds,
+    cpu_seconds, rows, peak_memory_delta_mb and calls. Stage CPU time is process
+    time; questionnaire CPU time is the time of the thread that scored it, so it
+    stays meaningful when questionnaires run on a thread pool.
+    """
+
+    def __init__(self, source=None):
+        self.source = source
+        self.stages = {}
+        self.questionnaires = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._start_peak = peak_rss_mb()
+
+    def _record(self, records, name, wall, cpu, rows, peak_delta):
+        with self._lock:
+            record = records.get(name)
+            if record is None:
+                records[name] = {"wall_seconds": wall, "cpu_seconds": cpu, "rows": rows,
+                                 "peak_memory_delta_mb": peak_delta, "calls": 1}
+                return
+            record["wall_seconds"] += wall
+            record["cpu_seconds"] += cpu
+            if rows is not None:
+                record["rows"] = (record["rows"] or 0) + rows
+            if peak_delta is not None:
+                record["peak_memory_delta_mb"] = (record["peak_memory_delta_mb"] or 0.0) + peak_delta
+            record["calls"] += 1
+
+    @contextmanager
+    def _measure(self, kind, records, name, rows, cpu_clock):
+        entry = {"rows": rows}
+        for listener in list(_listeners):
+            listener.enter(kind, name)
+        peak = peak_rss_mb()
+        cpu = cpu_clock()
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            wall = time.perf_counter() - start
+            cpu = cpu_clock() - cpu
+            end_peak = peak_rss_mb()
+            peak_delta = None if peak is None or end_peak is None else end_peak - peak
+            self._record(records, name, wall, cpu, entry["rows"], peak_delta)
+            for listener in list(_listeners):
+                listener.exit(kind, name)
+
+    def stage(self, name, rows=None):
+        """
+        Context manager measuring one pipeline stage. The yielded dict's "rows"
+        can be set inside the block once the row count is known.
+        """
+        return self._measure("stage", self.stages, name, rows, time.process_time)
+
+    def questionnaire(self, prefix, rows=None):
+        """
+        Context manager measuring the scoring of one questionnaire.
+        """
+        return self._measure("questionnaire", self.questionnaires, prefix, rows, time.thread_time)
+
+    def iterate(self, iterable, name):
+        """
+        Yields from `iterable`, recording the time spent producing each item
+        (e.g. reading each chunk of a CSV) under stage `name`.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name) as entry:
+                item = next(iterator, None)
+                if item is not None and hasattr(item, "__len__"):
+                    entry["rows"] = len(item)
+            if item is None:
+                return
+            yield item
+
+    def to_dict(self):
+        """
+        Returns the metrics as plain JSON-serialisable data, with totals for the whole run.
+        """
+        end_peak = peak_rss_mb()
+        return {
+            "source": self.source,
+            "total": {
+                "wall_seconds": time.perf_counter() - self._start,
+                "cpu_seconds": time.process_time() - self._start_cpu,
+                "peak_memory_mb": end_peak,
+                "peak_memory_delta_mb": None if end_peak is None else end_peak - self._start_peak,
+            },
+            "stages": {name: dict(record) for name, record in self.stages.items()},
+            "questionnaires": {name: dict(record) for name, record in self.questionnaires.items()},
+        }
+
+    def write_json(self, path):
+        """
+        Writes the metrics to `path` as JSON.
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
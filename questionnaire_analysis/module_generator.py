@@ -78,13 +78,12 @@ def {name}_reverse_score(df):
     """
     Reverse score specific {name} items.
     Items to reverse: {reverse_items}
+    Returns a new DataFrame; the input is left unchanged.
     """
     reverse_items = [{items_str}]
-    for item in reverse_items:
-        if item in df.columns:
-            df[item] = pd.to_numeric(df[item], errors='coerce')
-            df[item] = {scale_max + 1} - df[item]  # Reverse scoring
-    return df
+    present = [item for item in reverse_items if item in df.columns]
+    reversed_items = {scale_max + 1} - numeric_items(df, present)  # Reverse scoring
+    return df.assign(**reversed_items)
 '''
         return code
     
@@ -110,11 +109,11 @@ def {name}_reverse_score(df):
             method = subscale['scoring_method']
             
             if method == 'mean':
-                calc = f"df[[{items_str}]].mean(axis=1)"
+                calc = f"items[[{items_str}]].mean(axis=1)"
             elif method == 'sum':
-                calc = f"df[[{items_str}]].sum(axis=1)"
+                calc = f"items[[{items_str}]].sum(axis=1)"
             else:
-                calc = f"df[[{items_str}]].mean(axis=1)  # Default to mean"
+                calc = f"items[[{items_str}]].mean(axis=1)  # Default to mean"
             
             subscale_calcs[f"'{prefix}{subscale['name']}'"] = calc
         
@@ -123,27 +122,24 @@ def {name}_reverse_score(df):
 def {name}_calculate_scores(df):
     """
     Calculate subscale scores for the {config.get('full_name', name)} questionnaire.
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
-    # Apply reverse scoring if needed
+    # Read all relevant columns as numeric into a separate frame
+    items = numeric_items(df, [col for col in df.columns if col.startswith('{prefix}')])
 '''
-        
+
         if config.get('reverse_scoring', {}).get('enabled', False):
-            code += f"    df = {name}_reverse_score(df)\n"
-        
+            code += f"\n    # Apply reverse scoring\n    items = {name}_reverse_score(items)\n"
+
         code += '''
-    # Convert all relevant columns to numeric
-    for col in df.columns:
-        if col.startswith('{prefix}'):
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    
     # Calculate all subscale scores at once to avoid DataFrame fragmentation
-    subscale_scores = {{
-'''.format(prefix=prefix)
-        
+    subscale_scores = {
+'''
+
         for col_name, calculation in subscale_calcs.items():
             code += f"        {col_name}: {calculation},\n"
-        
-        code += "    }\n    df = df.assign(**subscale_scores)\n"
+
+        code += "    }\n    scores = pd.DataFrame(subscale_scores, index=df.index)\n"
         
         # Add total score if enabled
         if config.get('total_score', {}).get('enabled', False):
@@ -153,9 +149,9 @@ def {name}_calculate_scores(df):
             if total_method == 'mean_of_subscales':
                 subscale_cols = [f"'{prefix}{sub['name']}'" for sub in subscales]
                 subscale_cols_str = ", ".join(subscale_cols)
-                code += f"    df['{prefix}{total_name}'] = df[[{subscale_cols_str}]].mean(axis=1)\n"
+                code += f"    scores['{prefix}{total_name}'] = scores[[{subscale_cols_str}]].mean(axis=1)\n"
         
-        code += "\n    return df\n"
+        code += "\n    return scores\n"
         
         return code
     
@@ -184,14 +180,14 @@ def {name}_summarize_results(df):
     existing_columns = [col for col in summary_columns if col in df.columns]
     
     if not existing_columns:
-        print("No {name} columns found for summary")
+        logger.debug("No {name} columns found for summary")
         return {{}}
     
     mean_scores = df[existing_columns].mean()
     std_scores = df[existing_columns].std()
     
-    print("\\nSummary of {config.get('full_name', name)} Scores:")
-    print(df[existing_columns])
+    logger.debug("\\nSummary of {config.get('full_name', name)} Scores:")
+    logger.debug(df[existing_columns])
     
     summary = {{}}
     for col in existing_columns:
@@ -223,19 +219,20 @@ def main(df):
     """
     if df is not None:
         # Calculate scores
-        df = {name}_calculate_scores(df)
+        scores = {name}_calculate_scores(df)
         
-        # Summarize results (optional logging)
-        summary = {name}_summarize_results(df)
+        # Summarize results (only computed for debug logging)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = {name}_summarize_results(scores)
         
         # Return only the summary columns for concatenation
         summary_columns = [{columns_str}]
-        existing_columns = [col for col in summary_columns if col in df.columns]
+        existing_columns = [col for col in summary_columns if col in scores.columns]
         
         if existing_columns:
-            return df[existing_columns]
+            return scores[existing_columns]
         else:
-            print(f"Warning: No {name} columns found in DataFrame")
+            logger.warning(f"Warning: No {name} columns found in DataFrame")
             return None
     return None
 
@@ -267,7 +264,13 @@ if __name__ == "__main__":
 Auto-generated by QuestionnaireModuleGenerator
 """
 
+import logging
+
 import pandas as pd
+
+from questionnaire_analysis.coercion import numeric_items
+
+logger = logging.getLogger(__name__)
 '''
         
         # Add reverse scoring function
@@ -341,41 +344,35 @@ import pandas as pd
                         new_all = current_items.rstrip() + f',\n"{name}"'
                         content = re.sub(all_pattern, f'__all__ = [{new_all}]', content, flags=re.DOTALL)
             
-            # Add import statement
-            if f'from . import {name}' not in content:
-                content += f'\nfrom . import {name}'
+            # Add to the lazily imported MODULES
+            modules_pattern = r'MODULES\s*=\s*\((.*?)\)'
+            match = re.search(modules_pattern, content, re.DOTALL)
+            if match and f'"{name}"' not in match.group(1):
+                new_modules = match.group(1).rstrip().rstrip(',') + f',\n    "{name}",\n'
+                content = re.sub(modules_pattern, lambda m: f'MODULES = ({new_modules})', content, flags=re.DOTALL)
             
             with open(init_path, 'w', encoding='utf-8') as f:
                 f.write(content)
         
-        # Update main common.py questionnaire_map
+        # Update main common.py QUESTIONNAIRE_MODULES (modules are imported on first detection)
         common_path = self.questionnaires_dir.parent / "common.py"
         
         if common_path.exists():
             with open(common_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Add to questionnaire_map
-            map_pattern = r'questionnaire_map\s*=\s*\{(.*?)\}'
+            # Add to QUESTIONNAIRE_MODULES
+            map_pattern = r'QUESTIONNAIRE_MODULES\s*=\s*\{(.*?)\}'
             match = re.search(map_pattern, content, re.DOTALL)
             if match:
                 current_items = match.group(1)
-                new_entry = f'"{prefix}_": {name}.main'
+                new_entry = f'"{prefix}_": "{name}"'
                 if new_entry not in current_items:
                     # Clean up current items and ensure proper comma placement
                     current_items_clean = current_items.rstrip().rstrip(',')
                     new_map = current_items_clean + f',\n    {new_entry}'
-                    content = re.sub(map_pattern, f'questionnaire_map = {{{new_map}\n}}', content, flags=re.DOTALL)
-            
-            # Add import if needed
-            if f'{name},' not in content and f'{name} ' not in content:
-                # Find the import section and add the new questionnaire
-                import_pattern = r'from questionnaire_analysis\.questionnaires import \((.*?)\)'
-                match = re.search(import_pattern, content, re.DOTALL)
-                if match:
-                    current_imports = match.group(1)
-                    new_imports = current_imports.rstrip() + f', {name}'
-                    content = re.sub(import_pattern, f'from questionnaire_analysis.questionnaires import ({new_imports})', content, flags=re.DOTALL)
+                    content = re.sub(map_pattern, lambda m: f'QUESTIONNAIRE_MODULES = {{{new_map}\n}}', content,
+                                     flags=re.DOTALL)
             
             with open(common_path, 'w', encoding='utf-8') as f:
                 f.write(content)
@@ -0,0 +1,152 @@
+"""
+Process-pool scoring of large data sets over shared memory.
+
+The numeric item block of every questionnaire is written once into a
+multiprocessing.shared_memory segment. Worker processes attach to it by name,
+score a contiguous shard of rows with the specification engine and write the
+numeric scores into a second, preallocated shared segment. Only shard bounds
+cross the process boundary; DataFrames are never pickled. Category labels
+(e.g. PSS stress level) are derived in the parent from the numeric scores.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Dict, Any
+
+from . import LazyModule
+from .coercion import scored_as_integer
+from .scoring_engine import _categorize, compile_spec, integer_outputs, item_block, score_block
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = LazyModule("pandas")
+
+
+_worker = {}
+
+
+def _attach(name, shape):
+    import numpy as np
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _init_worker(values_name, values_shape, scores_name, scores_shape, layout):
+    _worker["values_shm"], _worker["values"] = _attach(values_name, values_shape)
+    _worker["scores_shm"], _worker["scores"] = _attach(scores_name, scores_shape)
+    _worker["layout"] = layout
+
+
+def _score_shard(bounds):
+    """
+    Score rows [start, stop) of the shared item block into the shared score block.
+    """
+    start, stop = bounds
+    values = _worker["values"][start:stop]
+    scores = _worker["scores"]
+    for spec, item_positions, score_positions in _worker["layout"]:
+        results = score_block(values[:, item_positions], spec)
+        for name, position in score_positions.items():
+            scores[start:stop, position] = results[name]
+    return stop - start
+
+
+def _create_block(rows, columns):
+    import numpy as np
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(create=True, size=max(rows * columns * 8, 1))
+    return shm, np.ndarray((rows, columns), dtype=np.float64, buffer=shm.buf)
+
+
+def score_questionnaires_sharded(df: pd.DataFrame, specs: Dict[str, Dict[str, Any]],
+                                 max_workers: int = None, shard_rows: int = None) -> Dict[str, pd.DataFrame]:
+    """
+    Score several questionnaires on a process pool, splitting the rows into shards.
+
+    Args:
+        df: Data with the item columns of every questionnaire in `specs`
+        specs: Questionnaire prefix -> specification
+        max_workers: Number of worker processes (default: CPU count)
+        shard_rows: Rows per shard (default: about four shards per worker)
+
+    Returns:
+        Questionnaire prefix -> score DataFrame indexed like `df`
+
+    Raises:
+        KeyError: if any item column is missing
+    """
+    import numpy as np
+    import pandas as pd
+    columns = []
+    position = {}
+    for spec in specs.values():
+        for column in compile_spec(spec)["columns"]:
+            if column not in position:
+                position[column] = len(columns)
+                columns.append(column)
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise KeyError(f"{missing} not in index")
+
+    # Numeric scores get a column in the shared output; category labels are derived afterwards
+    layout = []
+    score_names = []
+    for spec in specs.values():
+        compiled = compile_spec(spec)
+        labels = {name for name, _, _ in compiled["categories"]}
+        item_positions = np.array([position[col] for col in compiled["columns"]], dtype=np.intp)
+        score_positions = {}
+        for name in compiled["output_columns"]:
+            if name not in labels:
+                score_positions[name] = len(score_names)
+                score_names.append(name)
+        for _, source, _ in compiled["categories"]:
+            if source not in score_positions:
+                score_positions[source] = len(score_names)
+                score_names.append(source)
+        layout.append((spec, item_positions, score_positions))
+
+    rows = len(df)
+    workers = max_workers or os.cpu_count() or 1
+    if shard_rows is None:
+        shard_rows = max(1, -(-rows // (workers * 4)))
+    bounds = [(start, min(start + shard_rows, rows)) for start in range(0, rows, shard_rows)]
+
+    values_shm, values = _create_block(rows, len(columns))
+    scores_shm, scores = _create_block(rows, len(score_names))
+    try:
+        item_block(df, columns, out=values)
+        integer_columns = {col for col in columns if scored_as_integer(df[col].dtype)}
+
+        if bounds:
+            from multiprocessing import get_context
+            context = get_context()
+            initargs = (values_shm.name, values.shape, scores_shm.name, scores.shape, layout)
+            with context.Pool(min(workers, len(bounds)), initializer=_init_worker, initargs=initargs) as pool:
+                for _ in pool.imap_unordered(_score_shard, bounds):
+                    pass
+
+        scored = {}
+        for prefix, (spec, _, score_positions) in zip(specs, layout):
+            compiled = compile_spec(spec)
+            results = {name: scores[:, j].copy() for name, j in score_positions.items()}
+            for name, source, bins in compiled["categories"]:
+                results[name] = _categorize(results[source], bins)
+            if all(col in integer_columns for col in compiled["columns"]):
+                for name in integer_outputs(compiled):
+                    if name in results:
+                        results[name] = results[name].astype(np.int64)
+            scored[prefix] = pd.DataFrame(
+                {name: results[name] for name in compiled["output_columns"] if name in results},
+                index=df.index,
+            )
+        return scored
+    finally:
+        del values, scores
+        values_shm.close()
+        values_shm.unlink()
+        scores_shm.close()
+        scores_shm.unlink()
@@ -0,0 +1,256 @@
+"""
+On-disk cache of parsed CSV exports.
+
+The first load of a CSV with a parse cache parses every column once, with pyarrow's
+multithreaded reader, and writes the result as an uncompressed Arrow IPC (Feather)
+file with a small JSON manifest next to it. Later loads of the unchanged file
+memory-map the Arrow file and convert only the requested columns, so analyses that
+need different columns of the same export never parse its text again.
+
+A file counts as unchanged while its size and modification time match the
+manifest. Whole-number columns are stored in the smallest integer type that holds
+them and widened again on load, which keeps an export of Likert items smaller than
+the CSV itself. Identifier and subgroup columns are stored as text, so leading
+zeros survive; other columns are typed by Arrow's inference, so ISO dates in
+columns loaded without a dtype come back as timestamps, as with the pyarrow CSV
+engine.
+
+Entries live in the parsed/ subdirectory of the result cache directory (see
+cache.default_cache_dir) and are evicted by age and total size like results.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from . import LazyModule
+from .cache import DEFAULT_MAX_AGE, DEFAULT_MAX_BYTES, default_cache_dir
+from .formats import _pyarrow, _pyarrow_csv, read_columns, read_csv_table, read_header
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = LazyModule("pandas")
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+# Integer types whole-number columns are narrowed to, smallest first
+_NARROW_TYPES = ("int8", "int16", "int32")
+
+
+def default_parse_cache_dir() -> str:
+    """
+    The parsed/ subdirectory of the default cache directory.
+    """
+    return os.path.join(default_cache_dir(), "parsed")
+
+
+def _narrow_integers(table):
+    # Stores each integer column in the smallest type that holds its values; returns (table, narrowed columns)
+    import numpy as np
+    pa = _pyarrow()
+    import pyarrow.compute
+
+    narrowed = []
+    for i, field in enumerate(table.schema):
+        if not pa.types.is_integer(field.type):
+            continue
+        bounds = pa.compute.min_max(table.column(i)).as_py()
+        if bounds["min"] is None:
+            continue
+        for kind in _NARROW_TYPES:
+            info = np.iinfo(kind)
+            if info.min <= bounds["min"] and bounds["max"] <= info.max:
+                table = table.set_column(i, field.name, table.column(i).cast(getattr(pa, kind)()))
+                narrowed.append(field.name)
+                break
+    return table, narrowed
+
+
+class ParseCache:
+    """
+    Directory of parsed CSV exports, one Arrow file and manifest per input file and
+    layout, bounded by size and age.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age: float = DEFAULT_MAX_AGE):
+        self.directory = directory or default_parse_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def key(self, path: str, delimiter: str = ",", skip_rows: int = 0, names: Optional[List[str]] = None,
+            text_columns: Iterable[str] = ()) -> str:
+        """
+        Key of the parsed form of `path` read with `delimiter`, `skip_rows` and `names`
+        (see formats.read_columns), with `text_columns` stored as text.
+        """
+        layout = [os.path.abspath(path), delimiter, skip_rows, names, sorted(text_columns)]
+        return hashlib.blake2b(json.dumps(layout).encode(), digest_size=20).hexdigest()
+
+    def paths(self, key: str):
+        """
+        (Arrow file, manifest) of an entry.
+        """
+        base = os.path.join(self.directory, key)
+        return base + ".arrow", base + ".json"
+
+    def read(self, path: str, columns: Optional[List[str]] = None, delimiter: str = ",",
+             dtype: Optional[Dict[str, str]] = None, skip_rows: int = 0, names: Optional[List[str]] = None,
+             text_columns: Iterable[str] = ()) -> Optional[pd.DataFrame]:
+        """
+        Reads `columns` of the CSV at `path` as formats.read_columns would, from its
+        parsed form, parsing and storing it first when it is missing or stale.
+        Returns None when the file cannot be cached (no pyarrow, or a header pyarrow
+        cannot parse into named columns); the caller then parses it as usual.
+
+        Raises:
+            FileNotFoundError: if the file does not exist
+            ValueError: if a value cannot be converted to its column's dtype
+        """
+        if _pyarrow_csv() is None:
+            return None
+        stat = os.stat(path)
+        key = self.key(path, delimiter, skip_rows, names, text_columns)
+        arrow_path, manifest_path = self.paths(key)
+        manifest = self._manifest(manifest_path, stat)
+        if manifest is None:
+            manifest = self._convert(path, stat, arrow_path, manifest_path, delimiter, skip_rows, names,
+                                     text_columns)
+            if manifest is None:
+                return None
+        else:
+            # The manifest's modification time doubles as the last-use time for eviction
+            os.utime(manifest_path)
+            logger.debug(f"Reading parsed {path} from {arrow_path}")
+
+        df = read_columns(arrow_path, columns, dtype=dtype)
+        # Whole-number columns come back as int64, as pandas infers them
+        widen = [col for col in manifest["narrowed"]
+                 if col in df.columns and col not in (dtype or {}) and df[col].dtype.kind == "i"]
+        return df.astype({col: "int64" for col in widen}) if widen else df
+
+    def _manifest(self, manifest_path: str, stat) -> Optional[dict]:
+        # The manifest of an entry matching the file's current size and modification time, or None
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        fresh = (manifest.get("version") == MANIFEST_VERSION and manifest.get("size") == stat.st_size
+                 and manifest.get("mtime_ns") == stat.st_mtime_ns
+                 and time.time() - os.path.getmtime(manifest_path) <= self.max_age)
+        if not fresh or not os.path.isfile(manifest_path[:-len(".json")] + ".arrow"):
+            return None
+        return manifest
+
+    def _convert(self, path, stat, arrow_path, manifest_path, delimiter, skip_rows, names, text_columns):
+        # Parses every column of `path` and writes the Arrow file and its manifest; None when it cannot be stored
+        columns = names if names is not None else read_header(path, delimiter=delimiter)
+        pa = _pyarrow()
+        table = read_csv_table(path, delimiter=delimiter, skip_rows=skip_rows, names=names,
+                               dtype={col: "str" for col in text_columns if col in columns})
+        if len(set(table.column_names)) != table.num_columns:
+            # pandas renames repeated names (Q1, Q1.1); Arrow keeps them and could not select them
+            logger.info(f"{path} has duplicate column names; it is parsed without the parse cache.")
+            return None
+        table, narrowed = _narrow_integers(table)
+        manifest = {"version": MANIFEST_VERSION, "source": os.path.abspath(path), "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns, "rows": table.num_rows, "columns": table.column_names,
+                    "narrowed": narrowed}
+        partial = f".{os.getpid()}.partial"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Uncompressed, so later loads map the column buffers instead of decoding them
+            with pa.ipc.new_file(arrow_path + partial, table.schema) as writer:
+                writer.write_table(table)
+            with open(manifest_path + partial, "w") as f:
+                json.dump(manifest, f)
+            os.replace(arrow_path + partial, arrow_path)
+            os.replace(manifest_path + partial, manifest_path)
+        except OSError as e:
+            logger.warning(f"Could not store the parsed file in {self.directory}: {e}")
+            for leftover in (arrow_path + partial, manifest_path + partial):
+                self._remove(leftover)
+            return None
+        logger.info(f"Stored parsed {path} in the parse cache ({table.num_rows} rows).")
+        del table
+        self.evict()
+        return manifest
+
+    def evict(self):
+        """
+        Removes entries older than max_age, then the least recently used until the
+        Arrow files fit max_bytes.
+        """
+        now = time.time()
+        entries = []
+        try:
+            listing = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in listing:
+            try:
+                if not entry.is_file() or not entry.name.endswith(".json"):
+                    continue
+            except OSError:
+                continue
+            arrow_path = entry.path[:-len(".json")] + ".arrow"
+            try:
+                last_used = entry.stat().st_mtime
+                size = os.path.getsize(arrow_path)
+            except OSError:
+                size = 0
+                last_used = 0
+            if now - last_used > self.max_age:
+                self._remove_entry(arrow_path, entry.path)
+            else:
+                entries.append((last_used, size, arrow_path, entry.path))
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, arrow_path, manifest_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove_entry(arrow_path, manifest_path)
+            total -= size
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith((".arrow", ".json")):
+                    self._remove(entry.path)
+
+    @classmethod
+    def _remove_entry(cls, arrow_path: str, manifest_path: str):
+        # The manifest goes first, so a half-removed entry is never taken as fresh
+        cls._remove(manifest_path)
+        cls._remove(arrow_path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def resolve_parse_cache(parse_cache) -> Optional[ParseCache]:
+    """
+    The ParseCache selected by a `parse_cache` argument: True for the default directory,
+    a directory path, a ParseCache, or False/None for parsing every time.
+    """
+    if parse_cache is None or parse_cache is False:
+        return None
+    if parse_cache is True:
+        return ParseCache()
+    if isinstance(parse_cache, ParseCache):
+        return parse_cache
+    return ParseCache(str(parse_cache))
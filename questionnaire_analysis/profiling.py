@@ -0,0 +1,252 @@
+"""
+CPU and memory profiling of a questionnaire run, used by the CLI's --profile and
+--profile-memory options.
+
+CPU profiling writes three files next to the given output base:
+  <base>.pstats       raw cProfile data (pstats.Stats, snakeviz, ...)
+  <base>_stats.txt    the top functions sorted by cumulative and by own time
+  <base>.collapsed    collapsed stacks ("a;b;c <microseconds>") for flamegraph.pl
+                      or speedscope, rebuilt from the cProfile caller graph
+
+Memory profiling runs under tracemalloc and writes <base>_memory.txt with the peak
+and retained memory of every questionnaire scored on its own, and the allocations made
+by package code during the scoring stage and still alive at its end, by file and by
+line. Pandas and the scoring modules are imported before tracing starts, so import-time
+allocations are neither traced nor reported, and tracing is suspended while summaries
+are written. Per-questionnaire peaks are exact when the questionnaires are scored one at
+a time (no --max-workers).
+"""
+
+import cProfile
+import importlib
+import io
+import os
+import pstats
+import tracemalloc
+from collections import Counter, defaultdict
+
+from .metrics import add_listener, remove_listener
+
+
+MB = 1024 * 1024
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Imported before tracing starts, so their import-time allocations are not traced
+PRELOADED_MODULES = ("numpy", "pandas", "questionnaire_analysis.common", "questionnaire_analysis.scoring_engine")
+# The profiler's own bookkeeping (snapshots, metrics records) is left out of the allocation report
+PROFILER_FILES = (tracemalloc.__file__, os.path.join(PACKAGE_DIR, "profiling.py"),
+                  os.path.join(PACKAGE_DIR, "metrics.py"))
+
+
+def _short_path(filename):
+    """
+    Last two path components of a source file, or the package-relative path for package files.
+    """
+    if filename.startswith(PACKAGE_DIR):
+        return "questionnaire_analysis/" + os.path.relpath(filename, PACKAGE_DIR)
+    parts = filename.replace("\\", "/").split("/")
+    return "/".join(parts[-2:])
+
+
+def _frame_label(func):
+    filename, line, name = func
+    if filename == "~":
+        return name  # built-in function, e.g. <method 'sum' of 'numpy.ndarray' objects>
+    return f"{name} ({_short_path(filename)}:{line})"
+
+
+def collapsed_stacks(stats, min_fraction=1e-4):
+    """
+    Rebuilds call stacks from cProfile's caller graph and returns {"a;b;c": seconds}.
+
+    cProfile records caller -> callee edges, not full stacks, so the time of a
+    function reached along several paths is split between them in proportion to
+    the time each caller spent in it. Subtrees taking less than `min_fraction` of
+    the profiled time are dropped; pandas' call graph is too wide to expand fully.
+    """
+    entries = stats.stats
+    min_seconds = min_fraction * sum(entry[2] for entry in entries.values())
+    children = defaultdict(list)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            children[caller].append((func, edge[3]))
+
+    stacks = Counter()
+    roots = [func for func, entry in entries.items() if not entry[4]]
+    pending = [(root, (), 1.0) for root in roots]
+    while pending:
+        func, path, fraction = pending.pop()
+        stack = path + (_frame_label(func),)
+        own = entries[func][2] * fraction
+        if own >= min_seconds:
+            stacks[";".join(stack)] += own
+        for child, edge_cumulative in children[func]:
+            child_cumulative = entries[child][3]
+            if child_cumulative <= 0 or _frame_label(child) in stack:
+                continue
+            child_fraction = fraction * edge_cumulative / child_cumulative
+            if child_cumulative * child_fraction >= min_seconds:
+                pending.append((child, stack, child_fraction))
+    return stacks
+
+
+def write_cpu_profile(profiler, output_base, limit=60):
+    """
+    Writes the .pstats dump, the sorted text report and the collapsed stacks. Returns their paths.
+    """
+    pstats_path = output_base + ".pstats"
+    text_path = output_base + "_stats.txt"
+    collapsed_path = output_base + ".collapsed"
+
+    profiler.dump_stats(pstats_path)
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(limit)
+    stats.sort_stats("tottime").print_stats(limit)
+    with open(text_path, "w") as f:
+        f.write(stream.getvalue())
+
+    stacks = collapsed_stacks(pstats.Stats(profiler))
+    with open(collapsed_path, "w") as f:
+        for stack, seconds in sorted(stacks.items()):
+            micros = int(round(seconds * 1e6))
+            if micros > 0:
+                f.write(f"{stack} {micros}\n")
+    return [pstats_path, text_path, collapsed_path]
+
+
+def grown_package_allocations(snapshot, baseline):
+    """
+    Growth since `baseline` of the allocations with a package frame in their traceback, as
+    Counters by allocating file and by allocating line. Diffing by traceback and checking
+    the frames afterwards is much faster than Snapshot.filter_traces, which fnmatches them all.
+    """
+    by_file, by_line = Counter(), Counter()
+    for statistic in snapshot.compare_to(baseline, "traceback"):
+        innermost = statistic.traceback[-1]
+        if statistic.size_diff <= 0 or innermost.filename in PROFILER_FILES:
+            continue
+        if any(frame.filename.startswith(PACKAGE_DIR) for frame in statistic.traceback):
+            by_file[_short_path(innermost.filename)] += statistic.size_diff
+            by_line[f"{_short_path(innermost.filename)}:{innermost.lineno}"] += statistic.size_diff
+    return by_file, by_line
+
+
+class MemoryProfile:
+    """
+    Metrics listener that measures the tracemalloc peak of each questionnaire and diffs
+    the package's live allocations at the end of the scoring stage against its start.
+
+    Snapshots are only taken around the scoring stage: doing it around every
+    questionnaire would dominate the run. Writing a summary allocates a string per
+    cell, so tracing is stopped for the write stage and restarted with `frames` after it.
+    """
+
+    def __init__(self, top=10, frames=8):
+        self.top = top
+        self.frames = frames
+        self.questionnaires = {}
+        self.live_by_file = None
+        self.live_by_line = None
+        self.peak = 0
+        self._open = {}
+        self._baseline = None
+
+    def enter(self, kind, name):
+        if kind == "stage" and name == "score":
+            self._baseline = tracemalloc.take_snapshot()
+            return
+        if kind == "stage" and name == "write":
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            return
+        if kind != "questionnaire":
+            return
+        # reset_peak() clears the overall peak, so keep it first
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        self._open[name] = tracemalloc.get_traced_memory()[0]
+
+    def exit(self, kind, name):
+        if kind == "stage" and name == "score":
+            self.live_by_file, self.live_by_line = grown_package_allocations(
+                tracemalloc.take_snapshot(), self._baseline)
+            self._baseline = None
+            return
+        if kind == "stage" and name == "write":
+            tracemalloc.start(self.frames)
+            return
+        if kind != "questionnaire" or name not in self._open:
+            return
+        start = self._open.pop(name)
+        current, peak = tracemalloc.get_traced_memory()
+        record = self.questionnaires.setdefault(name, {"peak": 0, "retained": 0})
+        record["peak"] = max(record["peak"], peak - start)
+        record["retained"] += current - start
+
+    def report(self):
+        """
+        Returns the text report.
+        """
+        peak = max(tracemalloc.get_traced_memory()[1], self.peak)
+        lines = [f"Traced memory: peak {peak / MB:.1f} MB (summary writes not traced)", ""]
+
+        if self.questionnaires:
+            lines.append("Per questionnaire (peak above the memory in use when scoring started; "
+                         "retained after scoring):")
+            ordered = sorted(self.questionnaires.items(), key=lambda item: item[1]["peak"], reverse=True)
+            for name, record in ordered:
+                lines.append(f"  {name:<12} peak {record['peak'] / MB:9.2f} MB   "
+                             f"retained {record['retained'] / MB:9.2f} MB")
+            lines.append("")
+
+        if self.live_by_file:
+            lines.append("Allocated by package code during scoring and alive at its end, by file:")
+            for filename, size in self.live_by_file.most_common(self.top):
+                lines.append(f"  {size / MB:9.2f} MB  {filename}")
+            lines.append("")
+            lines.append("By line:")
+            for site, size in self.live_by_line.most_common(self.top):
+                lines.append(f"  {size / MB:9.3f} MB  {site}")
+        return "\n".join(lines) + "\n"
+
+
+def profile_run(fn, output_base, cpu=True, memory=False, frames=8, top=10):
+    """
+    Calls fn() under cProfile (`cpu`) and/or tracemalloc (`memory`) and writes the reports.
+    Returns (fn's result, list of written paths). With both enabled, the CPU profile
+    includes the tracing overhead.
+
+    tracemalloc records `frames` frames per allocation; allocations made deeper inside
+    pandas than that are not attributed to the package and left out of the report.
+    """
+    paths = []
+    profiler = cProfile.Profile() if cpu else None
+    memory_profile = None
+    if memory:
+        for module in PRELOADED_MODULES:
+            importlib.import_module(module)
+        memory_profile = MemoryProfile(top=top, frames=frames)
+        add_listener(memory_profile)
+        tracemalloc.start(frames)
+    try:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = fn()
+        finally:
+            if profiler is not None:
+                profiler.disable()
+        if memory_profile is not None:
+            memory_path = output_base + "_memory.txt"
+            with open(memory_path, "w") as f:
+                f.write(memory_profile.report())
+            paths.append(memory_path)
+    finally:
+        if memory_profile is not None:
+            tracemalloc.stop()
+            remove_listener(memory_profile)
+
+    if profiler is not None:
+        paths = write_cpu_profile(profiler, output_base) + paths
+    return result, paths
@@ -0,0 +1,107 @@
+"""
+Qualtrics CSV exports.
+
+A Qualtrics CSV export has two rows under the column names: the question text and
+the ImportId of every column as JSON, e.g. {"ImportId":"QID12_3"}. The loader
+(common.access_qualtrics_csv) skips both rows while parsing, so no stripped copy of
+the file is written and the item columns still parse straight to float64. ImportIds
+stay the same when a question is relabelled in the survey, so columns can be renamed
+from a {ImportId: column} mapping. Responses that were not finished are dropped
+before scoring.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from . import LazyModule
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = LazyModule("pandas")
+
+logger = logging.getLogger(__name__)
+
+# Rows between the column names and the first response: question text and ImportIds
+HEADER_ROWS = 2
+# Response status columns of an export, used to keep finished responses only
+FINISHED_COLUMN = "Finished"
+PROGRESS_COLUMN = "Progress"
+STATUS_COLUMNS = [FINISHED_COLUMN, PROGRESS_COLUMN]
+
+
+def _import_id(cell: str) -> Optional[str]:
+    try:
+        value = json.loads(cell)
+    except ValueError:
+        return None
+    return value.get("ImportId") if isinstance(value, dict) else None
+
+
+def read_qualtrics_header(path: str, delimiter: str = ",") -> Optional[Dict[str, List[str]]]:
+    """
+    Reads the three header rows of a CSV and returns {"columns", "questions", "import_ids"},
+    or None when the file is not a Qualtrics export (its third row is not all ImportIds).
+
+    Raises:
+        FileNotFoundError: if the file does not exist
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = []
+        for row in csv.reader(f, delimiter=delimiter):
+            rows.append(row)
+            if len(rows) == HEADER_ROWS + 1:
+                break
+    if len(rows) < HEADER_ROWS + 1:
+        return None
+    columns, questions, cells = rows
+    import_ids = [_import_id(cell) if cell else None for cell in cells]
+    if not any(import_ids) or any(cell and import_id is None for cell, import_id in zip(cells, import_ids)):
+        return None
+    return {"columns": columns, "questions": questions, "import_ids": import_ids}
+
+
+def rename_by_import_id(header: Dict[str, List[str]], import_ids: Optional[Dict[str, str]]) -> List[str]:
+    """
+    The export's column names with every column whose ImportId is a key of `import_ids`
+    renamed to the mapped name.
+    """
+    if not import_ids:
+        return list(header["columns"])
+    return [import_ids.get(import_id, column) if import_id else column
+            for column, import_id in zip(header["columns"], header["import_ids"])]
+
+
+def finished_mask(df: pd.DataFrame) -> Optional[pd.Series]:
+    """
+    True for finished responses: Finished is true ("True" or 1), or, in exports without
+    a Finished column, Progress is 100. None when the frame has neither column.
+    """
+    import pandas as pd
+    if FINISHED_COLUMN in df.columns:
+        finished = df[FINISHED_COLUMN].astype("str").str.strip().str.lower()
+        return finished.isin(["true", "1", "1.0"])
+    if PROGRESS_COLUMN in df.columns:
+        return pd.to_numeric(df[PROGRESS_COLUMN], errors="coerce") >= 100
+    return None
+
+
+def keep_finished(df: pd.DataFrame, status_columns: List[str]) -> pd.DataFrame:
+    """
+    `df` without unfinished responses, renumbered from 0, and without the
+    `status_columns` that were only loaded to find them.
+    """
+    mask = finished_mask(df)
+    df = df.drop(columns=status_columns)
+    if mask is None:
+        logger.warning("No Finished or Progress column; keeping all responses.")
+        return df
+    dropped = int((~mask).sum())
+    if not dropped:
+        return df
+    logger.info(f"Dropped {dropped} unfinished response(s).")
+    return df[mask.to_numpy()].reset_index(drop=True)
@@ -1,15 +1,20 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 # Reverse scoring for specific ALQ items
 def ALQ_reverse_score(df):
     """
     Reverse score certain ALQ items that are negatively worded.
     Items to reverse: ALQ_4 and ALQ_6
+    Returns the items with reversed values as a new DataFrame; the input is left unchanged.
     """
+    alq_items = [f'ALQ_{i:02d}' for i in range(1, 12)]
     reverse_items = ['ALQ_04', 'ALQ_06']
-    for item in reverse_items:
-        df[item] = 6 - df[item]  # Reverse scoring: 1 becomes 5, 5 becomes 1, etc.
-    return df
+    # Reverse scoring: 1 becomes 5, 5 becomes 1, etc.
+    return pd.DataFrame({item: 6 - df[item] if item in reverse_items else df[item] for item in alq_items})
 # Calculate subscale and total scores for ALQ
 def ALQ_calculate_scores(df):
     """
@@ -18,16 +23,18 @@ def ALQ_calculate_scores(df):
     Conceptualization (Con): Items ALQ_1, ALQ_2, ALQ_3, ALQ_4
     Identification (Iden): Items ALQ_5, ALQ_6, ALQ_7
     Integration (Int): Items ALQ_8, ALQ_9, ALQ_10, ALQ_11
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
-    df = ALQ_reverse_score(df)
+    items = ALQ_reverse_score(df)
     # Calculate subscale scores
-    df['ALQ_Conceptualization'] = df[['ALQ_01', 'ALQ_02', 'ALQ_03', 'ALQ_04']].mean(axis=1)
-    df['ALQ_Identification'] = df[['ALQ_05', 'ALQ_06', 'ALQ_07']].mean(axis=1)
-    df['ALQ_Integration'] = df[['ALQ_08', 'ALQ_09', 'ALQ_10', 'ALQ_11']].mean(axis=1)
+    scores = pd.DataFrame(index=df.index)
+    scores['ALQ_Conceptualization'] = items[['ALQ_01', 'ALQ_02', 'ALQ_03', 'ALQ_04']].mean(axis=1)
+    scores['ALQ_Identification'] = items[['ALQ_05', 'ALQ_06', 'ALQ_07']].mean(axis=1)
+    scores['ALQ_Integration'] = items[['ALQ_08', 'ALQ_09', 'ALQ_10', 'ALQ_11']].mean(axis=1)
     
     # Calculate total ALQ score
-    df['ALQ_Total_Score'] = df[['ALQ_Conceptualization', 'ALQ_Identification', 'ALQ_Integration']].mean(axis=1)
-    return df
+    scores['ALQ_Total_Score'] = scores[['ALQ_Conceptualization', 'ALQ_Identification', 'ALQ_Integration']].mean(axis=1)
+    return scores
 
 # Summarize ALQ results
 def ALQ_summarize_results(df):
@@ -37,13 +44,13 @@ def ALQ_summarize_results(df):
     mean_scores = df[['ALQ_Conceptualization', 'ALQ_Identification', 'ALQ_Integration', 'ALQ_Total_Score']].mean()
     std_scores = df[['ALQ_Conceptualization', 'ALQ_Identification', 'ALQ_Integration', 'ALQ_Total_Score']].std()
 
-    print("\nSummary of ALQ Scores:")
-    print(df[['ALQ_Conceptualization', 'ALQ_Identification', 'ALQ_Integration', 'ALQ_Total_Score']])
+    logger.debug("\nSummary of ALQ Scores:")
+    logger.debug(df[['ALQ_Conceptualization', 'ALQ_Identification', 'ALQ_Integration', 'ALQ_Total_Score']])
 
-    print(f"\nMean Conceptualization Score: {mean_scores['ALQ_Conceptualization']:.2f}")
-    print(f"Mean Identification Score: {mean_scores['ALQ_Identification']:.2f}")
-    print(f"Mean Integration Score: {mean_scores['ALQ_Integration']:.2f}")
-    print(f"Mean Total ALQ Score: {mean_scores['ALQ_Total_Score']:.2f}")
+    logger.debug(f"\nMean Conceptualization Score: {mean_scores['ALQ_Conceptualization']:.2f}")
+    logger.debug(f"Mean Identification Score: {mean_scores['ALQ_Identification']:.2f}")
+    logger.debug(f"Mean Integration Score: {mean_scores['ALQ_Integration']:.2f}")
+    logger.debug(f"Mean Total ALQ Score: {mean_scores['ALQ_Total_Score']:.2f}")
     
     return {
         'Mean Conceptualization Score': mean_scores['ALQ_Conceptualization'],
@@ -64,8 +71,8 @@ def ALQ_subgroup_means(df, subgroup_column):
     """
     subgroup_stats = df.groupby(subgroup_column)[['ALQ_Conceptualization', 'ALQ_Identification', 'ALQ_Integration', 'ALQ_Total_Score']].agg(['mean', 'std'])
     
-    print(f"\nSubgroup Means and Standard Deviations for {subgroup_column}:")
-    print(subgroup_stats)
+    logger.debug(f"\nSubgroup Means and Standard Deviations for {subgroup_column}:")
+    logger.debug(subgroup_stats)
 
     return subgroup_stats
 
@@ -75,7 +82,7 @@ def ALQ_save_results_to_csv(df, output_file_path):
     Save the processed results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Save the summarized statistics to CSV
 def ALQ_save_summary_to_csv(summary, subgroup_summary, output_file_path):
@@ -86,18 +93,19 @@ def ALQ_save_summary_to_csv(summary, subgroup_summary, output_file_path):
     summary_df = pd.concat([summary_df, subgroup_summary])
 
     summary_df.to_csv(output_file_path, index=False)
-    print(f"Summary saved to {output_file_path}.")
+    logger.info(f"Summary saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
     if df is not None:
         # Step 1: Score calculations
-        df = ALQ_calculate_scores(df)
+        scores = ALQ_calculate_scores(df)
 
-        # Step 2: Subgroup stats and full summary (print only, optional)
-        summary = ALQ_summarize_results(df)
-        subgroup_column = 'Gender'
-        subgroup_summary = ALQ_subgroup_means(df, subgroup_column)
+        # Step 2: Subgroup stats and full summary (debug logging only)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = ALQ_summarize_results(scores)
+            subgroup_column = 'Gender'
+            subgroup_summary = ALQ_subgroup_means(scores.assign(**{subgroup_column: df[subgroup_column]}), subgroup_column)
 
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -107,7 +115,7 @@ def main(df):
             'ALQ_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,34 +1,40 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 
 # Reverse scoring for specific items
 def BEQ_reverse_score(df):
     """
     Reverse score specific BEQ items (3, 8, 9).
+    Returns the items with reversed values as a new DataFrame; the input is left unchanged.
     """
-    df['BEQ_03'] = 8 - df['BEQ_03']
-    df['BEQ_08'] = 8 - df['BEQ_08']
-    df['BEQ_09'] = 8 - df['BEQ_09']
-    return df
+    beq_items = [f'BEQ_{i:02d}' for i in range(1, 17)]
+    reverse_items = ['BEQ_03', 'BEQ_08', 'BEQ_09']
+    return pd.DataFrame({item: 8 - df[item] if item in reverse_items else df[item] for item in beq_items})
 
 # Calculate the BEQ scores
 def BEQ_calculate_scores(df):
     """
     Calculate the subscale and total scores for the Berkeley Expressivity Questionnaire (BEQ).
     Three subscales: Negative Expressivity (nex), Positive Expressivity (pex), and Impulse Strength (str).
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     # Reverse scoring
-    df = BEQ_reverse_score(df)
+    items = BEQ_reverse_score(df)
     # Calculate the BEQ subscale scores
-    df['BEQ_Negative_Expressivity'] = df[['BEQ_09', 'BEQ_13', 'BEQ_16', 'BEQ_03', 'BEQ_05', 'BEQ_08']].mean(axis=1)
-    df['BEQ_Positive_Expressivity'] = df[['BEQ_06', 'BEQ_01', 'BEQ_04', 'BEQ_10']].mean(axis=1)
-    df['BEQ_Impulse_Strength'] = df[['BEQ_15', 'BEQ_11', 'BEQ_14', 'BEQ_07', 'BEQ_02', 'BEQ_12']].mean(axis=1)
+    scores = pd.DataFrame(index=df.index)
+    scores['BEQ_Negative_Expressivity'] = items[['BEQ_09', 'BEQ_13', 'BEQ_16', 'BEQ_03', 'BEQ_05', 'BEQ_08']].mean(axis=1)
+    scores['BEQ_Positive_Expressivity'] = items[['BEQ_06', 'BEQ_01', 'BEQ_04', 'BEQ_10']].mean(axis=1)
+    scores['BEQ_Impulse_Strength'] = items[['BEQ_15', 'BEQ_11', 'BEQ_14', 'BEQ_07', 'BEQ_02', 'BEQ_12']].mean(axis=1)
 
     # Calculate the overall BEQ score as the mean of all subscales
-    df['BEQ_Total_Score'] = df[['BEQ_Negative_Expressivity', 'BEQ_Positive_Expressivity', 'BEQ_Impulse_Strength']].mean(axis=1)
+    scores['BEQ_Total_Score'] = scores[['BEQ_Negative_Expressivity', 'BEQ_Positive_Expressivity', 'BEQ_Impulse_Strength']].mean(axis=1)
     
-    return df
+    return scores
 
 # Summarize results
 def BEQ_summarize_results(df):
@@ -38,11 +44,11 @@ def BEQ_summarize_results(df):
     mean_scores = df[['BEQ_Negative_Expressivity', 'BEQ_Positive_Expressivity', 'BEQ_Impulse_Strength', 'BEQ_Total_Score']].mean()
     std_scores = df[['BEQ_Negative_Expressivity', 'BEQ_Positive_Expressivity', 'BEQ_Impulse_Strength', 'BEQ_Total_Score']].std()
 
-    print("\nSummary of BEQ Scores:")
-    print(df[['BEQ_Total_Score', 'BEQ_Negative_Expressivity', 'BEQ_Positive_Expressivity', 'BEQ_Impulse_Strength']])
+    logger.debug("\nSummary of BEQ Scores:")
+    logger.debug(df[['BEQ_Total_Score', 'BEQ_Negative_Expressivity', 'BEQ_Positive_Expressivity', 'BEQ_Impulse_Strength']])
 
-    print(f"\nMean Total BEQ Score: {mean_scores['BEQ_Total_Score']:.2f}")
-    print(f"Standard Deviation of Total BEQ Scores: {std_scores['BEQ_Total_Score']:.2f}")
+    logger.debug(f"\nMean Total BEQ Score: {mean_scores['BEQ_Total_Score']:.2f}")
+    logger.debug(f"Standard Deviation of Total BEQ Scores: {std_scores['BEQ_Total_Score']:.2f}")
 
     return {
         'Mean Total BEQ Score': mean_scores['BEQ_Total_Score'],
@@ -61,16 +67,17 @@ def BEQ_save_results_to_csv(df, output_file_path):
     Save the processed results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
     if df is not None:
         # Step 1: Calculate BEQ scores
-        df = BEQ_calculate_scores(df)
+        scores = BEQ_calculate_scores(df)
 
         # Step 2: Optional summary logging
-        _ = BEQ_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            _ = BEQ_summarize_results(scores)
 
         # Step 3: Define summary columns to return
         summary_columns = [
@@ -81,7 +88,7 @@ def main(df):
         ]
 
         # Only return the summary columns for concatenation
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 
@@ -1,5 +1,9 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 
 # Calculate BFI subscale scores
@@ -13,6 +17,7 @@ def BFI_calculate_scores(df):
     - Neuroticism
     - Openness
     Reverse scoring is applied where necessary.
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     
     # Reverse-scored items for each subscale
@@ -22,33 +27,23 @@ def BFI_calculate_scores(df):
     reverse_neuroticism = ["BFI_09", "BFI_24", "BFI_34"]  # Reverse items for Neuroticism
     reverse_openness = ["BFI_35", "BFI_41"]  # Reverse items for Openness
 
-    # Apply reverse scoring for relevant items
-    for item in reverse_extraversion:
-        df[f'{item}'] = 6 - df[item]  # 1-5 scale, reverse scoring is 6 - original response
-    
-    for item in reverse_agreeableness:
-        df[f'{item}'] = 6 - df[item]
-
-    for item in reverse_conscientiousness:
-        df[f'{item}'] = 6 - df[item]
-
-    for item in reverse_neuroticism:
-        df[f'{item}'] = 6 - df[item]
+    reverse_items = (reverse_extraversion + reverse_agreeableness + reverse_conscientiousness +
+                     reverse_neuroticism + reverse_openness)
 
-    for item in reverse_openness:
-        df[f'{item}'] = 6 - df[item]
+    def items(columns):
+        # Apply reverse scoring while reading the items: 1-5 scale, reverse scoring is 6 - original response
+        return pd.DataFrame({item: 6 - df[item] if item in reverse_items else df[item] for item in columns})
 
     # Calculate subscale scores all at once to avoid fragmentation
     subscale_scores = {
-        'BFI_Extraversion': df[['BFI_01', 'BFI_06', 'BFI_11', 'BFI_16', 'BFI_21', 'BFI_26', 'BFI_31', 'BFI_36']].mean(axis=1),
-        'BFI_Agreeableness': df[['BFI_02', 'BFI_07', 'BFI_12', 'BFI_17', 'BFI_22', 'BFI_27', 'BFI_32', 'BFI_37', 'BFI_42']].mean(axis=1),
-        'BFI_Conscientiousness': df[['BFI_03', 'BFI_08', 'BFI_13', 'BFI_18', 'BFI_23', 'BFI_28', 'BFI_33', 'BFI_38', 'BFI_43']].mean(axis=1),
-        'BFI_Neuroticism': df[['BFI_04', 'BFI_09', 'BFI_14', 'BFI_19', 'BFI_24', 'BFI_29', 'BFI_34', 'BFI_39']].mean(axis=1),
-        'BFI_Openness': df[['BFI_05', 'BFI_10', 'BFI_15', 'BFI_20', 'BFI_25', 'BFI_30', 'BFI_35', 'BFI_40', 'BFI_41', 'BFI_44']].mean(axis=1)
+        'BFI_Extraversion': items(['BFI_01', 'BFI_06', 'BFI_11', 'BFI_16', 'BFI_21', 'BFI_26', 'BFI_31', 'BFI_36']).mean(axis=1),
+        'BFI_Agreeableness': items(['BFI_02', 'BFI_07', 'BFI_12', 'BFI_17', 'BFI_22', 'BFI_27', 'BFI_32', 'BFI_37', 'BFI_42']).mean(axis=1),
+        'BFI_Conscientiousness': items(['BFI_03', 'BFI_08', 'BFI_13', 'BFI_18', 'BFI_23', 'BFI_28', 'BFI_33', 'BFI_38', 'BFI_43']).mean(axis=1),
+        'BFI_Neuroticism': items(['BFI_04', 'BFI_09', 'BFI_14', 'BFI_19', 'BFI_24', 'BFI_29', 'BFI_34', 'BFI_39']).mean(axis=1),
+        'BFI_Openness': items(['BFI_05', 'BFI_10', 'BFI_15', 'BFI_20', 'BFI_25', 'BFI_30', 'BFI_35', 'BFI_40', 'BFI_41', 'BFI_44']).mean(axis=1)
     }
-    df = df.assign(**subscale_scores)
 
-    return df
+    return pd.DataFrame(subscale_scores, index=df.index)
 
 # Summarize results
 def BFI_summarize_results(df):
@@ -60,9 +55,9 @@ def BFI_summarize_results(df):
     std_scores = df[['BFI_Extraversion', 'BFI_Agreeableness', 'BFI_Conscientiousness', 
                      'BFI_Neuroticism', 'BFI_Openness']].std()
 
-    print("\nSummary of BFI Scores:")
-    print(df[['BFI_Extraversion', 'BFI_Agreeableness', 'BFI_Conscientiousness', 
-              'BFI_Neuroticism', 'BFI_Openness']])
+    logger.debug("\nSummary of BFI Scores:")
+    logger.debug(df[['BFI_Extraversion', 'BFI_Agreeableness', 'BFI_Conscientiousness', 
+                     'BFI_Neuroticism', 'BFI_Openness']])
     
     return {
         'Mean Extraversion': mean_scores['BFI_Extraversion'],
@@ -80,7 +75,7 @@ def BFI_summarize_results(df):
 # Save the results to CSV
 def BFI_save_results_to_csv(df, output_file_path):
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -89,13 +84,14 @@ def main(df):
 
     if df is not None:
         # Calculate BFI subscale scores
-        df = BFI_calculate_scores(df)
+        scores = BFI_calculate_scores(df)
 
         # Summarize results
-        summary = BFI_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = BFI_summarize_results(scores)
 
         # Save individual scores to CSV
-        # BFI_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # BFI_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -106,7 +102,7 @@ def main(df):
             'BFI_Openness'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,19 +1,24 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 
 # Calculate total sensation seeking score
 def BSSS_calculate_bsss_score(df):
     """
     Calculate the total score for the Brief Sensation Seeking Scale (BSSS).
+    Returns a new DataFrame holding the score; the input is left unchanged.
     """
     # Items contributing to the BSSS score
     bsss_items = ["BSSS_01", "BSSS_02", "BSSS_03", "BSSS_04", "BSSS_05", "BSSS_06", "BSSS_07", "BSSS_08"]
     
-    # Calculate total BSSS score to avoid DataFrame fragmentation
-    df = df.assign(BSSS_Total_Score=df[[item for item in bsss_items]].sum(axis=1))
+    scores = pd.DataFrame(index=df.index)
+    scores['BSSS_Total_Score'] = df[bsss_items].sum(axis=1)
     
-    return df
+    return scores
 
 # Summarize results
 def BSSS_summarize_results(df):
@@ -23,11 +28,11 @@ def BSSS_summarize_results(df):
     mean_bsss_score = df['BSSS_Total_Score'].mean()
     std_bsss_score = df['BSSS_Total_Score'].std()
     
-    print("\nSummary of BSSS Scores:")
-    print(df[['BSSS_Total_Score']])
+    logger.debug("\nSummary of BSSS Scores:")
+    logger.debug(df[['BSSS_Total_Score']])
     
-    print(f"\nMean BSSS Score: {mean_bsss_score:.3f}")
-    print(f"Standard Deviation of BSSS Scores: {std_bsss_score:.3f}")
+    logger.debug(f"\nMean BSSS Score: {mean_bsss_score:.3f}")
+    logger.debug(f"Standard Deviation of BSSS Scores: {std_bsss_score:.3f}")
     
     return {
         'Mean BSSS Score': mean_bsss_score,
@@ -40,7 +45,7 @@ def BSSS_save_results_to_csv(df, output_file_path):
     Save the processed results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -49,20 +54,21 @@ def main(df):
 
     if df is not None:
         # Calculate BSSS scores
-        df = BSSS_calculate_bsss_score(df)
+        scores = BSSS_calculate_bsss_score(df)
 
         # Summarize results
-        summary = BSSS_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = BSSS_summarize_results(scores)
 
         # Save results to CSV
-        # BSSS_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # BSSS_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
             'BSSS_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,5 +1,11 @@
+import logging
+
 import pandas as pd
 
+from questionnaire_analysis.coercion import numeric_items
+
+logger = logging.getLogger(__name__)
+
 def CARE_calculate_scores(df):
     """
     Calculate subscale scores for the CARE questionnaire based on categorized items from the Qualtrics survey.
@@ -10,12 +16,11 @@ def CARE_calculate_scores(df):
     - Risky_alcohol: 25,26,27,28,29,30,31,32
     - Safe_Sexual_Activity: 01,07
     - 08 is not placed
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     
-    # Convert all relevant columns to numeric (ignoring errors)
-    for col in df.columns:
-        if col.startswith('CARE_'):
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+    # Read all relevant columns as numeric (ignoring errors) without converting the input frame
+    items = numeric_items(df, [col for col in df.columns if col.startswith('CARE_')])
 
     # Define item categories according to the guidelines
     risky_sexual_items = ['CARE_02', 'CARE_03', 'CARE_04', 'CARE_05', 'CARE_06', 'CARE_09', 
@@ -26,22 +31,19 @@ def CARE_calculate_scores(df):
                           'CARE_31', 'CARE_32']
     safe_sexual_items = ['CARE_01', 'CARE_07']
 
-    # Create a dictionary of the new columns with their calculations
-    new_columns = {
-        'CARE_Risky_Sexual_Activity': df[risky_sexual_items].mean(axis=1),
-        'CARE_Risky_Drugs': df[risky_drug_items].mean(axis=1),
-        'CARE_Risky_Alcohol': df[risky_alcohol_items].mean(axis=1),
-        'CARE_Safe_Sexual_Activity': df[safe_sexual_items].mean(axis=1)
-    }
-
-    # Concatenate the new columns at once
-    df = pd.concat([df, pd.DataFrame(new_columns)], axis=1)
+    # Calculate all subscale scores at once to avoid fragmentation
+    scores = pd.DataFrame({
+        'CARE_Risky_Sexual_Activity': items[risky_sexual_items].mean(axis=1),
+        'CARE_Risky_Drugs': items[risky_drug_items].mean(axis=1),
+        'CARE_Risky_Alcohol': items[risky_alcohol_items].mean(axis=1),
+        'CARE_Safe_Sexual_Activity': items[safe_sexual_items].mean(axis=1)
+    }, index=df.index)
 
     # Calculate total CARE score as mean of all categories (excluding item 08)
-    df['CARE_Total_Score'] = df[['CARE_Risky_Sexual_Activity', 'CARE_Risky_Drugs', 
-                                 'CARE_Risky_Alcohol', 'CARE_Safe_Sexual_Activity']].mean(axis=1)
+    scores['CARE_Total_Score'] = scores[['CARE_Risky_Sexual_Activity', 'CARE_Risky_Drugs', 
+                                         'CARE_Risky_Alcohol', 'CARE_Safe_Sexual_Activity']].mean(axis=1)
 
-    return df
+    return scores
 
 def CARE_summarize_results(df):
     """
@@ -58,21 +60,22 @@ def CARE_summarize_results(df):
     mean_scores = df[subscales].mean()
     std_scores = df[subscales].std()
 
-    print("\n📊 CARE Subscale Summary:")
-    print(df[subscales])
+    logger.debug("\n📊 CARE Subscale Summary:")
+    logger.debug(df[subscales])
     
     for sub in subscales:
-        print(f"{sub}: Mean = {mean_scores[sub]:.3f}, Std = {std_scores[sub]:.3f}")
+        logger.debug(f"{sub}: Mean = {mean_scores[sub]:.3f}, Std = {std_scores[sub]:.3f}")
 
     return {f"Mean {sub}": mean_scores[sub] for sub in subscales}
 
 def main(df):
     if df is not None:
         # Step 1: Calculate scores
-        df = CARE_calculate_scores(df)
+        scores = CARE_calculate_scores(df)
 
         # Step 2: Optional summary logging
-        _ = CARE_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            _ = CARE_summarize_results(scores)
 
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -83,6 +86,6 @@ def main(df):
             'CARE_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
@@ -1,4 +1,8 @@
+import logging
+
 import pandas as pd
+
+logger = logging.getLogger(__name__)
 # TODO
 # Change column names
 
@@ -16,9 +20,10 @@ def CBCL_calculate_scores(df):
     - Thought Problems
     - Attention Problems
     - Aggressive Behavior
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     # Calculate all CBCL subscales at once to avoid DataFrame fragmentation
-    all_changes = {
+    scores = {
         'CBCL_Anxiety_Depression': df[['CBCL_01', 'CBCL_02', 'CBCL_03', 'CBCL_04']].sum(axis=1),
         'CBCL_Withdrawn_Depressed': df[['CBCL_05', 'CBCL_06', 'CBCL_07']].sum(axis=1),
         'CBCL_Somatic_Complaints': df[['CBCL_08', 'CBCL_09', 'CBCL_10']].sum(axis=1),
@@ -27,9 +32,8 @@ def CBCL_calculate_scores(df):
         'CBCL_Attention_Problems': df[['CBCL_17', 'CBCL_18', 'CBCL_19']].sum(axis=1),
         'CBCL_Aggressive_Behavior': df[['CBCL_20', 'CBCL_21', 'CBCL_22']].sum(axis=1)
     }
-    df = df.assign(**all_changes)
     
-    return df
+    return pd.DataFrame(scores, index=df.index)
 
 # Summarize results
 def CBCL_summarize_results(df):
@@ -43,10 +47,10 @@ def CBCL_summarize_results(df):
                      'CBCL_Social_Problems', 'CBCL_Thought_Problems', 'CBCL_Attention_Problems', 
                      'CBCL_Aggressive_Behavior']].std()
 
-    print("\nSummary of CBCL Scores:")
-    print(df[['CBCL_Anxiety_Depression', 'CBCL_Withdrawn_Depressed', 'CBCL_Somatic_Complaints', 
-              'CBCL_Social_Problems', 'CBCL_Thought_Problems', 'CBCL_Attention_Problems', 
-              'CBCL_Aggressive_Behavior']])
+    logger.debug("\nSummary of CBCL Scores:")
+    logger.debug(df[['CBCL_Anxiety_Depression', 'CBCL_Withdrawn_Depressed', 'CBCL_Somatic_Complaints', 
+                     'CBCL_Social_Problems', 'CBCL_Thought_Problems', 'CBCL_Attention_Problems', 
+                     'CBCL_Aggressive_Behavior']])
     
     return {
         'Mean Anxiety/Depression': mean_scores['CBCL_Anxiety_Depression'],
@@ -68,7 +72,7 @@ def CBCL_summarize_results(df):
 # Save the results to CSV
 def CBCL_save_results_to_csv(df, output_file_path):
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -78,13 +82,14 @@ def main(df):
 
     if df is not None:
         # Calculate CBCL subscale scores
-        df = CBCL_calculate_scores(df)
+        scores = CBCL_calculate_scores(df)
 
         # Summarize results
-        summary = CBCL_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = CBCL_summarize_results(scores)
 
         # Save individual scores to CSV
-        # CBCL_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # CBCL_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -97,7 +102,7 @@ def main(df):
             'CBCL_Aggressive_Behavior'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 if __name__ == "__main__":
     main()
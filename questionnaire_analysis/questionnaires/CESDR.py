@@ -1,5 +1,11 @@
+import logging
+
 import pandas as pd
 
+from questionnaire_analysis.coercion import numeric_items
+
+logger = logging.getLogger(__name__)
+
 
 
 # Calculate CESD-R scores
@@ -7,15 +13,16 @@ def CESDR_calculate_scores(df):
     """
     Calculate the total CESD-R score by summing all item responses.
     Assumes items are named CESDR_01 to CESDR_20.
+    Returns a new DataFrame holding the score; the input is left unchanged.
     """
     cesdr_items = [f'CESDR_{i:02d}' for i in range(1, 21)]  # Adjust if you have a different item range
 
-    # Convert all CESDR columns to numeric at once to avoid fragmentation
-    numeric_conversions = {item: pd.to_numeric(df[item], errors='coerce') for item in cesdr_items}
-    df = df.assign(**numeric_conversions)
+    # Read the items as numeric; columns that are numeric already are not converted again
+    items = numeric_items(df, cesdr_items)
 
-    df['CESDR_Total_Score'] = df[cesdr_items].sum(axis=1)
-    return df
+    scores = pd.DataFrame(index=df.index)
+    scores['CESDR_Total_Score'] = items.sum(axis=1)
+    return scores
 
 # Summarize results
 def CESDR_summarize_results(df):
@@ -25,11 +32,11 @@ def CESDR_summarize_results(df):
     mean_total_score = df['CESDR_Total_Score'].mean()
     std_total_score = df['CESDR_Total_Score'].std()
 
-    print("\nSummary of CESD-R Scores:")
-    print(df[['CESDR_Total_Score']])
+    logger.debug("\nSummary of CESD-R Scores:")
+    logger.debug(df[['CESDR_Total_Score']])
 
-    print(f"\nMean Total CESD-R Score: {mean_total_score:.2f}")
-    print(f"Standard Deviation of CESD-R Scores: {std_total_score:.2f}")
+    logger.debug(f"\nMean Total CESD-R Score: {mean_total_score:.2f}")
+    logger.debug(f"Standard Deviation of CESD-R Scores: {std_total_score:.2f}")
 
     return {
         'Mean Total CESD-R Score': mean_total_score,
@@ -44,8 +51,8 @@ def CESDR_subgroup_means(df, subgroup_column):
     """
     subgroup_stats = df.groupby(subgroup_column)['CESDR_Total_Score'].agg(['mean', 'std'])
     
-    print(f"\nSubgroup Means and Standard Deviations for {subgroup_column}:")
-    print(subgroup_stats)
+    logger.debug(f"\nSubgroup Means and Standard Deviations for {subgroup_column}:")
+    logger.debug(subgroup_stats)
 
     return subgroup_stats
 
@@ -55,7 +62,7 @@ def CESDR_save_results_to_csv(df, output_file_path):
     Save the processed results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Save the summarized statistics to CSV
 def CESDR_save_summary_to_csv(summary, subgroup_summary, output_file_path):
@@ -66,7 +73,7 @@ def CESDR_save_summary_to_csv(summary, subgroup_summary, output_file_path):
     summary_df = pd.concat([summary_df, subgroup_summary])
 
     summary_df.to_csv(output_file_path, index=False)
-    print(f"Summary saved to {output_file_path}.")
+    logger.info(f"Summary saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -77,17 +84,19 @@ def main(df):
 
     if df is not None:
         # Calculate CESD-R scores
-        df = CESDR_calculate_scores(df)
+        scores = CESDR_calculate_scores(df)
 
         # Summarize results
-        summary = CESDR_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = CESDR_summarize_results(scores)
 
-        # Calculate subgroup means and std for a specific subgroup, e.g., 'Gender' or 'Age'
-        subgroup_column = 'Gender'  # Adjust this to your dataset's specific column
-        subgroup_summary = CESDR_subgroup_means(df, subgroup_column)
+            # Calculate subgroup means and std for a specific subgroup, e.g., 'Gender' or 'Age'
+            subgroup_column = 'Gender'  # Adjust this to your dataset's specific column
+            subgroup_summary = CESDR_subgroup_means(scores.assign(**{subgroup_column: df[subgroup_column]}),
+                                                    subgroup_column)
 
         # Save individual scores to CSV
-        # CESDR_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # CESDR_save_results_to_csv(scores, output_file_path)  # Disabled for package use
 
         # Save summarized results to CSV
         # CESDR_save_summary_to_csv(summary, subgroup_summary, summary_output_file_path)  # Disabled for package use
@@ -97,7 +106,7 @@ def main(df):
             'CESDR_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,10 +1,16 @@
+import logging
+
 import pandas as pd
-# TODO: Apply fragmentation optimization pattern (df.assign(**all_changes)) to all questionnaire modules for better performance 
+
+from questionnaire_analysis.coercion import numeric_items
+
+logger = logging.getLogger(__name__)
 
 # Calculate subscale scores
 def DOSPERT_calculate_subscale_scores(df):
     """
     Calculate the subscale scores for the DOSPERT scale.
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     risk_taking_subscales = {
     'Ethical': ["DOSPERT_06", "DOSPERT_09", "DOSPERT_10", "DOSPERT_16", "DOSPERT_29", "DOSPERT_30"],
@@ -13,14 +19,14 @@ def DOSPERT_calculate_subscale_scores(df):
     'Recreational': ["DOSPERT_02", "DOSPERT_11", "DOSPERT_13", "DOSPERT_19", "DOSPERT_24", "DOSPERT_25"],
     'Social': ["DOSPERT_01", "DOSPERT_07", "DOSPERT_21", "DOSPERT_22", "DOSPERT_27", "DOSPERT_28"]
 }
-    for subscale, items in risk_taking_subscales.items():
-        df[f'{subscale}_Score'] = df[items].mean(axis=1)
-    return df
+    return pd.DataFrame({f'{subscale}_Score': df[items].mean(axis=1)
+                         for subscale, items in risk_taking_subscales.items()}, index=df.index)
 
 # Calculate overall scores for both risk-taking
 def DOSPERT_calculate_scores(df):
     """
     Calculate the overall score for risk-taking and risk-perception.
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     risk_taking_subscales = {
         'Ethical': ["DOSPERT_06", "DOSPERT_09", "DOSPERT_10", "DOSPERT_16", "DOSPERT_29", "DOSPERT_30"],
@@ -30,12 +36,11 @@ def DOSPERT_calculate_scores(df):
         'Social': ["DOSPERT_01", "DOSPERT_07", "DOSPERT_21", "DOSPERT_22", "DOSPERT_27", "DOSPERT_28"]
     }
 
-    # Convert all columns to numeric and calculate scores at once to avoid fragmentation
+    # Read the items as numeric and calculate scores at once to avoid fragmentation
     all_items = [item for items in risk_taking_subscales.values() for item in items]
-    numeric_conversions = {col: pd.to_numeric(df[col], errors='coerce') for col in all_items}
-    subscale_scores = {f'DOSPERT_{subscale}_Score': df[items].mean(axis=1) for subscale, items in risk_taking_subscales.items()}
-    all_changes = {**numeric_conversions, **subscale_scores}
-    df = df.assign(**all_changes)
+    numeric = numeric_items(df, all_items)
+    scores = pd.DataFrame({f'DOSPERT_{subscale}_Score': numeric[items].mean(axis=1) for subscale, items in risk_taking_subscales.items()},
+                          index=df.index)
 
     dospert_items = [
         "DOSPERT_01", "DOSPERT_02", "DOSPERT_03", "DOSPERT_04", "DOSPERT_05",
@@ -45,9 +50,9 @@ def DOSPERT_calculate_scores(df):
         "DOSPERT_21", "DOSPERT_22", "DOSPERT_23", "DOSPERT_24", "DOSPERT_25",
         "DOSPERT_26", "DOSPERT_27", "DOSPERT_28", "DOSPERT_29", "DOSPERT_30"
     ]
-    df['DOSPERT_Overall_Mean_Score'] = df[dospert_items].mean(axis=1)
+    scores['DOSPERT_Overall_Mean_Score'] = numeric[dospert_items].mean(axis=1)
 
-    return df
+    return scores
 
 # Summarize the results
 def DOSPERT_summarize_results(df):
@@ -62,8 +67,8 @@ def DOSPERT_summarize_results(df):
     'Social': ["DOSPERT_01", "DOSPERT_07", "DOSPERT_21", "DOSPERT_22", "DOSPERT_27", "DOSPERT_28"]
 }
     subscales = ['Ethical', 'Financial', 'Health_Safety', 'Recreational', 'Social']
-    print("\nSummary of Risk-Taking Scores:")
-    print(df[[f'DOSPERT_{subscale}_Score' for subscale in subscales] + ['DOSPERT_Overall_Mean_Score']])
+    logger.debug("\nSummary of Risk-Taking Scores:")
+    logger.debug(df[[f'DOSPERT_{subscale}_Score' for subscale in subscales] + ['DOSPERT_Overall_Mean_Score']])
     
     summary = {
         f'{subscale} Risk-Taking Mean': df[f'DOSPERT_{subscale}_Score'].mean(skipna=True) for subscale in subscales
@@ -75,7 +80,7 @@ def DOSPERT_summarize_results(df):
         # Convert to scalar if it's a Series, handle NaN values
         if hasattr(value, 'iloc'):
             value = value.iloc[0] if len(value) > 0 else float('nan')
-        print(f"{key}: {value:.3f}" if not pd.isna(value) else f"{key}: NaN")
+        logger.debug(f"{key}: {value:.3f}" if not pd.isna(value) else f"{key}: NaN")
     
     return summary
 
@@ -85,7 +90,7 @@ def DOSPERT_summarize_results(df):
 #     Save the processed results to a CSV file.
 #     """
 #     df.to_csv(output_file_path, index=False)
-#     print(f"Results saved to {output_file_path}.")
+#     logger.info(f"Results saved to {output_file_path}.")
     
 def DOSPERT_save_results_to_csv(df, output_file_path):
     """
@@ -100,15 +105,16 @@ def DOSPERT_save_results_to_csv(df, output_file_path):
     df_filtered = df[selected_columns] if set(selected_columns).issubset(df.columns) else df[list(set(selected_columns) & set(df.columns))]
     
     df_filtered.to_csv(output_file_path, index=False)  # Save filtered data to CSV
-    print(f"Selected summary scores saved to {output_file_path}.")
+    logger.info(f"Selected summary scores saved to {output_file_path}.")
 
 def main(df):
     if df is not None:
         # Step 1: Calculate subscale & overall scores
-        df = DOSPERT_calculate_scores(df)
+        scores = DOSPERT_calculate_scores(df)
 
         # Step 2: Optional logging
-        _ = DOSPERT_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            _ = DOSPERT_summarize_results(scores)
         
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -120,7 +126,7 @@ def main(df):
             'DOSPERT_Overall_Mean_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,4 +1,8 @@
+import logging
+
 import pandas as pd
+
+logger = logging.getLogger(__name__)
 # Check for reverse scoring
 
 
@@ -9,11 +13,13 @@ def ECR_calculate_scores(df):
     Subscales include:
     - Anxiety
     - Avoidance
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
-    df['ECR_Anxiety'] = df[['ECR_02', 'ECR_04', 'ECR_06', 'ECR_08', 'ECR_10', 'ECR_12']].mean(axis=1)
-    df['ECR_Avoidance'] = df[['ECR_01', 'ECR_03', 'ECR_05', 'ECR_07', 'ECR_09', 'ECR_11']].mean(axis=1)
+    scores = pd.DataFrame(index=df.index)
+    scores['ECR_Anxiety'] = df[['ECR_02', 'ECR_04', 'ECR_06', 'ECR_08', 'ECR_10', 'ECR_12']].mean(axis=1)
+    scores['ECR_Avoidance'] = df[['ECR_01', 'ECR_03', 'ECR_05', 'ECR_07', 'ECR_09', 'ECR_11']].mean(axis=1)
     
-    return df
+    return scores
 
 # Summarize results
 def ECR_summarize_results(df):
@@ -23,8 +29,8 @@ def ECR_summarize_results(df):
     mean_scores = df[['ECR_Anxiety', 'ECR_Avoidance']].mean()
     std_scores = df[['ECR_Anxiety', 'ECR_Avoidance']].std()
 
-    print("\nSummary of ECR-S Scores:")
-    print(df[['ECR_Anxiety', 'ECR_Avoidance']])
+    logger.debug("\nSummary of ECR-S Scores:")
+    logger.debug(df[['ECR_Anxiety', 'ECR_Avoidance']])
     
     return {
         'Mean Anxiety': mean_scores['ECR_Anxiety'],
@@ -36,7 +42,7 @@ def ECR_summarize_results(df):
 # Save the results to CSV
 def ECR_save_results_to_csv(df, output_file_path):
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function
 def main(df):
@@ -46,13 +52,14 @@ def main(df):
 
     if df is not None:
         # Calculate ECR-S subscale scores
-        df = ECR_calculate_scores(df)
+        scores = ECR_calculate_scores(df)
 
         # Summarize results
-        summary = ECR_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = ECR_summarize_results(scores)
 
         # Save individual scores to CSV
-        # ECR_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # ECR_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -60,7 +67,7 @@ def main(df):
             'ECR_Avoidance'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,31 +1,38 @@
+import logging
+
 import pandas as pd
 
+from questionnaire_analysis.coercion import numeric_items
+
+logger = logging.getLogger(__name__)
+
 # Calculating total scores
 def EERQ_calculate_scores(df):
     """
     Calculate the total score for the EERQ scale.
     Each subscale is calculated by averaging or summing relevant items.
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
-    # Convert all relevant columns to numeric (ignoring errors)
-    for col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
+    def items(columns):
+        # Read the items as numeric (ignoring errors) without converting the input frame
+        return numeric_items(df, columns)
 
     # Create a dictionary of the new columns with their calculations
     new_columns = {
-        'EERQ_Reappraisal_mean': df[['EERQ_01', 'EERQ_05', 'EERQ_10', 'EERQ_17', 'EERQ_19', 'EERQ_22']].mean(axis=1),
-        'EERQ_Suppression_mean': df[['EERQ_04', 'EERQ_09', 'EERQ_13', 'EERQ_20']].mean(axis=1),
-        'EERQ_Distraction_mean': df[['EERQ_06', 'EERQ_12', 'EERQ_15', 'EERQ_18', 'EERQ_21']].mean(axis=1),
-        'EERQ_Selective_Attention_mean': df[['EERQ_07', 'EERQ_11', 'EERQ_14', 'EERQ_16']].mean(axis=1),
-        'EERQ_Situation_Selection_mean': df[['EERQ_02', 'EERQ_03', 'EERQ_08']].mean(axis=1)
+        'EERQ_Reappraisal_mean': items(['EERQ_01', 'EERQ_05', 'EERQ_10', 'EERQ_17', 'EERQ_19', 'EERQ_22']).mean(axis=1),
+        'EERQ_Suppression_mean': items(['EERQ_04', 'EERQ_09', 'EERQ_13', 'EERQ_20']).mean(axis=1),
+        'EERQ_Distraction_mean': items(['EERQ_06', 'EERQ_12', 'EERQ_15', 'EERQ_18', 'EERQ_21']).mean(axis=1),
+        'EERQ_Selective_Attention_mean': items(['EERQ_07', 'EERQ_11', 'EERQ_14', 'EERQ_16']).mean(axis=1),
+        'EERQ_Situation_Selection_mean': items(['EERQ_02', 'EERQ_03', 'EERQ_08']).mean(axis=1)
     }
 
-    # Concatenate the new columns at once
-    df = pd.concat([df, pd.DataFrame(new_columns)], axis=1)
+    # Build the score columns at once
+    scores = pd.DataFrame(new_columns, index=df.index)
 
     # Optional: Calculate the overall EERQ score by averaging all strategies
-    df['EERQ_Total_E_ERQ_Score_mean'] = df[['EERQ_Reappraisal_mean', 'EERQ_Suppression_mean', 'EERQ_Distraction_mean', 'EERQ_Selective_Attention_mean', 'EERQ_Situation_Selection_mean']].mean(axis=1)
+    scores['EERQ_Total_E_ERQ_Score_mean'] = scores[['EERQ_Reappraisal_mean', 'EERQ_Suppression_mean', 'EERQ_Distraction_mean', 'EERQ_Selective_Attention_mean', 'EERQ_Situation_Selection_mean']].mean(axis=1)
 
-    return df
+    return scores
 
 # Summarize results
 def EERQ_summarize_results(df):
@@ -35,15 +42,15 @@ def EERQ_summarize_results(df):
     mean_scores = df[['EERQ_Reappraisal_mean', 'EERQ_Suppression_mean', 'EERQ_Distraction_mean', 'EERQ_Selective_Attention_mean', 'EERQ_Situation_Selection_mean', 'EERQ_Total_E_ERQ_Score_mean']].mean()
     std_scores = df[['EERQ_Reappraisal_mean', 'EERQ_Suppression_mean', 'EERQ_Distraction_mean', 'EERQ_Selective_Attention_mean', 'EERQ_Situation_Selection_mean', 'EERQ_Total_E_ERQ_Score_mean']].std()
 
-    print("\nSummary of E-ERQ Scores:")
-    print(df[['EERQ_Reappraisal_mean', 'EERQ_Suppression_mean', 'EERQ_Distraction_mean', 'EERQ_Selective_Attention_mean', 'EERQ_Situation_Selection_mean', 'EERQ_Total_E_ERQ_Score_mean']])
+    logger.debug("\nSummary of E-ERQ Scores:")
+    logger.debug(df[['EERQ_Reappraisal_mean', 'EERQ_Suppression_mean', 'EERQ_Distraction_mean', 'EERQ_Selective_Attention_mean', 'EERQ_Situation_Selection_mean', 'EERQ_Total_E_ERQ_Score_mean']])
 
-    print(f"\nMean Reappraisal: {mean_scores['EERQ_Reappraisal_mean']:.3f}")
-    print(f"Mean Suppression: {mean_scores['EERQ_Suppression_mean']:.3f}")
-    print(f"Mean Distraction: {mean_scores['EERQ_Distraction_mean']:.3f}")
-    print(f"Mean Selective Attention: {mean_scores['EERQ_Selective_Attention_mean']:.3f}")
-    print(f"Mean Situation Selection: {mean_scores['EERQ_Situation_Selection_mean']:.3f}")
-    print(f"Mean Total E-ERQ Score: {mean_scores['EERQ_Total_E_ERQ_Score_mean']:.3f}")
+    logger.debug(f"\nMean Reappraisal: {mean_scores['EERQ_Reappraisal_mean']:.3f}")
+    logger.debug(f"Mean Suppression: {mean_scores['EERQ_Suppression_mean']:.3f}")
+    logger.debug(f"Mean Distraction: {mean_scores['EERQ_Distraction_mean']:.3f}")
+    logger.debug(f"Mean Selective Attention: {mean_scores['EERQ_Selective_Attention_mean']:.3f}")
+    logger.debug(f"Mean Situation Selection: {mean_scores['EERQ_Situation_Selection_mean']:.3f}")
+    logger.debug(f"Mean Total E-ERQ Score: {mean_scores['EERQ_Total_E_ERQ_Score_mean']:.3f}")
 
     return {
         'Mean Reappraisal': mean_scores['EERQ_Reappraisal_mean'],
@@ -73,16 +80,17 @@ def EERQ_save_results_to_csv(df, output_file_path):
     df_filtered = df[selected_columns] if set(selected_columns).issubset(df.columns) else df[list(set(selected_columns) & set(df.columns))]
     
     df_filtered.to_csv(output_file_path, index=False)  # Save filtered data to CSV
-    print(f"Selected summary scores saved to {output_file_path}.")
+    logger.info(f"Selected summary scores saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
     if df is not None:
         # Step 1: Calculate scores
-        df = EERQ_calculate_scores(df)
+        scores = EERQ_calculate_scores(df)
 
         # Step 2: Optional log summary
-        _ = EERQ_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            _ = EERQ_summarize_results(scores)
 
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -94,7 +102,7 @@ def main(df):
             'EERQ_Total_E_ERQ_Score_mean'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
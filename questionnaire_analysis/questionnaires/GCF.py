@@ -1,17 +1,24 @@
+import logging
+
 import pandas as pd
 
+from questionnaire_analysis.coercion import numeric_items
+
+logger = logging.getLogger(__name__)
+
 def GCF_calculate_scores(df):
     """
     Calculate the total GCF score by averaging all GCF item responses.
     Assumes items are named GCF_01 to GCF_20.
+    Returns a new DataFrame holding the score; the input is left unchanged.
     """
     gcf_items = [f'GCF_{i:02d}' for i in range(1, 21)]  # Adjust if you have a different item range
 
-    for item in gcf_items:
-        df[item] = pd.to_numeric(df[item], errors='coerce')
+    items = numeric_items(df, gcf_items)
 
-    df['GCF_Total_Score'] = df[gcf_items].mean(axis=1)
-    return df
+    scores = pd.DataFrame(index=df.index)
+    scores['GCF_Total_Score'] = items.mean(axis=1)
+    return scores
 # Summarize results
 def GCF_summarize_results(df):
     """
@@ -20,11 +27,11 @@ def GCF_summarize_results(df):
     mean_total_score = df['GCF_Total_Score'].mean()
     std_total_score = df['GCF_Total_Score'].std()
 
-    print("\nSummary of Greenleaf Content-free Scale Scores:")
-    print(df[['GCF_Total_Score']])
+    logger.debug("\nSummary of Greenleaf Content-free Scale Scores:")
+    logger.debug(df[['GCF_Total_Score']])
 
-    print(f"\nMean Total GCF Score: {mean_total_score:.2f}")
-    print(f"Standard Deviation of GCF Scores: {std_total_score:.2f}")
+    logger.debug(f"\nMean Total GCF Score: {mean_total_score:.2f}")
+    logger.debug(f"Standard Deviation of GCF Scores: {std_total_score:.2f}")
 
     return {
         'Mean Total GCF Score': mean_total_score,
@@ -37,7 +44,7 @@ def GCF_save_results_to_csv(df, output_file_path):
     Save the processed results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Save the summarized statistics to CSV
 def GCF_save_summary_to_csv(summary, output_file_path):
@@ -48,7 +55,7 @@ def GCF_save_summary_to_csv(summary, output_file_path):
     summary_df = pd.concat([summary_df])
 
     summary_df.to_csv(output_file_path, index=False)
-    print(f"Summary saved to {output_file_path}.")
+    logger.info(f"Summary saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -57,13 +64,14 @@ def main(df):
 
     if df is not None:
         # Summarize results
-        df = GCF_calculate_scores(df)
+        scores = GCF_calculate_scores(df)
 
 
-        summary = GCF_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = GCF_summarize_results(scores)
 
         # Save individual scores to CSV
-        # GCF_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # GCF_save_results_to_csv(scores, output_file_path)  # Disabled for package use
 
         # Save summarized results to CSV
         # GCF_save_summary_to_csv(summary,summary_output_file_path)  # Disabled for package use
@@ -73,7 +81,7 @@ def main(df):
             'GCF_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
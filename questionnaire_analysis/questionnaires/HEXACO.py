@@ -1,5 +1,9 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 # Calculate HEXACO subscale scores
 def HEXACO_calculate_scores(df):
@@ -13,6 +17,7 @@ def HEXACO_calculate_scores(df):
     - Conscientiousness
     - Openness to Experience
     Reverse scoring is applied where necessary.
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     
     # Reverse-scored items for each subscale
@@ -23,37 +28,27 @@ def HEXACO_calculate_scores(df):
     reverse_conscientiousness = [5, 14]  # Example reverse items for Conscientiousness
     reverse_openness = [7, 19]  # Example reverse items for Openness
 
-    # Apply reverse scoring for relevant items
-    for item in reverse_honesty_humility:
-        df[f'HEXACO_{item:02d}'] = 6 - df[f'HEXACO_{item:02d}']  # Assuming a 1-5 scale, reverse scoring is 6 - original response
-    
-    for item in reverse_emotionality:
-        df[f'HEXACO_{item:02d}'] = 6 - df[f'HEXACO_{item:02d}']
-
-    for item in reverse_extraversion:
-        df[f'HEXACO_{item:02d}'] = 6 - df[f'HEXACO_{item:02d}']
-
-    for item in reverse_agreeableness:
-        df[f'HEXACO_{item:02d}'] = 6 - df[f'HEXACO_{item:02d}']
-
-    for item in reverse_conscientiousness:
-        df[f'HEXACO_{item:02d}'] = 6 - df[f'HEXACO_{item:02d}']
+    reverse_items = [
+        f'HEXACO_{item:02d}'
+        for item in (reverse_honesty_humility + reverse_emotionality + reverse_extraversion +
+                     reverse_agreeableness + reverse_conscientiousness + reverse_openness)
+    ]
 
-    for item in reverse_openness:
-        df[f'HEXACO_{item:02d}'] = 6 - df[f'HEXACO_{item:02d}']
+    def items(columns):
+        # Apply reverse scoring while reading the items: assuming a 1-5 scale, reverse scoring is 6 - original response
+        return pd.DataFrame({item: 6 - df[item] if item in reverse_items else df[item] for item in columns})
 
     # Calculate all subscale scores at once to avoid fragmentation
     hexaco_scores = {
-        'HEXACO_Honesty_Humility': df[['HEXACO_01', 'HEXACO_04', 'HEXACO_09', 'HEXACO_16', 'HEXACO_24']].mean(axis=1),
-        'HEXACO_Emotionality': df[['HEXACO_02', 'HEXACO_10', 'HEXACO_18', 'HEXACO_22', 'HEXACO_30']].mean(axis=1),
-        'HEXACO_Extraversion': df[['HEXACO_03', 'HEXACO_12', 'HEXACO_15', 'HEXACO_27', 'HEXACO_36']].mean(axis=1),
-        'HEXACO_Agreeableness': df[['HEXACO_05', 'HEXACO_14', 'HEXACO_18', 'HEXACO_26', 'HEXACO_31']].mean(axis=1),
-        'HEXACO_Conscientiousness': df[['HEXACO_06', 'HEXACO_11', 'HEXACO_17', 'HEXACO_21', 'HEXACO_25']].mean(axis=1),
-        'HEXACO_Openness': df[['HEXACO_07', 'HEXACO_13', 'HEXACO_19', 'HEXACO_23', 'HEXACO_28']].mean(axis=1)
+        'HEXACO_Honesty_Humility': items(['HEXACO_01', 'HEXACO_04', 'HEXACO_09', 'HEXACO_16', 'HEXACO_24']).mean(axis=1),
+        'HEXACO_Emotionality': items(['HEXACO_02', 'HEXACO_10', 'HEXACO_18', 'HEXACO_22', 'HEXACO_30']).mean(axis=1),
+        'HEXACO_Extraversion': items(['HEXACO_03', 'HEXACO_12', 'HEXACO_15', 'HEXACO_27', 'HEXACO_36']).mean(axis=1),
+        'HEXACO_Agreeableness': items(['HEXACO_05', 'HEXACO_14', 'HEXACO_18', 'HEXACO_26', 'HEXACO_31']).mean(axis=1),
+        'HEXACO_Conscientiousness': items(['HEXACO_06', 'HEXACO_11', 'HEXACO_17', 'HEXACO_21', 'HEXACO_25']).mean(axis=1),
+        'HEXACO_Openness': items(['HEXACO_07', 'HEXACO_13', 'HEXACO_19', 'HEXACO_23', 'HEXACO_28']).mean(axis=1)
     }
-    df = df.assign(**hexaco_scores)
 
-    return df
+    return pd.DataFrame(hexaco_scores, index=df.index)
 
 # Summarize results
 def HEXACO_summarize_results(df):
@@ -65,9 +60,9 @@ def HEXACO_summarize_results(df):
     std_scores = df[['HEXACO_Honesty_Humility', 'HEXACO_Emotionality', 'HEXACO_Extraversion', 
                      'HEXACO_Agreeableness', 'HEXACO_Conscientiousness', 'HEXACO_Openness']].std()
 
-    print("\nSummary of HEXACO Scores:")
-    print(df[['HEXACO_Honesty_Humility', 'HEXACO_Emotionality', 'HEXACO_Extraversion', 
-              'HEXACO_Agreeableness', 'HEXACO_Conscientiousness', 'HEXACO_Openness']])
+    logger.debug("\nSummary of HEXACO Scores:")
+    logger.debug(df[['HEXACO_Honesty_Humility', 'HEXACO_Emotionality', 'HEXACO_Extraversion', 
+                     'HEXACO_Agreeableness', 'HEXACO_Conscientiousness', 'HEXACO_Openness']])
     
     return {
         'Mean Honesty-Humility': mean_scores['HEXACO_Honesty_Humility'],
@@ -87,7 +82,7 @@ def HEXACO_summarize_results(df):
 # Save the results to CSV
 def HEXACO_save_results_to_csv(df, output_file_path):
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -95,13 +90,14 @@ def main(df):
 
     if df is not None:
         # Calculate HEXACO subscale scores
-        df = HEXACO_calculate_scores(df)
+        scores = HEXACO_calculate_scores(df)
 
         # Summarize results
-        summary = HEXACO_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = HEXACO_summarize_results(scores)
 
         # Save individual scores to CSV
-        # HEXACO_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # HEXACO_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -113,7 +109,7 @@ def main(df):
             'HEXACO_Openness'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,5 +1,9 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 # Calculate IPPA scores
 def IPPA_calculate_scores(df):
@@ -11,31 +15,29 @@ def IPPA_calculate_scores(df):
     - Alienation
     There are separate scores for Parents (Mother, Father) and Peers.
     Reverse scoring is applied where needed.
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     # Reverse-scored items for parent and peer sections
     reverse_parent = ['IPPA_03', 'IPPA_10', 'IPPA_14', 'IPPA_23']
     reverse_peer = ['IPPA_04', 'IPPA_09', 'IPPA_11', 'IPPA_18', 'IPPA_22']
 
-    # Reverse scoring for parent items
-    for item in reverse_parent:
-        df[item] = 6 - df[item]  # Assuming 1-5 Likert scale
+    reverse_items = reverse_parent + reverse_peer
 
-    # Reverse scoring for peer items
-    for item in reverse_peer:
-        df[item] = 6 - df[item]
+    def items(columns):
+        # Apply reverse scoring for parent and peer items while reading them (assuming 1-5 Likert scale)
+        return pd.DataFrame({item: 6 - df[item] if item in reverse_items else df[item] for item in columns})
 
     # Calculate all attachment scores at once to avoid fragmentation
     ippa_scores = {
-        'IPPA_Parent_Trust': df[['IPPA_01', 'IPPA_02', 'IPPA_04', 'IPPA_13', 'IPPA_21']].mean(axis=1),
-        'IPPA_Parent_Communication': df[['IPPA_05', 'IPPA_07', 'IPPA_15', 'IPPA_17']].mean(axis=1),
-        'IPPA_Parent_Alienation': df[['IPPA_09', 'IPPA_18']].mean(axis=1),
-        'IPPA_Peer_Trust': df[['IPPA_06', 'IPPA_08', 'IPPA_12', 'IPPA_13']].mean(axis=1),
-        'IPPA_Peer_Communication': df[['IPPA_01', 'IPPA_02', 'IPPA_07']].mean(axis=1),
-        'IPPA_Peer_Alienation': df[['IPPA_09', 'IPPA_11', 'IPPA_18']].mean(axis=1)
+        'IPPA_Parent_Trust': items(['IPPA_01', 'IPPA_02', 'IPPA_04', 'IPPA_13', 'IPPA_21']).mean(axis=1),
+        'IPPA_Parent_Communication': items(['IPPA_05', 'IPPA_07', 'IPPA_15', 'IPPA_17']).mean(axis=1),
+        'IPPA_Parent_Alienation': items(['IPPA_09', 'IPPA_18']).mean(axis=1),
+        'IPPA_Peer_Trust': items(['IPPA_06', 'IPPA_08', 'IPPA_12', 'IPPA_13']).mean(axis=1),
+        'IPPA_Peer_Communication': items(['IPPA_01', 'IPPA_02', 'IPPA_07']).mean(axis=1),
+        'IPPA_Peer_Alienation': items(['IPPA_09', 'IPPA_11', 'IPPA_18']).mean(axis=1)
     }
-    df = df.assign(**ippa_scores)
 
-    return df
+    return pd.DataFrame(ippa_scores, index=df.index)
 
 # Summarize results
 def IPPA_summarize_results(df):
@@ -47,9 +49,9 @@ def IPPA_summarize_results(df):
     std_scores = df[['IPPA_Parent_Trust', 'IPPA_Parent_Communication', 'IPPA_Parent_Alienation',
                      'IPPA_Peer_Trust', 'IPPA_Peer_Communication', 'IPPA_Peer_Alienation']].std()
 
-    print("\nSummary of IPPA Scores:")
-    print(df[['IPPA_Parent_Trust', 'IPPA_Parent_Communication', 'IPPA_Parent_Alienation',
-              'IPPA_Peer_Trust', 'IPPA_Peer_Communication', 'IPPA_Peer_Alienation']])
+    logger.debug("\nSummary of IPPA Scores:")
+    logger.debug(df[['IPPA_Parent_Trust', 'IPPA_Parent_Communication', 'IPPA_Parent_Alienation',
+                     'IPPA_Peer_Trust', 'IPPA_Peer_Communication', 'IPPA_Peer_Alienation']])
 
     return {
         'Mean Parent Trust': mean_scores['IPPA_Parent_Trust'],
@@ -69,7 +71,7 @@ def IPPA_summarize_results(df):
 # Save the results to CSV
 def IPPA_save_results_to_csv(df, output_file_path):
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -79,10 +81,11 @@ def main(df):
     
     if df is not None:
         # Calculate IPPA subscale scores
-        df = IPPA_calculate_scores(df)
+        scores = IPPA_calculate_scores(df)
 
         # Summarize results
-        summary = IPPA_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = IPPA_summarize_results(scores)
 
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -94,7 +97,7 @@ def main(df):
             'IPPA_Peer_Alienation'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 if __name__ == "__main__":
     main()
@@ -1,5 +1,9 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 
 # Calculate total and subscale scores
@@ -11,16 +15,18 @@ def IRQ_calculate_scores(df):
     - Negative-Efficacy (IRQ-NE)
     - Positive-Tendency (IRQ-PT)
     - Positive-Efficacy (IRQ-PE)
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
-    df['IRQ_NT_Score'] = df[['IRQ_01', 'IRQ_02', 'IRQ_03', 'IRQ_04']].sum(axis=1)
-    df['IRQ_NE_Score'] = df[['IRQ_05', 'IRQ_06', 'IRQ_07', 'IRQ_08']].sum(axis=1)
-    df['IRQ_PT_Score'] = df[['IRQ_09', 'IRQ_10', 'IRQ_11', 'IRQ_12']].sum(axis=1)
-    df['IRQ_PE_Score'] = df[['IRQ_13', 'IRQ_14', 'IRQ_15', 'IRQ_16']].sum(axis=1)
+    scores = pd.DataFrame(index=df.index)
+    scores['IRQ_NT_Score'] = df[['IRQ_01', 'IRQ_02', 'IRQ_03', 'IRQ_04']].sum(axis=1)
+    scores['IRQ_NE_Score'] = df[['IRQ_05', 'IRQ_06', 'IRQ_07', 'IRQ_08']].sum(axis=1)
+    scores['IRQ_PT_Score'] = df[['IRQ_09', 'IRQ_10', 'IRQ_11', 'IRQ_12']].sum(axis=1)
+    scores['IRQ_PE_Score'] = df[['IRQ_13', 'IRQ_14', 'IRQ_15', 'IRQ_16']].sum(axis=1)
     
     # Total score is the sum of all subscales
-    df['IRQ_Total_Score'] = df[['IRQ_NT_Score', 'IRQ_NE_Score', 'IRQ_PT_Score', 'IRQ_PE_Score']].sum(axis=1)
+    scores['IRQ_Total_Score'] = scores[['IRQ_NT_Score', 'IRQ_NE_Score', 'IRQ_PT_Score', 'IRQ_PE_Score']].sum(axis=1)
     
-    return df
+    return scores
 
 # Summarize results
 def IRQ_summarize_results(df):
@@ -30,14 +36,14 @@ def IRQ_summarize_results(df):
     mean_scores = df[['IRQ_NT_Score', 'IRQ_NE_Score', 'IRQ_PT_Score', 'IRQ_PE_Score', 'IRQ_Total_Score']].mean()
     std_scores = df[['IRQ_NT_Score', 'IRQ_NE_Score', 'IRQ_PT_Score', 'IRQ_PE_Score', 'IRQ_Total_Score']].std()
 
-    print("\nSummary of IRQ Scores:")
-    print(df[['IRQ_NT_Score', 'IRQ_NE_Score', 'IRQ_PT_Score', 'IRQ_PE_Score', 'IRQ_Total_Score']])
+    logger.debug("\nSummary of IRQ Scores:")
+    logger.debug(df[['IRQ_NT_Score', 'IRQ_NE_Score', 'IRQ_PT_Score', 'IRQ_PE_Score', 'IRQ_Total_Score']])
 
-    print(f"\nMean IRQ Negative-Tendency: {mean_scores['IRQ_NT_Score']:.2f}")
-    print(f"Mean IRQ Negative-Efficacy: {mean_scores['IRQ_NE_Score']:.2f}")
-    print(f"Mean IRQ Positive-Tendency: {mean_scores['IRQ_PT_Score']:.2f}")
-    print(f"Mean IRQ Positive-Efficacy: {mean_scores['IRQ_PE_Score']:.2f}")
-    print(f"Mean IRQ Total Score: {mean_scores['IRQ_Total_Score']:.2f}")
+    logger.debug(f"\nMean IRQ Negative-Tendency: {mean_scores['IRQ_NT_Score']:.2f}")
+    logger.debug(f"Mean IRQ Negative-Efficacy: {mean_scores['IRQ_NE_Score']:.2f}")
+    logger.debug(f"Mean IRQ Positive-Tendency: {mean_scores['IRQ_PT_Score']:.2f}")
+    logger.debug(f"Mean IRQ Positive-Efficacy: {mean_scores['IRQ_PE_Score']:.2f}")
+    logger.debug(f"Mean IRQ Total Score: {mean_scores['IRQ_Total_Score']:.2f}")
     
     return {
         'Mean IRQ Negative-Tendency': mean_scores['IRQ_NT_Score'],
@@ -58,7 +64,7 @@ def IRQ_save_results_to_csv(df, output_file_path):
     Save the processed results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -68,13 +74,14 @@ def main(df):
 
     if df is not None:
         # Calculate IRQ subscale and total scores
-        df = IRQ_calculate_scores(df)
+        scores = IRQ_calculate_scores(df)
 
         # Summarize results
-        summary = IRQ_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = IRQ_summarize_results(scores)
 
         # Save individual scores to CSV
-        # IRQ_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # IRQ_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -85,7 +92,7 @@ def main(df):
             'IRQ_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,5 +1,9 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 
 # Reverse scoring for specific items
@@ -7,10 +11,9 @@ def LOTR_reverse_score(df, items):
     """
     Reverse scores the specified items for the LOT-R.
     Original scale is 0-4, where reverse scoring is calculated as 4 - original response.
+    Returns the reversed items as a new DataFrame; the input is left unchanged.
     """
-    for item in items:
-        df[f'LOTR_{item:02d}'] = 4 - df[f'LOTR_{item:02d}']
-    return df
+    return pd.DataFrame({f'LOTR_{item:02d}': 4 - df[f'LOTR_{item:02d}'] for item in items})
 
 # Calculate LOT-R total score
 def LOTR_calculate_score(df):
@@ -18,16 +21,21 @@ def LOTR_calculate_score(df):
     Calculate the total score for the LOT-R based on the scoring rules.
     Sum items 1, 3, 4, 7, 9, and 10 after reverse scoring items 3, 7, and 9.
     Items 2, 5, 6, and 8 are filler items and are not included in the score.
+    Returns a new DataFrame holding the score; the input is left unchanged.
     """
     # Reverse score items 3, 7, and 9
     reverse_items = [3, 7, 9]
-    df = LOTR_reverse_score(df, reverse_items)
+    reversed_items = LOTR_reverse_score(df, reverse_items)
     
-    # Calculate total score by summing specified items to avoid DataFrame fragmentation
+    # Calculate total score by summing specified items, taking reversed items from the reversed frame
     score_items = ['LOTR_01', 'LOTR_03', 'LOTR_04', 'LOTR_07', 'LOTR_09', 'LOTR_10']
-    df = df.assign(LOTR_Total_Score=df[score_items].sum(axis=1))
+    items = pd.DataFrame({
+        item: reversed_items[item] if item in reversed_items.columns else df[item] for item in score_items
+    })
+    scores = pd.DataFrame(index=df.index)
+    scores['LOTR_Total_Score'] = items.sum(axis=1)
     
-    return df
+    return scores
 
 # Summarize results
 def LOTR_summarize_results(df):
@@ -37,11 +45,11 @@ def LOTR_summarize_results(df):
     mean_score = df['LOTR_Total_Score'].mean()
     std_score = df['LOTR_Total_Score'].std()
 
-    print("\nSummary of LOT-R Scores:")
-    print(df[['LOTR_Total_Score']])
+    logger.debug("\nSummary of LOT-R Scores:")
+    logger.debug(df[['LOTR_Total_Score']])
 
-    print(f"\nMean LOT-R Total Score: {mean_score:.2f}")
-    print(f"Standard Deviation of LOT-R Total Score: {std_score:.2f}")
+    logger.debug(f"\nMean LOT-R Total Score: {mean_score:.2f}")
+    logger.debug(f"Standard Deviation of LOT-R Total Score: {std_score:.2f}")
     
     return {
         'Mean LOT-R Total Score': mean_score,
@@ -54,7 +62,7 @@ def LOTR_save_results_to_csv(df, output_file_path):
     Save the processed LOT-R results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -63,20 +71,21 @@ def main(df):
 
     if df is not None:
         # Calculate LOT-R total score
-        df = LOTR_calculate_score(df)
+        scores = LOTR_calculate_score(df)
 
         # Summarize results
-        summary = LOTR_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = LOTR_summarize_results(scores)
 
         # Save results to CSV
-        # LOTR_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # LOTR_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
             'LOTR_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,5 +1,9 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 # Define subscales
 general_distress_items = [2, 3, 7, 12, 13, 17, 20, 21]  # General Distress (GD)
 anxious_arousal_items = [4, 6, 8, 10, 14, 16, 18, 22, 24, 2, 3, 7, 12, 13, 17, 20, 21, 26]  # Anxious Arousal (AA)
@@ -10,11 +14,10 @@ anhedonic_depression_reverse_items = [1, 9, 15, 19, 23, 25]  # Anhedonic Depress
 def MASQ_calculate_mean(df, items, label):
     """
     Calculate the mean score for a given list of item numbers.
+    Returns a new DataFrame holding the score as `label`; the input is left unchanged.
     """
     item_columns = [f'MASQ_{item:02d}' for item in items]
-    mean_score = df[item_columns].mean(axis=1)
-    df[label] = mean_score
-    return df
+    return pd.DataFrame({label: df[item_columns].mean(axis=1)}, index=df.index)
 
 # Process the data to calculate subscale scores
 def MASQ_process_data(df):
@@ -24,6 +27,7 @@ def MASQ_process_data(df):
     - General Distress (GD)
     - Anxious Arousal (AA)
     - Anhedonic Depression (AD)
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     # Calculate all scores at once to avoid fragmentation
     
@@ -44,14 +48,13 @@ def MASQ_process_data(df):
     # Combine forward and reverse scored items for AD
     ad_all_items = pd.concat([df[masq_ad_forward_columns], ad_reverse_scored], axis=1)
     
-    masq_scores = {
+    scores = pd.DataFrame({
         'MASQ_General_Distress_Score': df[masq_gd_columns].mean(axis=1),
         'MASQ_Anxious_Arousal_Score': df[masq_aa_columns].mean(axis=1),
         'MASQ_Anhedonic_Depression_Score': ad_all_items.mean(axis=1)
-    }
-    df = df.assign(**masq_scores)
-    df['MASQ_Overall_Score'] = df[['MASQ_General_Distress_Score', 'MASQ_Anxious_Arousal_Score', 'MASQ_Anhedonic_Depression_Score']].mean(axis=1)
-    return df
+    }, index=df.index)
+    scores['MASQ_Overall_Score'] = scores[['MASQ_General_Distress_Score', 'MASQ_Anxious_Arousal_Score', 'MASQ_Anhedonic_Depression_Score']].mean(axis=1)
+    return scores
 
 # Summarize results
 def MASQ_summarize_results(df):
@@ -61,8 +64,8 @@ def MASQ_summarize_results(df):
     mean_scores = df[['MASQ_General_Distress_Score', 'MASQ_Anxious_Arousal_Score', 'MASQ_Anhedonic_Depression_Score', 'MASQ_Overall_Score']].mean()
     std_scores = df[['MASQ_General_Distress_Score', 'MASQ_Anxious_Arousal_Score', 'MASQ_Anhedonic_Depression_Score', 'MASQ_Overall_Score']].std()
 
-    print("\nSummary of MINI-MASQ Scores:")
-    print(df[['MASQ_General_Distress_Score', 'MASQ_Anxious_Arousal_Score', 'MASQ_Anhedonic_Depression_Score', 'MASQ_Overall_Score']])
+    logger.debug("\nSummary of MINI-MASQ Scores:")
+    logger.debug(df[['MASQ_General_Distress_Score', 'MASQ_Anxious_Arousal_Score', 'MASQ_Anhedonic_Depression_Score', 'MASQ_Overall_Score']])
 
     return {
         'Mean General Distress Score': mean_scores['MASQ_General_Distress_Score'],
@@ -81,7 +84,7 @@ def MASQ_save_results_to_csv(df, output_file_path):
     Save the processed results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -90,13 +93,14 @@ def main(df):
 
     if df is not None:
         # Process the data to calculate subscale and overall scores
-        df = MASQ_process_data(df)
+        scores = MASQ_process_data(df)
 
         # Summarize results
-        summary = MASQ_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = MASQ_summarize_results(scores)
 
         # Save results to CSV
-        # MASQ_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # MASQ_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -106,7 +110,7 @@ def main(df):
             'MASQ_Overall_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
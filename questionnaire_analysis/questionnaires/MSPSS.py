@@ -1,5 +1,9 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 # Calculating MSPSS scores
 def MSPSS_calculate_scores(df):
     """
@@ -8,23 +12,25 @@ def MSPSS_calculate_scores(df):
     - Family
     - Friends
     - Significant Others
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
-    df['MSPSS_Family_Score'] = df[['MSPSS_03', 'MSPSS_04', 'MSPSS_08', 'MSPSS_11']].mean(axis=1)
-    df['MSPSS_Friends_Score'] = df[['MSPSS_06', 'MSPSS_07', 'MSPSS_09', 'MSPSS_12']].mean(axis=1)
-    df['MSPSS_Significant_Others_Score'] = df[['MSPSS_01', 'MSPSS_02', 'MSPSS_05', 'MSPSS_10']].mean(axis=1)
+    scores = pd.DataFrame(index=df.index)
+    scores['MSPSS_Family_Score'] = df[['MSPSS_03', 'MSPSS_04', 'MSPSS_08', 'MSPSS_11']].mean(axis=1)
+    scores['MSPSS_Friends_Score'] = df[['MSPSS_06', 'MSPSS_07', 'MSPSS_09', 'MSPSS_12']].mean(axis=1)
+    scores['MSPSS_Significant_Others_Score'] = df[['MSPSS_01', 'MSPSS_02', 'MSPSS_05', 'MSPSS_10']].mean(axis=1)
     
     # Total MSPSS score
-    df['MSPSS_Total_Score'] = df[['MSPSS_Family_Score', 'MSPSS_Friends_Score', 'MSPSS_Significant_Others_Score']].mean(axis=1)
+    scores['MSPSS_Total_Score'] = scores[['MSPSS_Family_Score', 'MSPSS_Friends_Score', 'MSPSS_Significant_Others_Score']].mean(axis=1)
     
-    return df
+    return scores
 
 # Summarize results
 def MSPSS_summarize_results(df):
     mean_scores = df[['MSPSS_Family_Score', 'MSPSS_Friends_Score', 'MSPSS_Significant_Others_Score', 'MSPSS_Total_Score']].mean()
     std_scores = df[['MSPSS_Family_Score', 'MSPSS_Friends_Score', 'MSPSS_Significant_Others_Score', 'MSPSS_Total_Score']].std()
 
-    print("\nSummary of MSPSS Scores:")
-    print(df[['MSPSS_Family_Score', 'MSPSS_Friends_Score', 'MSPSS_Significant_Others_Score', 'MSPSS_Total_Score']])
+    logger.debug("\nSummary of MSPSS Scores:")
+    logger.debug(df[['MSPSS_Family_Score', 'MSPSS_Friends_Score', 'MSPSS_Significant_Others_Score', 'MSPSS_Total_Score']])
     
     return {
         'Mean Family Score': mean_scores['MSPSS_Family_Score'],
@@ -40,7 +46,7 @@ def MSPSS_summarize_results(df):
 # Save the results to CSV
 def MSPSS_save_results_to_csv(df, output_file_path):
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function
 def main(df):
@@ -49,13 +55,14 @@ def main(df):
     
     if df is not None:
         # Calculate MSPSS scores
-        df = MSPSS_calculate_scores(df)
+        scores = MSPSS_calculate_scores(df)
 
         # Summarize results
-        summary = MSPSS_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = MSPSS_summarize_results(scores)
 
         # Save individual scores to CSV
-        # MSPSS_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # MSPSS_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -65,7 +72,7 @@ def main(df):
             'MSPSS_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
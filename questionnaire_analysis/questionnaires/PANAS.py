@@ -1,5 +1,9 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 
 # Calculate Positive and Negative Affect Scores
@@ -8,14 +12,16 @@ def PANAS_calculate_affect_scores(df):
     Calculate the Positive and Negative Affect scores for the PANAS-SF.
     Positive Affect: Items PANAS_01, PANAS_03, PANAS_05, PANAS_09, PANAS_10, PANAS_12, PANAS_14, PANAS_16, PANAS_17, PANAS_19
     Negative Affect: Items PANAS_02, PANAS_04, PANAS_06, PANAS_07, PANAS_08, PANAS_11, PANAS_13, PANAS_15, PANAS_18, PANAS_20
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     positive_items = ['PANAS_01', 'PANAS_03', 'PANAS_05', 'PANAS_09', 'PANAS_10', 'PANAS_12', 'PANAS_14', 'PANAS_16', 'PANAS_17', 'PANAS_19']
     negative_items = ['PANAS_02', 'PANAS_04', 'PANAS_06', 'PANAS_07', 'PANAS_08', 'PANAS_11', 'PANAS_13', 'PANAS_15', 'PANAS_18', 'PANAS_20']
     
-    df['PANAS_Positive_Affect_Score'] = df[positive_items].sum(axis=1)
-    df['PANAS_Negative_Affect_Score'] = df[negative_items].sum(axis=1)
+    scores = pd.DataFrame(index=df.index)
+    scores['PANAS_Positive_Affect_Score'] = df[positive_items].sum(axis=1)
+    scores['PANAS_Negative_Affect_Score'] = df[negative_items].sum(axis=1)
     
-    return df
+    return scores
 
 # Summarize results
 def PANAS_summarize_results(df):
@@ -25,11 +31,11 @@ def PANAS_summarize_results(df):
     mean_scores = df[['PANAS_Positive_Affect_Score', 'PANAS_Negative_Affect_Score']].mean()
     std_scores = df[['PANAS_Positive_Affect_Score', 'PANAS_Negative_Affect_Score']].std()
 
-    print("\nSummary of PANAS-SF Scores:")
-    print(df[['PANAS_Positive_Affect_Score', 'PANAS_Negative_Affect_Score']])
+    logger.debug("\nSummary of PANAS-SF Scores:")
+    logger.debug(df[['PANAS_Positive_Affect_Score', 'PANAS_Negative_Affect_Score']])
 
-    print(f"\nMean Positive Affect Score: {mean_scores['PANAS_Positive_Affect_Score']:.2f}")
-    print(f"Mean Negative Affect Score: {mean_scores['PANAS_Negative_Affect_Score']:.2f}")
+    logger.debug(f"\nMean Positive Affect Score: {mean_scores['PANAS_Positive_Affect_Score']:.2f}")
+    logger.debug(f"Mean Negative Affect Score: {mean_scores['PANAS_Negative_Affect_Score']:.2f}")
 
     return {
         'Mean Positive Affect Score': mean_scores['PANAS_Positive_Affect_Score'],
@@ -45,7 +51,7 @@ def PANAS_save_results_to_csv(df, output_file_path):
     Save the processed results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -53,13 +59,14 @@ def main(df):
 
     if df is not None:
         # Calculate Positive and Negative Affect Scores
-        df = PANAS_calculate_affect_scores(df)
+        scores = PANAS_calculate_affect_scores(df)
 
         # Summarize results
-        summary = PANAS_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = PANAS_summarize_results(scores)
 
         # Save results to CSV
-        # PANAS_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # PANAS_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -67,7 +74,7 @@ def main(df):
             'PANAS_Negative_Affect_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,14 +1,18 @@
+import logging
+
 import pandas as pd
 
+from questionnaire_analysis.coercion import numeric_items
+
+logger = logging.getLogger(__name__)
+
 
 # Calculate mean scores for the given subscale
 def PMERQ_calculate_subscale_mean(df, items):
     """
     Calculate the average score for each subscale based on the item numbers.
     """
-    subscale_items = [item for item in items]
-    numeric_df = df[subscale_items].apply(pd.to_numeric, errors='coerce')
-    return numeric_df.mean(axis=1)
+    return numeric_items(df, items).mean(axis=1)
 
 # Define subscales based on the PMERQ questionnaire
 subscales = {
@@ -28,18 +32,19 @@ subscales = {
 def PMERQ_calculate_subscale_scores(df):
     """
     Calculate the mean score for each subscale in the PMERQ.
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     # Calculate all subscale scores at once to avoid fragmentation
     new_columns = {}
     for subscale, items in subscales.items():
         new_columns[f'PMERQ_{subscale}'] = PMERQ_calculate_subscale_mean(df, items)
-    df = df.assign(**new_columns)
-    return df
+    return pd.DataFrame(new_columns, index=df.index)
 
 # Summarize the overall engagement and disengagement scores
 def PMERQ_summarize_engagement_disengagement(df):
     """
-    Summarize the engagement and disengagement orientation scores.
+    Summarize the engagement and disengagement orientation scores from the subscale scores.
+    Returns a new DataFrame holding the two orientation scores.
     """
     engagement_columns = [
         'PMERQ_Engagement_Situation_Selection', 'PMERQ_Engagement_Situation_Modification', 
@@ -53,16 +58,16 @@ def PMERQ_summarize_engagement_disengagement(df):
     ]
     
     # Calculate engagement/disengagement scores at once
-    summary_scores = {
+    summary_scores = pd.DataFrame({
         'PMERQ_Engagement_Score': df[engagement_columns].mean(axis=1),
         'PMERQ_Disengagement_Score': df[disengagement_columns].mean(axis=1)
-    }
-    df = df.assign(**summary_scores)
+    }, index=df.index)
     
-    print("\nSummary of Engagement and Disengagement Scores:")
-    print(df[['PMERQ_Engagement_Score', 'PMERQ_Disengagement_Score']])
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\nSummary of Engagement and Disengagement Scores:")
+        logger.debug(summary_scores)
     
-    return df
+    return summary_scores
 
 
 # Save the results to CSV
@@ -71,7 +76,7 @@ def PMERQ_save_results_to_csv(df, output_file_path):
     Save the processed results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 
 # Main function to execute the steps
@@ -80,13 +85,13 @@ def main(df):
 
     if df is not None:
         # Calculate subscale scores
-        df = PMERQ_calculate_subscale_scores(df)
+        subscale_scores = PMERQ_calculate_subscale_scores(df)
 
         # Summarize engagement and disengagement scores
-        df = PMERQ_summarize_engagement_disengagement(df)
+        scores = PMERQ_summarize_engagement_disengagement(subscale_scores)
 
         # Save results to CSV
-        #PMERQ_save_results_to_csv(df, output_file_path)
+        #PMERQ_save_results_to_csv(scores, output_file_path)
         
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -94,7 +99,7 @@ def main(df):
             'PMERQ_Disengagement_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,13 +1,17 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 def PSS_reverse_scores(df, reverse_columns):
     """
     Reverse the scores for specific columns.
+    Returns the PSS items with the reversed values as a new DataFrame; the input is left unchanged.
     """
-    for col in reverse_columns:
-        df[col] = 4 - df[col]
-    return df
+    pss_columns = [f'PSS_{i:02d}' for i in range(1, 15)]
+    return pd.DataFrame({col: 4 - df[col] if col in reverse_columns else df[col] for col in pss_columns})
 
 def PSS_calculate_pss_score(row):
     """
@@ -46,8 +50,8 @@ def PSS_calculate_subgroup_means(df):
     mean_anxiety_score = df[anxiety_columns].mean().mean()
     mean_stress_score = df[stress_columns].mean().mean()
     
-    print(f"Mean Anxiety Score: {mean_anxiety_score:.2f}")
-    print(f"Mean Stress Score: {mean_stress_score:.2f}")
+    logger.debug(f"Mean Anxiety Score: {mean_anxiety_score:.2f}")
+    logger.debug(f"Mean Stress Score: {mean_stress_score:.2f}")
 
     return mean_anxiety_score, mean_stress_score
 
@@ -61,7 +65,7 @@ def PSS_calculate_overall_mean(df):
     ]
     
     overall_mean_score = df[pss_columns].mean().mean()
-    print(f"Overall Mean PSS Score: {overall_mean_score:.2f}")
+    logger.debug(f"Overall Mean PSS Score: {overall_mean_score:.2f}")
     
     return overall_mean_score
 
@@ -83,8 +87,9 @@ def PSS_calculate_individual_scores(df):
     }
     df = df.assign(**all_changes)
     
-    print("\nIndividual Scores for Each Subcategory:")
-    print(df[['PSS_Anxiety_Score', 'PSS_Stress_Score']])
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\nIndividual Scores for Each Subcategory:")
+        logger.debug(df[['PSS_Anxiety_Score', 'PSS_Stress_Score']])
     
     return df
 
@@ -101,9 +106,9 @@ def PSS_summarize_scores(df):
         'Overall Mean PSS Score': overall_mean_score
     }
     
-    print("\nSummary of Scores:")
+    logger.debug("\nSummary of Scores:")
     for key, value in summary.items():
-        print(f"{key}: {value:.2f}")
+        logger.debug(f"{key}: {value:.2f}")
 
     return summary
 
@@ -111,32 +116,34 @@ def PSS_process_pss(df):
     """
     Process each row in the DataFrame to calculate PSS scores, stress levels,
     mean scores for subgroups, and overall mean score.
+    Works on a separate frame of the PSS items; the input is left unchanged.
     """
     # Reverse the necessary scores for PSS questions
     reverse_columns = ['PSS_04', 'PSS_05', 'PSS_06', 'PSS_07', 'PSS_09', 'PSS_10', 'PSS_13']
-    df = PSS_reverse_scores(df, reverse_columns)
+    items = PSS_reverse_scores(df, reverse_columns)
     
     # Calculate PSS score and determine stress level at once to avoid DataFrame fragmentation
     all_changes = {
-        'PSS_Total_Score': df.apply(PSS_calculate_pss_score, axis=1)
+        'PSS_Total_Score': items.apply(PSS_calculate_pss_score, axis=1)
     }
-    df = df.assign(**all_changes)
-    df = df.assign(PSS_Stress_Level=df['PSS_Total_Score'].apply(PSS_determine_stress_level))
+    items = items.assign(**all_changes)
+    items = items.assign(PSS_Stress_Level=items['PSS_Total_Score'].apply(PSS_determine_stress_level))
     
     # Calculate individual scores
-    df = PSS_calculate_individual_scores(df)
+    items = PSS_calculate_individual_scores(items)
     
-    # Summarize scores
-    PSS_summarize_scores(df)
+    # Summarize scores (only needed for debug logging)
+    if logger.isEnabledFor(logging.DEBUG):
+        PSS_summarize_scores(items)
     
-    return df
+    return items
 
 def PSS_save_results_to_csv(df, output_file_path):
     """
     Save the results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 def main(df):
     output_file_path = 'processed_survey_results.csv'
@@ -1,4 +1,10 @@
+import logging
+
 import pandas as pd
+
+from questionnaire_analysis.coercion import numeric_items
+
+logger = logging.getLogger(__name__)
 import numpy as np
 
 # Load CSV file
@@ -8,13 +14,13 @@ def RAS_access_csv(file_path):
     """
     try:
         df = pd.read_csv(file_path)
-        print(f"Successfully loaded data from {file_path}")
+        logger.info(f"Successfully loaded data from {file_path}")
         return df
     except FileNotFoundError:
-        print(f"Error: File {file_path} not found.")
+        logger.error(f"Error: File {file_path} not found.")
         return None
     except Exception as e:
-        print(f"Error loading file: {e}")
+        logger.error(f"Error loading file: {e}")
         return None
 
 # Reverse score items 4 and 7
@@ -22,16 +28,19 @@ def RAS_reverse_score(df):
     """
     Reverse score items 4 and 7 for the RAS questionnaire.
     Items 4 and 7 are reverse-scored (1 becomes 5, 2 becomes 4, etc.).
+    Returns the reversed items as a new DataFrame; the input is left unchanged.
     """
+    reversed_items = {}
+
     # Reverse score item 4: "How often do you wish you hadn't gotten into this relationship?"
     if 'RAS_04' in df.columns:
-        df['RAS_04'] = 6 - df['RAS_04']  # Reverse scoring: 1->5, 2->4, 3->3, 4->2, 5->1
+        reversed_items['RAS_04'] = 6 - df['RAS_04']  # Reverse scoring: 1->5, 2->4, 3->3, 4->2, 5->1
     
     # Reverse score item 7: "How many problems are there in your relationship?"
     if 'RAS_07' in df.columns:
-        df['RAS_07'] = 6 - df['RAS_07']  # Reverse scoring: 1->5, 2->4, 3->3, 4->2, 5->1
+        reversed_items['RAS_07'] = 6 - df['RAS_07']  # Reverse scoring: 1->5, 2->4, 3->3, 4->2, 5->1
     
-    return df
+    return pd.DataFrame(reversed_items, index=df.index)
 
 # Calculate RAS total score
 def RAS_calculate_scores(df):
@@ -49,22 +58,23 @@ def RAS_calculate_scores(df):
     
     Scoring: 1-5 scale, items 4 and 7 are reverse-scored
     Total score range: 7-35, higher scores indicate greater relationship satisfaction
+    Returns a new DataFrame holding the score; the input is left unchanged.
     """
     # First reverse score items 4 and 7
-    df = RAS_reverse_score(df)
+    reversed_items = RAS_reverse_score(df)
     
     # Calculate total RAS score by summing all 7 items
     ras_items = ['RAS_01', 'RAS_02', 'RAS_03', 'RAS_04', 'RAS_05', 'RAS_06', 'RAS_07']
     
-    # Ensure all items are numeric
-    for item in ras_items:
-        if item in df.columns:
-            df[item] = pd.to_numeric(df[item], errors='coerce')
+    # Ensure all items are numeric, taking items 4 and 7 in their reversed form
+    items = numeric_items(df, [item for item in ras_items if item in df.columns])
+    items = items.assign(**{item: reversed_items[item] for item in reversed_items.columns if item in items.columns})
     
     # Calculate total score
-    df['RAS_Total_Score'] = df[ras_items].sum(axis=1)
+    scores = pd.DataFrame(index=df.index)
+    scores['RAS_Total_Score'] = items[ras_items].sum(axis=1)
     
-    return df
+    return scores
 
 # Summarize results
 def RAS_summarize_results(df):
@@ -74,13 +84,13 @@ def RAS_summarize_results(df):
     mean_total_score = df['RAS_Total_Score'].mean()
     std_total_score = df['RAS_Total_Score'].std()
 
-    print("\nSummary of Relationship Assessment Scale (RAS) Scores:")
-    print(df[['RAS_Total_Score']])
+    logger.debug("\nSummary of Relationship Assessment Scale (RAS) Scores:")
+    logger.debug(df[['RAS_Total_Score']])
 
-    print(f"\nMean Total RAS Score: {mean_total_score:.2f}")
-    print(f"Standard Deviation of RAS Scores: {std_total_score:.2f}")
-    print(f"Score Range: {df['RAS_Total_Score'].min():.0f} - {df['RAS_Total_Score'].max():.0f}")
-    print("Note: Higher scores indicate greater relationship satisfaction (range: 7-35)")
+    logger.debug(f"\nMean Total RAS Score: {mean_total_score:.2f}")
+    logger.debug(f"Standard Deviation of RAS Scores: {std_total_score:.2f}")
+    logger.debug(f"Score Range: {df['RAS_Total_Score'].min():.0f} - {df['RAS_Total_Score'].max():.0f}")
+    logger.debug("Note: Higher scores indicate greater relationship satisfaction (range: 7-35)")
 
     return {
         'Mean Total RAS Score': mean_total_score,
@@ -96,9 +106,9 @@ def RAS_save_results_to_csv(df, output_file_path):
     """
     try:
         df.to_csv(output_file_path, index=False)
-        print(f"RAS results saved to {output_file_path}")
+        logger.info(f"RAS results saved to {output_file_path}")
     except Exception as e:
-        print(f"Error saving results: {e}")
+        logger.error(f"Error saving results: {e}")
 
 # Main function to execute the steps
 def main(df):
@@ -106,18 +116,19 @@ def main(df):
 
     if df is not None:
         # Calculate RAS total score
-        df = RAS_calculate_scores(df)
+        scores = RAS_calculate_scores(df)
 
         # Summarize results
-        summary = RAS_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = RAS_summarize_results(scores)
 
         # Save results to CSV
-        # RAS_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # RAS_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
             'RAS_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
@@ -1,5 +1,9 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 # Calculate the SD4 subscale scores
 def SD4_calculate_scores(df):
@@ -9,20 +13,20 @@ def SD4_calculate_scores(df):
     Narcissism: mean of items 8-14
     Psychopathy: mean of items 15-21
     Sadism: mean of items 22-28
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     # Calculate all SD4 scores at once to avoid DataFrame fragmentation
-    all_changes = {
+    scores = pd.DataFrame({
         'SD4_Machiavellianism': df[['SD4_01', 'SD4_02', 'SD4_03', 'SD4_04', 'SD4_05', 'SD4_06', 'SD4_07']].mean(axis=1),
         'SD4_Narcissism': df[['SD4_08', 'SD4_09', 'SD4_10', 'SD4_11', 'SD4_12', 'SD4_13', 'SD4_14']].mean(axis=1),
         'SD4_Psychopathy': df[['SD4_15', 'SD4_16', 'SD4_17', 'SD4_18', 'SD4_19', 'SD4_20', 'SD4_21']].mean(axis=1),
         'SD4_Sadism': df[['SD4_22', 'SD4_23', 'SD4_24', 'SD4_25', 'SD4_26', 'SD4_27', 'SD4_28']].mean(axis=1)
-    }
-    df = df.assign(**all_changes)
+    }, index=df.index)
     
     # Calculate total mean score for overall "dark personality"
-    df = df.assign(SD4_Total_Score=df[['SD4_Machiavellianism', 'SD4_Narcissism', 'SD4_Psychopathy', 'SD4_Sadism']].mean(axis=1))
+    scores['SD4_Total_Score'] = scores[['SD4_Machiavellianism', 'SD4_Narcissism', 'SD4_Psychopathy', 'SD4_Sadism']].mean(axis=1)
     
-    return df
+    return scores
 
 # Summarize results
 def SD4_summarize_results(df):
@@ -32,14 +36,14 @@ def SD4_summarize_results(df):
     mean_scores = df[['SD4_Machiavellianism', 'SD4_Narcissism', 'SD4_Psychopathy', 'SD4_Sadism', 'SD4_Total_Score']].mean()
     std_scores = df[['SD4_Machiavellianism', 'SD4_Narcissism', 'SD4_Psychopathy', 'SD4_Sadism', 'SD4_Total_Score']].std()
 
-    print("\nSummary of SD4 Scores:")
-    print(df[['SD4_Machiavellianism', 'SD4_Narcissism', 'SD4_Psychopathy', 'SD4_Sadism', 'SD4_Total_Score']])
+    logger.debug("\nSummary of SD4 Scores:")
+    logger.debug(df[['SD4_Machiavellianism', 'SD4_Narcissism', 'SD4_Psychopathy', 'SD4_Sadism', 'SD4_Total_Score']])
 
-    print(f"\nMean Machiavellianism: {mean_scores['SD4_Machiavellianism']:.2f}")
-    print(f"Mean Narcissism: {mean_scores['SD4_Narcissism']:.2f}")
-    print(f"Mean Psychopathy: {mean_scores['SD4_Psychopathy']:.2f}")
-    print(f"Mean Sadism: {mean_scores['SD4_Sadism']:.2f}")
-    print(f"Mean Total SD4 Score: {mean_scores['SD4_Total_Score']:.2f}")
+    logger.debug(f"\nMean Machiavellianism: {mean_scores['SD4_Machiavellianism']:.2f}")
+    logger.debug(f"Mean Narcissism: {mean_scores['SD4_Narcissism']:.2f}")
+    logger.debug(f"Mean Psychopathy: {mean_scores['SD4_Psychopathy']:.2f}")
+    logger.debug(f"Mean Sadism: {mean_scores['SD4_Sadism']:.2f}")
+    logger.debug(f"Mean Total SD4 Score: {mean_scores['SD4_Total_Score']:.2f}")
     
     return {
         'Mean Machiavellianism': mean_scores['SD4_Machiavellianism'],
@@ -62,8 +66,8 @@ def SD4_subgroup_means(df, subgroup_column):
     """
     subgroup_stats = df.groupby(subgroup_column)[['SD4_Machiavellianism', 'SD4_Narcissism', 'SD4_Psychopathy', 'SD4_Sadism', 'SD4_Total_Score']].agg(['mean', 'std'])
     
-    print(f"\nSubgroup Means and Standard Deviations for {subgroup_column}:")
-    print(subgroup_stats)
+    logger.debug(f"\nSubgroup Means and Standard Deviations for {subgroup_column}:")
+    logger.debug(subgroup_stats)
 
     return subgroup_stats
 
@@ -73,7 +77,7 @@ def SD4_save_results_to_csv(df, output_file_path):
     Save the processed results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Save the summarized statistics to CSV
 def SD4_save_summary_to_csv(summary, subgroup_summary, output_file_path):
@@ -84,7 +88,7 @@ def SD4_save_summary_to_csv(summary, subgroup_summary, output_file_path):
     summary_df = pd.concat([summary_df, subgroup_summary])
 
     summary_df.to_csv(output_file_path, index=False)
-    print(f"Summary saved to {output_file_path}.")
+    logger.info(f"Summary saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -94,17 +98,19 @@ def main(df):
 
     if df is not None:
         # Calculate SD4 subscale scores
-        df = SD4_calculate_scores(df)
+        scores = SD4_calculate_scores(df)
 
         # Summarize results
-        summary = SD4_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = SD4_summarize_results(scores)
 
-        # Calculate subgroup means and std for a specific subgroup, e.g., 'Gender' or 'Age'
-        subgroup_column = 'Gender'  # Adjust this to your dataset's specific column
-        subgroup_summary = SD4_subgroup_means(df, subgroup_column)
+            # Calculate subgroup means and std for a specific subgroup, e.g., 'Gender' or 'Age'
+            subgroup_column = 'Gender'  # Adjust this to your dataset's specific column
+            subgroup_summary = SD4_subgroup_means(scores.assign(**{subgroup_column: df[subgroup_column]}),
+                                                  subgroup_column)
 
         # Save individual scores to CSV
-        # SD4_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # SD4_save_results_to_csv(scores, output_file_path)  # Disabled for package use
 
         # Save summarized results to CSV
         # SD4_save_summary_to_csv(summary, subgroup_summary, summary_output_file_path)  # Disabled for package use
@@ -118,7 +124,7 @@ def main(df):
             'SD4_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
@@ -1,24 +1,29 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 
 # Calculate SIAS scores
 def SIAS_calculate_scores(df):
     """
     Calculate the SIAS total score by summing item scores.
+    Returns a new DataFrame holding the score; the input is left unchanged.
     """
-    # Calculate SIAS total score to avoid DataFrame fragmentation
-    df = df.assign(SIAS_Total_Score=df[['SIAS_01', 'SIAS_02', 'SIAS_03', 'SIAS_04', 'SIAS_05', 'SIAS_06', 'SIAS_07', 'SIAS_08', 'SIAS_09', 'SIAS_10',
-                                        'SIAS_11', 'SIAS_12', 'SIAS_13', 'SIAS_14', 'SIAS_15', 'SIAS_16', 'SIAS_17', 'SIAS_18', 'SIAS_19', 'SIAS_20']].sum(axis=1))
-    return df
+    scores = pd.DataFrame(index=df.index)
+    scores['SIAS_Total_Score'] = df[['SIAS_01', 'SIAS_02', 'SIAS_03', 'SIAS_04', 'SIAS_05', 'SIAS_06', 'SIAS_07', 'SIAS_08', 'SIAS_09', 'SIAS_10',
+                                     'SIAS_11', 'SIAS_12', 'SIAS_13', 'SIAS_14', 'SIAS_15', 'SIAS_16', 'SIAS_17', 'SIAS_18', 'SIAS_19', 'SIAS_20']].sum(axis=1)
+    return scores
 
 # Summarize results
 def SIAS_summarize_results(df):
     mean_scores = df[['SIAS_Total_Score']].mean()
     std_scores = df[['SIAS_Total_Score']].std()
 
-    print("\nSummary of SIAS Scores:")
-    print(df[['SIAS_Total_Score']])
+    logger.debug("\nSummary of SIAS Scores:")
+    logger.debug(df[['SIAS_Total_Score']])
     
     return {
         'Mean SIAS Score': mean_scores['SIAS_Total_Score'],
@@ -28,7 +33,7 @@ def SIAS_summarize_results(df):
 # Save the results to CSV
 def SIAS_save_results_to_csv(df, output_file_path):
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function
 def main(df):
@@ -38,20 +43,21 @@ def main(df):
     
     if df is not None:
         # Calculate SIAS total score
-        df = SIAS_calculate_scores(df)
+        scores = SIAS_calculate_scores(df)
 
         # Summarize results
-        summary = SIAS_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = SIAS_summarize_results(scores)
 
         # Save individual scores to CSV
-        # SIAS_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # SIAS_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
             'SIAS_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
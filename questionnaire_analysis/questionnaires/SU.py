@@ -1,5 +1,11 @@
+import logging
+
 import pandas as pd
 
+from questionnaire_analysis.coercion import numeric_items
+
+logger = logging.getLogger(__name__)
+
 # SU NOT SETUP FOR OUR SU QUESTIONS!
 
 # Calculate Substance Use scores
@@ -11,36 +17,38 @@ def SU_calculate_scores(df):
     - Substance Type (e.g., alcohol, tobacco, drugs)
     - Consequences of Use
     Reverse scoring is applied where necessary.
+    Returns a new DataFrame holding the scores; the input is left unchanged.
     """
     
     # Example: Reverse scoring (modify as needed)
     reverse_substance_use_items = [5, 10]  # Example reverse items for substance use
     
-    # Apply reverse scoring for relevant items
+    # Read all items as numeric once
+    numeric = numeric_items(df, [f'SU_{item:02d}' for item in range(1, 11)])
+
+    # Reverse score the relevant items into a separate mapping
+    reversed_items = {}
     for item in reverse_substance_use_items:
         column_name = f'SU_{item:02d}'  # Ensure consistent formatting if needed (e.g., SU_05)
-        # Convert the column to numeric first
-        df[column_name] = pd.to_numeric(df[column_name], errors='coerce')
-        # Apply reverse scoring: assuming a 1-5 scale, reverse is computed as 6 - value
-        df[column_name] = 6 - df[column_name]  # Assuming a 1-5 scale, reverse scoring is 6 - original response
+        # Assuming a 1-5 scale, reverse scoring is 6 - original response
+        reversed_items[column_name] = 6 - numeric[column_name]
+
+    def items(columns):
+        # Read the items, taking reverse-scored ones from the reversed mapping
+        return pd.DataFrame({col: reversed_items[col] if col in reversed_items else numeric[col] for col in columns})
 
-    # Calculate subscale scores
-    numeric_columns = ['SU_01', 'SU_02', 'SU_03', 'SU_04', 'SU_05', 'SU_06',
-                   'SU_07', 'SU_08', 'SU_09', 'SU_10']
-    # Convert columns to numeric and calculate all scores at once to avoid fragmentation
-    numeric_conversions = {col: pd.to_numeric(df[col], errors='coerce') for col in numeric_columns}
+    # Calculate all scores at once to avoid fragmentation
     su_scores = {
-        'SU_Frequency_Use': df[['SU_01', 'SU_02', 'SU_03']].mean(axis=1),
-        'SU_Substance_Type_Use': df[['SU_04', 'SU_05', 'SU_06']].mean(axis=1),
-        'SU_Consequences_Use': df[['SU_07', 'SU_08', 'SU_09', 'SU_10']].mean(axis=1)
+        'SU_Frequency_Use': items(['SU_01', 'SU_02', 'SU_03']).mean(axis=1),
+        'SU_Substance_Type_Use': items(['SU_04', 'SU_05', 'SU_06']).mean(axis=1),
+        'SU_Consequences_Use': items(['SU_07', 'SU_08', 'SU_09', 'SU_10']).mean(axis=1)
     }
-    all_changes = {**numeric_conversions, **su_scores}
-    df = df.assign(**all_changes)
+    scores = pd.DataFrame(su_scores, index=df.index)
     
     # Calculate total SU score
-    df['SU_Total_Score'] = df[['SU_Frequency_Use', 'SU_Substance_Type_Use', 'SU_Consequences_Use']].mean(axis=1)
+    scores['SU_Total_Score'] = scores[['SU_Frequency_Use', 'SU_Substance_Type_Use', 'SU_Consequences_Use']].mean(axis=1)
 
-    return df
+    return scores
 
 # Summarize results
 def SU_summarize_results(df):
@@ -50,8 +58,8 @@ def SU_summarize_results(df):
     mean_scores = df[['SU_Frequency_Use', 'SU_Substance_Type_Use', 'SU_Consequences_Use']].mean()
     std_scores = df[['SU_Frequency_Use', 'SU_Substance_Type_Use', 'SU_Consequences_Use']].std()
 
-    print("\nSummary of Substance Use Scores:")
-    print(df[['SU_Frequency_Use', 'SU_Substance_Type_Use', 'SU_Consequences_Use']])
+    logger.debug("\nSummary of Substance Use Scores:")
+    logger.debug(df[['SU_Frequency_Use', 'SU_Substance_Type_Use', 'SU_Consequences_Use']])
     
     return {
         'Mean Frequency of Use': mean_scores['SU_Frequency_Use'],
@@ -65,16 +73,17 @@ def SU_summarize_results(df):
 # Save the results to CSV
 def SU_save_results_to_csv(df, output_file_path):
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
     if df is not None:
         # Step 1: Score calculations
-        df = SU_calculate_scores(df)
+        scores = SU_calculate_scores(df)
 
         # Step 2: Optional summary logging
-        _ = SU_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            _ = SU_summarize_results(scores)
         
         # Only return the summary columns for concatenation
         summary_columns = [
@@ -84,7 +93,7 @@ def main(df):
             'SU_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
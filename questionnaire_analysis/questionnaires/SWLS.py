@@ -1,5 +1,9 @@
+import logging
+
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 
 
 # Calculate SWLS total score
@@ -7,10 +11,12 @@ def SWLS_calculate_score(df):
     """
     Calculate the total score for the SWLS.
     SWLS total score is the sum of the ratings for all 5 items.
+    Returns a new DataFrame holding the score; the input is left unchanged.
     """
     swls_items = ['SWLS_01', 'SWLS_02', 'SWLS_03', 'SWLS_04', 'SWLS_05']
-    df['SWLS_Total_Score'] = df[swls_items].sum(axis=1)
-    return df
+    scores = pd.DataFrame(index=df.index)
+    scores['SWLS_Total_Score'] = df[swls_items].sum(axis=1)
+    return scores
 
 # Summarize results
 def SWLS_summarize_results(df):
@@ -20,11 +26,11 @@ def SWLS_summarize_results(df):
     mean_score = df['SWLS_Total_Score'].mean()
     std_score = df['SWLS_Total_Score'].std()
 
-    print("\nSummary of SWLS Scores:")
-    print(df[['SWLS_Total_Score']])
+    logger.debug("\nSummary of SWLS Scores:")
+    logger.debug(df[['SWLS_Total_Score']])
 
-    print(f"\nMean SWLS Total Score: {mean_score:.2f}")
-    print(f"Standard Deviation of SWLS Total Score: {std_score:.2f}")
+    logger.debug(f"\nMean SWLS Total Score: {mean_score:.2f}")
+    logger.debug(f"Standard Deviation of SWLS Total Score: {std_score:.2f}")
     
     return {
         'Mean SWLS Total Score': mean_score,
@@ -37,27 +43,28 @@ def SWLS_save_results_to_csv(df, output_file_path):
     Save the processed SWLS results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
     output_file_path = 'processed_swls_results.csv'
     if df is not None:
         # Calculate SWLS total score
-        df = SWLS_calculate_score(df)
+        scores = SWLS_calculate_score(df)
 
         # Summarize results
-        summary = SWLS_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = SWLS_summarize_results(scores)
 
         # Save results to CSV
-        # SWLS_save_results_to_csv(df, output_file_path)  # Disabled for package use
+        # SWLS_save_results_to_csv(scores, output_file_path)  # Disabled for package use
         
         # Only return the summary columns for concatenation
         summary_columns = [
             'SWLS_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
     
 
@@ -1,13 +1,19 @@
+import logging
+
 import pandas as pd
 
+from questionnaire_analysis.coercion import numeric_items
+
+logger = logging.getLogger(__name__)
+
 # Access CSV file
 def UCLA_access_csv(file_path, delimiter=","):
     try:
         df = pd.read_csv(file_path, delimiter=delimiter)
-        print(f"Data loaded successfully from {file_path}.")
+        logger.info(f"Data loaded successfully from {file_path}.")
         return df
     except FileNotFoundError:
-        print(f"File not found: {file_path}")
+        logger.error(f"File not found: {file_path}")
         return None
 
 # Reverse scoring for certain UCLA items
@@ -15,25 +21,25 @@ def UCLA_reverse_score(df):
     """
     Reverse score certain UCLA items that are positively worded.
     Items to reverse: 1, 5, 6, 9, 10, 15, 16, 19, 20
+    Returns the reversed items as a new DataFrame; the input is left unchanged.
     """
     reverse_items = ['UCLA_1', 'UCLA_5', 'UCLA_6', 'UCLA_9', 'UCLA_10', 'UCLA_15', 'UCLA_16', 'UCLA_19', 'UCLA_20']
-    for item in reverse_items:
-        df[item] = 5 - df[item]  # Reverse score: 1 becomes 4, 4 becomes 1, etc.
-    return df
+    return pd.DataFrame({item: 5 - df[item] for item in reverse_items})  # Reverse score: 1 becomes 4, 4 becomes 1, etc.
 
 # Calculate UCLA scores
 def UCLA_calculate_scores(df):
     """
     Calculate the total UCLA score by summing all item responses.
     Assumes items are named UCLA_01 to UCLA_20.
+    Returns a new DataFrame holding the score; the input is left unchanged.
     """
     ucla_items = [f'UCLA_{i:02d}' for i in range(1, 21)]  # Adjust if you have a different item range
 
-    for item in ucla_items:
-        df[item] = pd.to_numeric(df[item], errors='coerce')
+    items = numeric_items(df, ucla_items)
 
-    df['UCLA_Total_Score'] = df[ucla_items].sum(axis=1)
-    return df
+    scores = pd.DataFrame(index=df.index)
+    scores['UCLA_Total_Score'] = items.sum(axis=1)
+    return scores
 
 # Summarize results
 def UCLA_summarize_results(df):
@@ -43,11 +49,11 @@ def UCLA_summarize_results(df):
     mean_total_score = df['UCLA_Total_Score'].mean()
     std_total_score = df['UCLA_Total_Score'].std()
 
-    print("\nSummary of UCLA Loneliness Scale Scores:")
-    print(df[['UCLA_Total_Score']])
+    logger.debug("\nSummary of UCLA Loneliness Scale Scores:")
+    logger.debug(df[['UCLA_Total_Score']])
 
-    print(f"\nMean Total UCLA Score: {mean_total_score:.2f}")
-    print(f"Standard Deviation of UCLA Scores: {std_total_score:.2f}")
+    logger.debug(f"\nMean Total UCLA Score: {mean_total_score:.2f}")
+    logger.debug(f"Standard Deviation of UCLA Scores: {std_total_score:.2f}")
 
     return {
         'Mean Total UCLA Score': mean_total_score,
@@ -62,8 +68,8 @@ def UCLA_subgroup_means(df, subgroup_column):
     """
     subgroup_stats = df.groupby(subgroup_column)['UCLA_Total_Score'].agg(['mean', 'std'])
     
-    print(f"\nSubgroup Means and Standard Deviations for {subgroup_column}:")
-    print(subgroup_stats)
+    logger.debug(f"\nSubgroup Means and Standard Deviations for {subgroup_column}:")
+    logger.debug(subgroup_stats)
 
     return subgroup_stats
 
@@ -73,7 +79,7 @@ def UCLA_save_results_to_csv(df, output_file_path):
     Save the processed results to a CSV file.
     """
     df.to_csv(output_file_path, index=False)
-    print(f"Results saved to {output_file_path}.")
+    logger.info(f"Results saved to {output_file_path}.")
 
 # Save the summarized statistics to CSV
 def UCLA_save_summary_to_csv(summary, subgroup_summary, output_file_path):
@@ -84,7 +90,7 @@ def UCLA_save_summary_to_csv(summary, subgroup_summary, output_file_path):
     summary_df = pd.concat([summary_df, subgroup_summary])
 
     summary_df.to_csv(output_file_path, index=False)
-    print(f"Summary saved to {output_file_path}.")
+    logger.info(f"Summary saved to {output_file_path}.")
 
 # Main function to execute the steps
 def main(df):
@@ -95,14 +101,15 @@ def main(df):
 
     if df is not None:
         # Calculate UCLA scores
-        df = UCLA_calculate_scores(df)
+        scores = UCLA_calculate_scores(df)
 
         # Summarize results
-        summary = UCLA_summarize_results(df)
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = UCLA_summarize_results(scores)
 
-        # Calculate subgroup means and std for a specific subgroup, e.g., 'Gender' or 'Age'
-        subgroup_column = 'Gender'  # Adjust this to your dataset's specific column
-        subgroup_summary = UCLA_subgroup_means(df, subgroup_column)
+            # Calculate subgroup means and std for a specific subgroup, e.g., 'Gender' or 'Age'
+            subgroup_column = 'Gender'  # Adjust this to your dataset's specific column
+            subgroup_summary = UCLA_subgroup_means(scores.assign(**{subgroup_column: df[subgroup_column]}), subgroup_column)
 
         # Save individual scores to CSV
         # UCLA_save_results_to_csv(df, output_file_path)  # Disabled for package use
@@ -115,7 +122,7 @@ def main(df):
             'UCLA_Total_Score'
         ]
         # Only return columns that exist (in case of errors)
-        return df[[col for col in summary_columns if col in df.columns]]
+        return scores[[col for col in summary_columns if col in scores.columns]]
     return None
 
 if __name__ == "__main__":
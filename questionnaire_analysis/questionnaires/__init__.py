@@ -6,30 +6,21 @@ __all__ = [
 "CARE", "SD4", "CBCL", "UPPS", "BSSS", "SIAS", "PSS", "LOTR", "DOSPERT", "IPPA"
 ]
 
-from . import UCLA
-from . import PANAS
-from . import RAS
-from . import GCF
-from . import ECR
-from . import MSPSS
-from . import SWLS
-from . import ALQ
-from . import BEQ
-from . import IRQ
-from . import CESDR
-from . import MINI_MASQ
-from . import PMERQ
-from . import BFI
-from . import SU
-from . import EERQ
-from . import HEXACO
-from . import CARE
-from . import SD4
-from . import CBCL
-from . import UPPS
-from . import BSSS
-from . import SIAS
-from . import PSS
-from . import LOTR
-from . import DOSPERT
-from . import IPPA
+import importlib
+
+# The questionnaire modules; each is imported the first time it is accessed (questionnaires.PANAS)
+MODULES = (
+    "UCLA", "PANAS", "RAS", "GCF", "ECR", "MSPSS", "SWLS", "ALQ", "BEQ", "IRQ", "CESDR",
+    "MINI_MASQ", "PMERQ", "BFI", "SU", "EERQ", "HEXACO", "CARE", "SD4", "CBCL", "UPPS", "BSSS",
+    "SIAS", "PSS", "LOTR", "DOSPERT", "IPPA",
+)
+
+
+def __getattr__(name):
+    if name in MODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(MODULES))
@@ -0,0 +1,202 @@
+"""
+Registry of questionnaire scoring functions, loaded on first use.
+
+The registry maps each questionnaire prefix to where its main(df) lives: the name
+of a module in questionnaire_analysis.questionnaires, or "package.module:function"
+for a function elsewhere. Listing the prefixes (to build the prefix index and
+detect questionnaires in a header) imports nothing; a module is imported the first
+time its main() is looked up, which happens when its prefix is detected. A CSV
+holding only PANAS items therefore imports PANAS alone.
+
+Plain callables can be registered too, so tests and callers can still assign
+registry[prefix] = main as they would in a dict.
+
+Questionnaires can also come from other installed packages, as entry points in
+the "questionnaire_analysis.questionnaires" group. The entry point's name is the
+prefix and its value the scoring function:
+
+    [project.entry-points."questionnaire_analysis.questionnaires"]
+    "ABC_" = "abc_scales.scoring:main"
+
+The scoring function, or its module, may list its item columns in an ITEMS
+attribute (e.g. ITEMS = ["ABC_01", "ABC_04", "ABC_07R"]); without one every ABC_
+column is an item. Plugins are discovered from the installed packages' metadata the
+first time the registry is used, without importing them; a plugin is imported, and
+its ITEMS read, when its prefix is detected. Bundled questionnaires take precedence
+over plugins with the same prefix.
+"""
+
+import importlib
+import logging
+import sys
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+QUESTIONNAIRES_PACKAGE = "questionnaire_analysis.questionnaires"
+# Entry point group of questionnaire plugins
+PLUGIN_GROUP = "questionnaire_analysis.questionnaires"
+
+
+def load_scoring_function(target: str) -> Callable:
+    """
+    The function a registry entry names: "PANAS" is main() of
+    questionnaire_analysis.questionnaires.PANAS, "package.module:function" any function.
+
+    Raises:
+        ImportError: if the module cannot be imported
+        AttributeError: if it has no such function
+    """
+    module_name, _, function = target.partition(":")
+    if not function:
+        module_name, function = f"{QUESTIONNAIRES_PACKAGE}.{module_name}", "main"
+    return getattr(importlib.import_module(module_name), function)
+
+
+def plugin_prefix(name: str) -> str:
+    """
+    The prefix a plugin's entry point name declares.
+
+    Raises:
+        ValueError: if the name is not a prefix ending in "_"
+    """
+    prefix = name.strip()
+    if not prefix.endswith("_") or any(char.isspace() for char in prefix):
+        raise ValueError(f"Plugin name '{name}' is not a prefix ending in '_'")
+    return prefix
+
+
+def plugin_items(prefix: str, main: Callable) -> Optional[List[str]]:
+    """
+    The item columns a loaded plugin lists in an ITEMS attribute of its scoring function
+    or, failing that, of the function's module. None when it lists none, every prefixed
+    column then being an item.
+
+    Raises:
+        ValueError: if ITEMS is not a list of column names starting with `prefix`
+    """
+    items = getattr(main, "ITEMS", None)
+    if items is None:
+        items = getattr(sys.modules.get(getattr(main, "__module__", None)), "ITEMS", None)
+    if items is None:
+        return None
+    if isinstance(items, str) or not all(isinstance(item, str) and item.startswith(prefix) for item in items):
+        raise ValueError(f"ITEMS of plugin '{prefix}' must list column names starting with '{prefix}'")
+    return list(items)
+
+
+def _entry_points(group: str):
+    # importlib.metadata.entry_points(group=...) is Python 3.10+; earlier versions return a dict
+    from importlib import metadata
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return list(entry_points.select(group=group))
+    return list(entry_points.get(group, []))
+
+
+def discover_plugins(group: str = PLUGIN_GROUP) -> Dict[str, dict]:
+    """
+    The questionnaire plugins of the installed packages as {prefix: entry point}, read
+    from package metadata without importing anything. Plugins with an invalid name, or
+    a prefix an earlier plugin already declared, are logged and skipped.
+    """
+    plugins = {}
+    for entry_point in _entry_points(group):
+        try:
+            prefix = plugin_prefix(entry_point.name)
+        except ValueError as e:
+            logger.warning(f"Ignoring questionnaire plugin {entry_point.value}: {e}")
+            continue
+        if prefix in plugins:
+            logger.warning(f"Ignoring questionnaire plugin {entry_point.value}: prefix '{prefix}' "
+                           f"is already provided by {plugins[prefix].value}")
+            continue
+        plugins[prefix] = entry_point
+    return plugins
+
+
+class QuestionnaireRegistry(MutableMapping):
+    """
+    Maps questionnaire prefixes to their main(df), importing each entry's module on
+    first lookup. Entries are module names or "module:function" strings (see
+    load_scoring_function), entry points, or callables used as they are.
+
+    With a `plugin_group` the plugins of that entry point group are added the first
+    time the registry is used (see discover_plugins), after `entries`.
+    """
+
+    def __init__(self, entries: Dict[str, Union[str, Callable]], plugin_group: Optional[str] = None):
+        self._entries = dict(entries)
+        self._loaded = {}
+        self._declared_items = {}
+        self._plugin_group = plugin_group
+
+    def _discover(self):
+        # Adds the plugins of the entry point group once, keeping entries already registered
+        if self._plugin_group is None:
+            return
+        group, self._plugin_group = self._plugin_group, None
+        for prefix, entry_point in discover_plugins(group).items():
+            if prefix in self._entries:
+                logger.warning(f"Ignoring questionnaire plugin {entry_point.value}: "
+                               f"prefix '{prefix}' is already registered")
+                continue
+            self._entries[prefix] = entry_point
+
+    def __getitem__(self, prefix: str) -> Callable:
+        self._discover()
+        if prefix not in self._loaded:
+            from importlib import metadata
+            entry = self._entries[prefix]
+            if isinstance(entry, str):
+                entry = load_scoring_function(entry)
+            elif isinstance(entry, metadata.EntryPoint):
+                entry = entry.load()
+                items = plugin_items(prefix, entry)
+                if items is not None:
+                    self._declared_items[prefix] = items
+            self._loaded[prefix] = entry
+        return self._loaded[prefix]
+
+    def __setitem__(self, prefix: str, entry: Union[str, Callable]):
+        self._discover()
+        self._entries[prefix] = entry
+        self._loaded.pop(prefix, None)
+        self._declared_items.pop(prefix, None)
+
+    def __delitem__(self, prefix: str):
+        self._discover()
+        del self._entries[prefix]
+        self._loaded.pop(prefix, None)
+        self._declared_items.pop(prefix, None)
+
+    def __contains__(self, prefix) -> bool:
+        # Without importing, unlike the Mapping default that looks the entry up
+        self._discover()
+        return prefix in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._entries!r})"
+
+    def declared_items(self) -> Dict[str, List[str]]:
+        """
+        Item columns declared by the plugins loaded so far, keyed by prefix (bundled
+        questionnaires declare theirs in their specification).
+        """
+        self._discover()
+        return dict(self._declared_items)
+
+    def loaded(self):
+        """
+        The prefixes whose main() has been looked up so far.
+        """
+        return [prefix for prefix in self._entries if prefix in self._loaded]
@@ -0,0 +1,359 @@
+"""
+Vectorized scoring engine for declarative questionnaire specifications.
+
+One engine scores every instrument described in questionnaire_analysis/specs:
+the item columns are gathered once into a float NumPy block and every subscale,
+composite, total and category is computed with array reductions. Missing values
+follow pandas semantics: sums skip NaN (an all-missing row sums to 0) and means
+skip NaN (an all-missing row is NaN).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Dict, List, Any
+
+from . import LazyModule
+from .coercion import needs_coercion, scored_as_integer
+from .specs import item_column, item_columns, item_numbers
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = LazyModule("numpy")
+    pd = LazyModule("pandas")
+
+
+_compiled_specs = {}
+
+
+def compile_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve a specification into column positions and reverse-scoring constants.
+    Compiled specifications are cached by content.
+    """
+    import numpy as np
+    key = json.dumps(spec, sort_keys=True)
+    compiled = _compiled_specs.get(key)
+    if compiled is not None:
+        return compiled
+
+    prefix = spec["prefix"]
+    columns = item_columns(spec)
+    position = {column: i for i, column in enumerate(columns)}
+
+    reverse = spec.get("reverse_scoring", {})
+    reverse_constant = np.full(len(columns), np.nan)
+    if reverse.get("enabled", False):
+        scale = spec.get("scale", {})
+        scale_min = reverse.get("scale_min", scale.get("min", 1))
+        scale_max = reverse.get("scale_max", scale.get("max", 5))
+        for number in reverse.get("items", []):
+            reverse_constant[position[item_column(spec, number)]] = scale_min + scale_max
+
+    def positions(numbers):
+        return np.array([position[item_column(spec, n)] for n in numbers], dtype=np.intp)
+
+    subscales = [
+        (prefix + sub["name"], positions(sub["items"]), sub.get("scoring_method", "mean"))
+        for sub in spec["subscales"]
+    ]
+    composites = [
+        (prefix + comp["name"], [prefix + name for name in comp["subscales"]], comp.get("scoring_method", "mean"))
+        for comp in spec.get("composites", [])
+    ]
+
+    total = None
+    total_spec = spec.get("total_score", {})
+    if total_spec.get("enabled", False):
+        method = total_spec.get("method", "mean_of_subscales")
+        name = prefix + total_spec.get("name", "Total_Score")
+        if method in ("mean_of_items", "sum_of_items"):
+            numbers = total_spec.get("items") or item_numbers(spec)
+            total = (name, method, positions(numbers))
+        else:
+            total = (name, method, [sub[0] for sub in subscales])
+
+    categories = [
+        (prefix + category["name"], prefix + category["source"], category["bins"])
+        for category in spec.get("categories", [])
+    ]
+
+    compiled = {
+        "columns": columns,
+        "reverse_constant": reverse_constant,
+        "subscales": subscales,
+        "composites": composites,
+        "total": total,
+        "categories": categories,
+        "output_columns": spec.get("output_columns") or [sub[0] for sub in subscales],
+    }
+    _compiled_specs[key] = compiled
+    return compiled
+
+
+def _reduce(block, method):
+    """
+    Row-wise sum or mean of a 2D block, skipping NaN like pandas.
+    """
+    import numpy as np
+    present = ~np.isnan(block)
+    sums = np.where(present, block, 0.0).sum(axis=1)
+    if method == "sum":
+        return sums
+    counts = present.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def _categorize(values, bins):
+    """
+    Label each value with the first bin whose bounds contain it; a bin without bounds is the fallback.
+    """
+    import numpy as np
+    conditions = []
+    labels = []
+    default = None
+    for band in bins:
+        if "min" not in band and "max" not in band:
+            default = band["label"]
+            continue
+        condition = np.ones(values.shape, dtype=bool)
+        if "min" in band:
+            condition &= values >= band["min"]
+        if "max" in band:
+            condition &= values <= band["max"]
+        conditions.append(condition)
+        labels.append(band["label"])
+    return np.select(conditions, labels, default=default).astype(object)
+
+
+def _reverse(block, constants):
+    """
+    Reverse-score the columns of a gathered block that have a reverse constant.
+    """
+    import numpy as np
+    reversed_items = ~np.isnan(constants)
+    if reversed_items.any():
+        block[:, reversed_items] = constants[reversed_items] - block[:, reversed_items]
+    return block
+
+
+def _item_level_scores(values, compiled):
+    """
+    Subscales and item-based totals: everything reduced directly from the item block.
+    """
+    reverse_constant = compiled["reverse_constant"]
+    results = {}
+    for name, idx, method in compiled["subscales"]:
+        results[name] = _reduce(_reverse(values[:, idx], reverse_constant[idx]), method)
+    if compiled["total"] is not None:
+        name, method, sources = compiled["total"]
+        if method in ("mean_of_items", "sum_of_items"):
+            block = _reverse(values[:, sources], reverse_constant[sources])
+            results[name] = _reduce(block, "sum" if method == "sum_of_items" else "mean")
+    return results
+
+
+def integer_outputs(compiled):
+    """
+    Names of the scores that are sums of items, and so stay integers when every item column does.
+    """
+    integer_columns = {name for name, _, method in compiled["subscales"] if method == "sum"}
+    if compiled["total"] is not None:
+        name, method, sources = compiled["total"]
+        if method == "sum_of_items":
+            integer_columns.add(name)
+        elif method == "sum_of_subscales" and all(s in integer_columns for s in sources):
+            integer_columns.add(name)
+    return integer_columns
+
+
+def _derived_scores(results, compiled, integer):
+    """
+    Composites, subscale-based totals and categories computed from the item-level scores,
+    returned in output column order.
+    """
+    import numpy as np
+    for name, sources, method in compiled["composites"]:
+        results[name] = _reduce(np.column_stack([results[s] for s in sources]), method)
+
+    if compiled["total"] is not None:
+        name, method, sources = compiled["total"]
+        if method not in ("mean_of_items", "sum_of_items"):
+            reduce_method = "sum" if method == "sum_of_subscales" else "mean"
+            results[name] = _reduce(np.column_stack([results[s] for s in sources]), reduce_method)
+
+    for name, source, bins in compiled["categories"]:
+        results[name] = _categorize(results[source], bins)
+
+    if integer:
+        for name in integer_outputs(compiled):
+            results[name] = results[name].astype(np.int64)
+
+    return {name: results[name] for name in compiled["output_columns"] if name in results}
+
+
+def score_block(values: np.ndarray, spec: Dict[str, Any], integer: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Score a float block whose columns follow item_columns(spec).
+
+    Args:
+        values: 2D float array (rows x items), NaN for missing responses
+        spec: Questionnaire specification
+        integer: True when every source column held integers, so sums are returned as int64
+
+    Returns:
+        Output column name -> 1D array, in output column order
+    """
+    compiled = compile_spec(spec)
+    return _derived_scores(_item_level_scores(values, compiled), compiled, integer)
+
+
+def item_block(df: pd.DataFrame, columns: List[str], out: np.ndarray = None):
+    """
+    Gather item columns into a float block without modifying `df`.
+    Non-numeric cells become NaN. Returns (block, all_columns_integer).
+    The block is written into `out` when given (rows x columns, float64).
+
+    Raises:
+        KeyError: if any of the columns is missing
+    """
+    import numpy as np
+    import pandas as pd
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise KeyError(f"{missing} not in index")
+
+    block = np.empty((len(df), len(columns)), dtype=np.float64) if out is None else out
+    integer = True
+    for i, col in enumerate(columns):
+        series = df[col]
+        if not scored_as_integer(series.dtype):
+            integer = False
+        if needs_coercion(series.dtype):
+            series = pd.to_numeric(series, errors="coerce")
+        block[:, i] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return block, integer
+
+
+def score_questionnaire(df: pd.DataFrame, spec: Dict[str, Any], columns: List[str] = None) -> pd.DataFrame:
+    """
+    Score one questionnaire from its specification. Returns the output columns indexed like `df`.
+    `columns` are its item columns in item_columns(spec) order as already resolved, e.g. the
+    items of a complete detection plan (default: item_columns(spec)).
+    """
+    import pandas as pd
+    values, integer = item_block(df, item_columns(spec) if columns is None else columns)
+    return pd.DataFrame(score_block(values, spec, integer=integer), index=df.index)
+
+
+def build_gather_index(specs: List[Dict[str, Any]]):
+    """
+    Lay out the item-level scores of several questionnaires as contiguous runs of item
+    positions over the union of their item columns.
+
+    Every subscale and item-based total is one run of positions in `gather`, starting
+    at its entry in `starts`, so once the items are gathered in that order each score
+    is a sum over adjacent items. Reverse-keyed cells of the gathered block are replaced
+    by c - x, with `reverse_positions` and `reverse_constants` giving where and c.
+
+    Returns:
+        (columns, score_names, gather, starts, reverse_positions, reverse_constants)
+    """
+    import numpy as np
+    columns = []
+    position = {}
+    for spec in specs:
+        for column in compile_spec(spec)["columns"]:
+            if column not in position:
+                position[column] = len(columns)
+                columns.append(column)
+
+    score_names = []
+    gather = []
+    starts = []
+    reverse_positions = []
+    reverse_constants = []
+    for spec in specs:
+        compiled = compile_spec(spec)
+        union_positions = [position[column] for column in compiled["columns"]]
+        runs = [(name, idx) for name, idx, _ in compiled["subscales"]]
+        if compiled["total"] is not None:
+            name, method, sources = compiled["total"]
+            if method in ("mean_of_items", "sum_of_items"):
+                runs.append((name, sources))
+        for name, idx in runs:
+            score_names.append(name)
+            starts.append(len(gather))
+            for i in idx:
+                constant = compiled["reverse_constant"][i]
+                if not np.isnan(constant):
+                    reverse_positions.append(len(gather))
+                    reverse_constants.append(constant)
+                gather.append(union_positions[i])
+    return (columns, score_names, np.array(gather, dtype=np.intp), np.array(starts, dtype=np.intp),
+            np.array(reverse_positions, dtype=np.intp), np.array(reverse_constants, dtype=np.float64))
+
+
+def score_questionnaires_fused(df: pd.DataFrame, specs: Dict[str, Dict[str, Any]],
+                               block_size: int = 65536) -> Dict[str, pd.DataFrame]:
+    """
+    Score several questionnaires at once from one gathered item block per block of rows,
+    instead of one pass per questionnaire. Only the items each score uses are gathered,
+    each score summing a contiguous run of them (see build_gather_index).
+
+    Args:
+        df: Data with the item columns of every questionnaire in `specs`
+        specs: Questionnaire prefix -> specification
+        block_size: Rows gathered at a time, bounding the size of the float block
+
+    Returns:
+        Questionnaire prefix -> score DataFrame indexed like `df`
+
+    Raises:
+        KeyError: if any item column is missing
+    """
+    import numpy as np
+    import pandas as pd
+    columns, score_names, gather, starts, reverse_positions, reverse_constants = \
+        build_gather_index(list(specs.values()))
+    methods = {}
+    for spec in specs.values():
+        compiled = compile_spec(spec)
+        methods.update((name, method) for name, _, method in compiled["subscales"])
+        if compiled["total"] is not None and compiled["total"][1] in ("mean_of_items", "sum_of_items"):
+            methods[compiled["total"][0]] = "sum" if compiled["total"][1] == "sum_of_items" else "mean"
+    runs = list(zip(score_names, starts, np.append(starts[1:], len(gather))))
+    gathered_columns = [columns[i] for i in gather]
+
+    # Items run along the first axis: every column is copied into one contiguous row of the
+    # block, and each score is a sum over a contiguous run of rows
+    scores = {name: np.empty(len(df)) for name in score_names}
+    for start in range(0, len(df), block_size):
+        stop = min(start + block_size, len(df))
+        block = np.empty((stop - start, len(gather)), order="F")
+        item_block(df.iloc[start:stop], gathered_columns, out=block)
+        gathered = block.T
+        gathered[reverse_positions] = reverse_constants[:, None] - gathered[reverse_positions]
+        present = ~np.isnan(gathered)
+        np.copyto(gathered, 0.0, where=~present)
+        for name, first, last in runs:
+            sums = gathered[first:last].sum(axis=0, out=scores[name][start:stop])
+            if methods[name] == "mean":
+                # A row with no answered item is 0 / 0 = NaN, as in _reduce
+                with np.errstate(invalid="ignore"):
+                    sums /= present[first:last].sum(axis=0)
+    dtypes = df.dtypes
+    integer_columns = {column for column in columns if scored_as_integer(dtypes[column])}
+
+    scored = {}
+    for prefix, spec in specs.items():
+        compiled = compile_spec(spec)
+        results = {name: scores[name] for name, _, _ in compiled["subscales"]}
+        if compiled["total"] is not None and compiled["total"][0] in scores:
+            results[compiled["total"][0]] = scores[compiled["total"][0]]
+        integer = all(column in integer_columns for column in compiled["columns"])
+        scored[prefix] = pd.DataFrame(_derived_scores(results, compiled, integer), index=df.index)
+    return scored
@@ -0,0 +1,74 @@
+"""
+Declarative scoring specifications for the bundled questionnaires.
+
+Each instrument is described by a JSON file in this directory that follows the
+layout of questionnaire_schema.json (items, reverse scoring, scale bounds,
+subscales, total score and output columns). A few optional keys cover what the
+hand-written modules do beyond that schema:
+
+- "scale": {"min", "max"} response bounds; reverse scoring uses min + max - value
+- "composites": scores built from other subscales (PMERQ engagement/disengagement)
+- "total_score.method": also "sum_of_subscales", "mean_of_items" and "sum_of_items"
+- "categories": labelled bands of a score (PSS stress level)
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Any
+
+SPEC_DIR = Path(__file__).parent
+
+
+@lru_cache(maxsize=None)
+def load_spec(name: str) -> Dict[str, Any]:
+    """
+    Load the specification for one questionnaire by module name (e.g. "UCLA", "MINI_MASQ").
+    The returned dictionary is shared; do not modify it.
+    """
+    with open(SPEC_DIR / f"{name}.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def load_specs() -> Dict[str, Dict[str, Any]]:
+    """
+    Load every bundled specification, keyed by questionnaire name.
+    """
+    return {path.stem: load_spec(path.stem) for path in sorted(SPEC_DIR.glob("*.json"))}
+
+
+def specs_by_prefix() -> Dict[str, Dict[str, Any]]:
+    """
+    Map each column prefix (e.g. "MASQ_") to its specification.
+    """
+    return {spec["prefix"]: spec for spec in load_specs().values()}
+
+
+def item_column(spec: Dict[str, Any], number: int) -> str:
+    """
+    Column name of item `number` for a specification.
+    """
+    item_format = spec.get("items", {}).get("item_format", spec["prefix"] + "{:02d}")
+    return item_format.format(number)
+
+
+def item_numbers(spec: Dict[str, Any]) -> List[int]:
+    """
+    Item numbers read when scoring: every subscale and total item, plus reverse-scored items.
+    """
+    numbers = set()
+    for subscale in spec["subscales"]:
+        numbers.update(subscale["items"])
+    numbers.update(spec.get("total_score", {}).get("items", []))
+    reverse = spec.get("reverse_scoring", {})
+    if reverse.get("enabled", False):
+        numbers.update(reverse.get("items", []))
+    return sorted(numbers)
+
+
+def item_columns(spec: Dict[str, Any]) -> List[str]:
+    """
+    Column names of the items read when scoring, in item order.
+    """
+    return [item_column(spec, number) for number in item_numbers(spec)]
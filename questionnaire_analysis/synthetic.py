@@ -0,0 +1,103 @@
+"""
+Synthetic questionnaire exports for benchmarks and tests.
+
+Responses are generated for every bundled specification with that instrument's
+response scale and item count. Each respondent has a latent trait per
+questionnaire, so items of one instrument correlate and reverse-keyed items run
+the other way, as in real Likert data. Missing data comes in two forms: single
+skipped items and whole questionnaires left blank. A few Qualtrics-style metadata
+and free-text columns are included so column projection is exercised.
+
+Large files are written in chunks, so 10 million rows never sit in memory at once.
+"""
+
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .specs import item_column, item_numbers, specs_by_prefix
+
+
+# Metadata columns of a Qualtrics export that the pipeline does not score
+METADATA_COLUMNS = ["StartDate", "EndDate", "Progress", "Duration (in seconds)", "Finished"]
+
+
+def instrument_items(spec: Dict[str, Any]) -> List[str]:
+    """
+    Item columns of an instrument as they appear in an export: 1 up to the highest item number.
+    """
+    return [item_column(spec, number) for number in range(1, max(item_numbers(spec)) + 1)]
+
+
+def synthetic_responses(rows: int, seed: int = 0, missing_rate: float = 0.03, skip_rate: float = 0.02,
+                        prefixes: Optional[List[str]] = None, metadata: bool = True,
+                        start: int = 0) -> pd.DataFrame:
+    """
+    Generate `rows` synthetic survey responses.
+
+    Args:
+        rows: Number of respondents
+        seed: Random seed; the same seed and `start` give the same rows
+        missing_rate: Probability that a single item is left blank
+        skip_rate: Probability that a respondent leaves a whole questionnaire blank
+        prefixes: Questionnaire prefixes to include (default: all bundled specifications)
+        metadata: Include Qualtrics-style metadata and a free-text column
+        start: Number of the first respondent, for generating a file in chunks
+
+    Returns:
+        DataFrame with ResponseId, SubjectID, Gender, optional metadata and nullable
+        integer (Int8) item columns
+    """
+    rng = np.random.default_rng([seed, start])
+    specs = specs_by_prefix()
+    prefixes = list(specs) if prefixes is None else prefixes
+
+    numbers = np.arange(start, start + rows)
+    data = {
+        "ResponseId": pd.array([f"R_{n:09d}" for n in numbers], dtype="str"),
+        "SubjectID": pd.array([f"S{n:07d}" for n in numbers], dtype="str"),
+        "Gender": pd.array(rng.choice(["Female", "Male", "Non-binary"], rows, p=[0.52, 0.45, 0.03]),
+                           dtype="str"),
+    }
+    if metadata:
+        data["StartDate"] = "2025-02-04 09:00:00"
+        data["EndDate"] = "2025-02-04 09:25:00"
+        data["Progress"] = 100
+        data["Duration (in seconds)"] = rng.integers(600, 3600, rows)
+        data["Finished"] = 1
+        data["Comments"] = pd.array(np.where(rng.random(rows) < 0.1, "No comment, thanks", ""), dtype="str")
+
+    for prefix in prefixes:
+        spec = specs[prefix]
+        scale = spec.get("scale", {})
+        low, high = scale.get("min", 1), scale.get("max", 5)
+        columns = instrument_items(spec)
+        reverse = set()
+        if spec.get("reverse_scoring", {}).get("enabled", False):
+            reverse = {item_column(spec, n) for n in spec["reverse_scoring"].get("items", [])}
+
+        middle = (low + high) / 2
+        spread = (high - low) / 4
+        trait = rng.standard_normal(rows)[:, None]
+        signs = np.array([-1.0 if column in reverse else 1.0 for column in columns])
+        noise = rng.standard_normal((rows, len(columns)))
+        values = np.clip(np.rint(middle + spread * (0.8 * trait * signs + 0.6 * noise)), low, high).astype(np.int8)
+
+        missing = rng.random((rows, len(columns))) < missing_rate
+        missing |= (rng.random(rows) < skip_rate)[:, None]
+        for j, column in enumerate(columns):
+            data[column] = pd.arrays.IntegerArray(values[:, j], missing[:, j])
+
+    return pd.DataFrame(data)
+
+
+def write_synthetic_csv(path: str, rows: int, seed: int = 0, chunk_rows: int = 100_000, **options) -> str:
+    """
+    Write `rows` synthetic responses to a CSV file, `chunk_rows` at a time.
+    `options` are passed to synthetic_responses. Returns `path`.
+    """
+    for start in range(0, max(rows, 1), chunk_rows):
+        chunk = synthetic_responses(min(chunk_rows, rows - start), seed=seed, start=start, **options)
+        chunk.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+    return path
@@ -10,9 +10,16 @@ setup(
     author='Your Name', #TODO
     author_email='your.email@example.com', # TODO
     packages=find_packages(),  # Automatically find all packages and subpackages # TODO
+    package_data={
+        'questionnaire_analysis': ['specs/*.json'],
+    },
     install_requires=[
         'pandas>=1.0',  # List your dependencies here
+        'numpy',
     ],
+    extras_require={
+        'arrow': ['pyarrow'],  # Parquet and Arrow/Feather inputs and summaries
+    },
     entry_points={
         'console_scripts': [
             'questionnaire_analysis=questionnaire_analysis.__main__:main',
@@ -6,11 +6,14 @@ Test script to verify that questionnaire analysis works correctly
 import pandas as pd
 import sys
 import os
+import tempfile
 
 # Add the package to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from questionnaire_analysis.common import analyze_questionnaire_csv
+from questionnaire_analysis.common import QUESTIONNAIRE_MAP, analyze_questionnaire_csv, plan_questionnaires
+from questionnaire_analysis.detection import PrefixIndex
+from questionnaire_analysis.incremental import analyze_incremental
 
 def create_test_data():
     """Create a simple test dataset with EERQ and DOSPERT columns"""
@@ -115,5 +118,57 @@ def test_questionnaire_analysis():
     if os.path.exists(test_csv_path.replace('.csv', '_summary.csv')):
         os.remove(test_csv_path.replace('.csv', '_summary.csv'))
 
+def test_overlapping_prefixes_are_each_detected():
+    """A column starting with two registered prefixes belongs to both questionnaires"""
+    index = PrefixIndex(["BFI_", "BFI_2_", "SU_"])
+    assert index.matches("BFI_2_01") == ["BFI_", "BFI_2_"]
+    assert index.matches("BFI_01") == ["BFI_"]
+    assert index.matches("SUBJECT") == []
+    assert index.group(["ResponseId", "BFI_01", "BFI_2_01"]) == {"BFI_": ["BFI_01", "BFI_2_01"],
+                                                                "BFI_2_": ["BFI_2_01"]}
+
+    QUESTIONNAIRE_MAP["BFI_2_"] = lambda df: None
+    try:
+        plan = plan_questionnaires(["ResponseId", "BFI_01", "BFI_2_01", "BFI_2_02"])
+    finally:
+        del QUESTIONNAIRE_MAP["BFI_2_"]
+    assert list(plan) == ["BFI_", "BFI_2_"]
+    assert plan["BFI_2_"]["items"] == ["BFI_2_01", "BFI_2_02"]
+
+def test_integer_items_keep_integer_sums():
+    """Sums of whole-number items are written as integers, e.g. 20 rather than 20.0"""
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "swls.csv")
+        pd.DataFrame({'ResponseId': ['R001', 'R002'],
+                      **{f'SWLS_{i:02d}': [4, 6] for i in range(1, 6)}}).to_csv(csv_path, index=False)
+        analyze_questionnaire_csv(csv_path, output_summary=True)
+        with open(os.path.join(directory, "swls_summary.csv")) as f:
+            assert f.read().splitlines()[1:] == ["20", "30"]
+
+def test_incremental_run_after_normal_run():
+    """A normal run of the same export neither breaks nor overwrites the incremental summary"""
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "export.csv")
+        test_df = create_test_data()
+        test_df.iloc[:8].to_csv(csv_path, index=False)
+        analyze_questionnaire_csv(csv_path, output_summary=True)
+        assert len(analyze_incremental(csv_path)) == 8
+        analyze_questionnaire_csv(csv_path, output_summary=True)
+
+        test_df.to_csv(csv_path, index=False)
+        new_rows = analyze_incremental(csv_path)
+        assert new_rows["ResponseId"].tolist() == ["R009", "R010"]
+        summary = pd.read_csv(os.path.join(directory, "export_incremental_summary.csv"))
+        assert summary["ResponseId"].tolist() == test_df["ResponseId"].tolist()
+        assert "ResponseId" not in pd.read_csv(os.path.join(directory, "export_summary.csv")).columns
+
+        # A summary without the key column is rebuilt instead of merged into
+        summary.drop(columns="ResponseId").to_csv(os.path.join(directory, "export_incremental_summary.csv"),
+                                                  index=False)
+        assert len(analyze_incremental(csv_path)) == 10
+
 if __name__ == "__main__":
-    test_questionnaire_analysis() 
\ No newline at end of file
+    test_questionnaire_analysis()
+    test_overlapping_prefixes_are_each_detected()
+    test_integer_items_keep_integer_sums()
+    test_incremental_run_after_normal_run()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script to verify that importing the package stays cheap and questionnaire modules load on detection
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Importing pandas alone takes several times this; the lazy package import takes a few milliseconds
+IMPORT_BUDGET_SECONDS = 0.2
+
+def run_fresh(code, path=()):
+    """Run `code` in a new interpreter, with `path` ahead of sys.path, and return the JSON it prints"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([*path, os.environ.get("PYTHONPATH", "")]))
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True)
+    return json.loads(result.stdout)
+
+def write_plugin(directory, entry_points):
+    """Install a fake questionnaire plugin package, abc_scales, into `directory`"""
+    dist_info = os.path.join(directory, "abc_scales-1.0.dist-info")
+    os.makedirs(dist_info)
+    with open(os.path.join(dist_info, "METADATA"), "w") as f:
+        f.write("Metadata-Version: 2.1\nName: abc-scales\nVersion: 1.0\n")
+    with open(os.path.join(dist_info, "entry_points.txt"), "w") as f:
+        f.write("[questionnaire_analysis.questionnaires]\n" + entry_points)
+    os.makedirs(os.path.join(directory, "abc_scales"))
+    open(os.path.join(directory, "abc_scales", "__init__.py"), "w").close()
+    with open(os.path.join(directory, "abc_scales", "scoring.py"), "w") as f:
+        f.write("ITEMS = ['ABC_01', 'ABC_02', 'ABC_05']\n"
+                "\n"
+                "def main(df):\n"
+                "    return df.filter(like='ABC_').sum(axis=1).rename('ABC_Total').to_frame()\n")
+
+def timed_import(module):
+    """Import `module` in a fresh interpreter and report the seconds taken and what it loaded"""
+    report = run_fresh(
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "seconds = time.perf_counter() - start\n"
+        "loaded = [name for name in sys.modules if name.startswith('questionnaire_analysis.questionnaires.')]\n"
+        "print(json.dumps({'seconds': seconds, 'pandas': 'pandas' in sys.modules, 'numpy': 'numpy' in sys.modules,\n"
+        "                  'questionnaires': loaded}))\n"
+    )
+    print(f"import {module}: {report['seconds'] * 1000:.1f} ms")
+    return report
+
+def test_package_import_is_lazy():
+    """Importing the package loads neither pandas nor any questionnaire module, within the time budget"""
+    report = timed_import("questionnaire_analysis")
+    assert not report["pandas"]
+    assert report["questionnaires"] == []
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS
+
+def test_common_and_cli_imports_are_lazy():
+    """common and the command-line entry point load neither pandas nor NumPy until data is read"""
+    for module in ("questionnaire_analysis.common", "questionnaire_analysis.__main__"):
+        report = timed_import(module)
+        assert not report["pandas"] and not report["numpy"], module
+        assert report["questionnaires"] == [], module
+        assert report["seconds"] < IMPORT_BUDGET_SECONDS, module
+    help_run = subprocess.run([sys.executable, "-X", "importtime", "-m", "questionnaire_analysis", "--help"], cwd=ROOT,
+                              capture_output=True, text=True, check=True)
+    assert "usage:" in help_run.stdout
+    assert " pandas\n" not in help_run.stderr
+
+def test_annotations_resolve_without_eager_imports():
+    """pd/np annotations resolve with typing.get_type_hints, importing pandas only when they are resolved"""
+    report = run_fresh(
+        "import json, sys, typing\n"
+        "from questionnaire_analysis import coercion, formats, incremental, scoring_engine\n"
+        "imported = 'pandas' in sys.modules or 'numpy' in sys.modules\n"
+        "hints = [typing.get_type_hints(fn) for fn in (coercion.coerce_columns, formats.iter_batches,\n"
+        "                                              incremental.row_digests, scoring_engine.score_block)]\n"
+        "print(json.dumps({'imported': imported, 'hints': [sorted(map(str, h.values())) for h in hints]}))\n"
+    )
+    assert not report["imported"]
+    assert "<class 'numpy.ndarray'>" in report["hints"][2]
+
+def test_detection_imports_detected_modules_only():
+    """Detecting questionnaires in a PANAS-only header imports the PANAS module and no other"""
+    report = run_fresh(
+        "import json, sys\n"
+        "from questionnaire_analysis.common import plan_questionnaires\n"
+        "plan = plan_questionnaires(['ResponseId'] + [f'PANAS_{i:02d}' for i in range(1, 21)])\n"
+        "loaded = [name for name in sys.modules if name.startswith('questionnaire_analysis.questionnaires.')]\n"
+        "print(json.dumps({'detected': list(plan), 'questionnaires': loaded}))\n"
+    )
+    assert report["detected"] == ["PANAS_"]
+    assert report["questionnaires"] == ["questionnaire_analysis.questionnaires.PANAS"]
+
+def test_plugins_load_on_detection():
+    """Plugins are discovered without importing them and loaded, with the ITEMS they list, once detected"""
+    with tempfile.TemporaryDirectory() as directory:
+        write_plugin(directory, "ABC_ = abc_scales.scoring:main\nPANAS_ = abc_scales.scoring:main\n")
+        report = run_fresh(
+            "import json, sys\n"
+            "import pandas as pd\n"
+            "from questionnaire_analysis.common import QUESTIONNAIRE_MAP, plan_questionnaires, run_questionnaires\n"
+            "registered = 'ABC_' in QUESTIONNAIRE_MAP\n"
+            "imported = 'abc_scales' in sys.modules\n"
+            "plan = plan_questionnaires(['ResponseId', 'ABC_01', 'ABC_02', 'ABC_04'])\n"
+            "df = pd.DataFrame({'ABC_01': [1, 2], 'ABC_02': [3, 4], 'ABC_04': [5, 6]})\n"
+            "summary = run_questionnaires(df, {prefix: entry['main'] for prefix, entry in plan.items()})\n"
+            "print(json.dumps({'registered': registered, 'imported': imported, 'plan': {key: plan['ABC_'][key] for key in ('items', 'missing', 'extra')},\n"
+            "                  'totals': summary['ABC_Total'].tolist(),\n"
+            "                  'panas': QUESTIONNAIRE_MAP['PANAS_'].__module__}))\n",
+            path=[directory],
+        )
+    assert report["registered"] and not report["imported"]
+    assert report["plan"]["items"] == ["ABC_01", "ABC_02"]
+    assert report["plan"]["missing"] == ["ABC_05"]
+    assert report["plan"]["extra"] == ["ABC_04"]
+    assert report["totals"] == [9, 12]
+    # A plugin cannot replace a bundled questionnaire
+    assert report["panas"] == "questionnaire_analysis.questionnaires.PANAS"
+
+if __name__ == "__main__":
+    test_package_import_is_lazy()
+    test_common_and_cli_imports_are_lazy()
+    test_annotations_resolve_without_eager_imports()
+    test_detection_imports_detected_modules_only()
+    test_plugins_load_on_detection()